@@ -1,12 +1,16 @@
+import time
 from datetime import datetime
 
 import pandas as pd
 import streamlit as st
 
-from reporting.exchange_fetcher import (
-    format_datetime,
-    load_exchange_rates as fetch_exchange_rates,
-)
+from crypto_venues import VENUES
+from reporting.cross_rates import QUOTE_UNITS, compare_banks
+from reporting.exchange_fetcher import fetch_sources
+from reporting.exchange_fetcher import load_exchange_rates as fetch_exchange_rates
+from reporting.history import HistoryStore, record_snapshot
+from reporting.premium import compute_premiums, ticker_quotes, venue_sources
+from reporting.snapshot import RateSnapshot, SnapshotHolder
 
 # 페이지 설정
 st.set_page_config(
@@ -15,61 +19,128 @@ st.set_page_config(
     layout="wide"
 )
 
-@st.cache_data(ttl=60)
+# 공유 스냅샷 교체 주기와 수동 새로고침 최소 간격 (초)
+SNAPSHOT_TTL = 60
+MANUAL_REFRESH_MIN_AGE = 15
+
+# 영역별 자동 갱신 주기 (각 영역은 fragment로 독립 갱신, 스냅샷이 바뀌는 주기에 맞춤)
+HEADER_REFRESH = f"{SNAPSHOT_TTL}s"
+CRYPTO_REFRESH = f"{SNAPSHOT_TTL}s"
+BANK_TABLE_REFRESH = f"{SNAPSHOT_TTL}s"
+
 def load_exchange_rates():
-    """환율 데이터 로딩 (1분 캐시)"""
-    return fetch_exchange_rates()
+    """환율 데이터 로딩 후 이력에 기록"""
+    result = fetch_exchange_rates()
+    record_snapshot(*result)
+    return result
 
-# 데이터 로드
-with st.spinner('환율 데이터 조회 중...'):
-    bank_data, investing_data, bithumb_data, btc_data = load_exchange_rates()
 
-# 헤더 영역 - Investing.com 환율
-st.title("💱 환율 정보")
+@st.cache_resource
+def get_snapshot_holder():
+    """세션 간 공유하는 최신 스냅샷 (1분마다 교체, 세션별 복사 없음)"""
+    return SnapshotHolder(load_exchange_rates, ttl=SNAPSHOT_TTL, min_refresh=MANUAL_REFRESH_MIN_AGE)
+
+
+def get_snapshot() -> RateSnapshot:
+    return get_snapshot_holder().get()
+
+
+@st.cache_data(ttl=SNAPSHOT_TTL)
+def load_venue_quotes():
+    """빗썸을 뺀 거래소 시세 (병렬 조회, 빗썸은 스냅샷 시세를 다시 씀)"""
+    venues = venue_sources([name for name in VENUES if name != 'bithumb'])
+    results = fetch_sources(venues)
+    return [quote for venue in venues for quote in results.get(venue.key) or []]
+
+
+@st.cache_resource
+def get_history_store():
+    """세션 간 공유하는 이력 저장소"""
+    return HistoryStore()
+
+
+HISTORY_RANGES = {
+    "1일": 86400,
+    "1주": 7 * 86400,
+    "1개월": 30 * 86400,
+    "1년": 365 * 86400,
+}
+
+
+@st.cache_data(ttl=60)
+def load_history(source: str, metric: str, span: int):
+    """미리 집계된 OHLC 버킷 조회 (구간과 무관하게 최대 500개 점)"""
+    end = int(time.time())
+    resolution, rows = get_history_store().query(source, metric, end - span, end)
+    df = pd.DataFrame(rows, columns=['bucket', '시가', '고가', '저가', '종가'])
+    df['시각'] = pd.to_datetime(df['bucket'], unit='s', utc=True).dt.tz_convert('Asia/Seoul')
+    return resolution, df.set_index('시각')[['종가', '고가', '저가']]
+
+
+@st.fragment(run_every=HEADER_REFRESH)
+def render_investing_metrics():
+    """헤더 영역 - Investing.com 환율"""
+    investing_data = get_snapshot().investing
+    if not investing_data:
+        return
+
+    col1, col2, col3 = st.columns([1, 1, 1])
 
-if investing_data:
-    col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 1])
-    
     with col1:
         st.metric(
             label="📊 Investing.com - USD/KRW",
-            value=f"₩{investing_data['USD_KRW']:,.2f}",
+            value=f"₩{investing_data['USD_KRW']:,.2f}" if investing_data['USD_KRW'] is not None else "-",
             delta=None
         )
-    
+
     with col2:
         st.metric(
             label="📊 Investing.com - JPY(100엔)/KRW",
-            value=f"₩{investing_data['JPY_KRW']:,.2f}",
+            value=f"₩{investing_data['JPY_KRW']:,.2f}" if investing_data['JPY_KRW'] is not None else "-",
             delta=None
         )
-    
+
     with col3:
+        st.caption(f"🕐 조회일시")
+        st.caption(f"**{investing_data['datetime']}**")
+
+
+@st.fragment(run_every=CRYPTO_REFRESH)
+def render_crypto_tiles():
+    """빗썸 USDT/BTC 시세와 김치프리미엄"""
+    snapshot = get_snapshot()
+    investing_data = snapshot.investing
+    bithumb_data = snapshot.bithumb
+    btc_data = snapshot.btc
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
         if bithumb_data:
-            # 김치프리미엄 계산: ((빗썸 USDT - Investing USD) / Investing USD) * 100
-            kimchi_premium = ((bithumb_data['price'] - investing_data['USD_KRW']) / investing_data['USD_KRW']) * 100
-            
             st.metric(
                 label="💰 빗썸 USDT",
                 value=f"₩{bithumb_data['price']:,.0f}",
                 delta=f"{bithumb_data['change_rate']:+.2f}%",
                 delta_color="inverse"  # 상승=빨간색, 하락=녹색
             )
-            
-            # 김치프리미엄 색상 표시
-            if kimchi_premium > 0:
-                kimchi_color = "🔴"
-                kimchi_text = f"+{kimchi_premium:.2f}%"
-            elif kimchi_premium < 0:
-                kimchi_color = "🔵"
-                kimchi_text = f"{kimchi_premium:.2f}%"
-            else:
-                kimchi_color = "⚪"
-                kimchi_text = "0.00%"
-            
-            st.caption(f"{kimchi_color} 김치프리미엄: **{kimchi_text}**")
-    
-    with col4:
+
+            # 김치프리미엄: ((빗썸 USDT - Investing USD) / Investing USD) * 100
+            kimchi_premium = snapshot.kimchi_premium
+            if kimchi_premium is not None:
+                # 김치프리미엄 색상 표시
+                if kimchi_premium > 0:
+                    kimchi_color = "🔴"
+                    kimchi_text = f"+{kimchi_premium:.2f}%"
+                elif kimchi_premium < 0:
+                    kimchi_color = "🔵"
+                    kimchi_text = f"{kimchi_premium:.2f}%"
+                else:
+                    kimchi_color = "⚪"
+                    kimchi_text = "0.00%"
+
+                st.caption(f"{kimchi_color} 김치프리미엄: **{kimchi_text}**")
+
+    with col2:
         if btc_data:
             st.metric(
                 label="₿ 빗썸 BTC",
@@ -77,93 +148,126 @@ if investing_data:
                 delta=f"{btc_data['change_rate']:+.2f}%",
                 delta_color="inverse"  # 상승=빨간색, 하락=녹색
             )
-    
-    with col5:
-        st.caption(f"🕐 조회일시")
-        st.caption(f"**{investing_data['datetime']}**")
 
-    st.divider()
+    if investing_data:
+        quotes = ticker_quotes('빗썸', {'USDT': bithumb_data, 'BTC': btc_data}) + load_venue_quotes()
+        premiums = compute_premiums(quotes, investing_data['USD_KRW'])
+        if premiums['weighted']:
+            st.caption(" · ".join(
+                f"{asset} 가중 김프 **{value:+.2f}%**" for asset, value in premiums['weighted'].items()
+            ))
+            with st.expander("거래소별 김치프리미엄"):
+                table = premiums['table'].rename(columns={
+                    'venue': '거래소', 'asset': '자산', 'quote': '마켓',
+                    'price': '가격', 'volume': '24시간 거래량', 'premium': '김프(%)',
+                })
+                st.dataframe(table, use_container_width=True, hide_index=True)
 
-# 새로고침 버튼
-if st.button("🔄 새로고침"):
-    st.rerun()
 
-# 은행별 환율 비교표
-st.subheader("🏦 은행별 환율 비교")
+@st.fragment(run_every=BANK_TABLE_REFRESH)
+def render_bank_table():
+    """은행별 환율 비교표 (스냅샷에 미리 만들어 둔 표·스타일로 이 세션의 Styler만 새로 만듦)"""
+    snapshot = get_snapshot()
+
+    if not snapshot.banks:
+        st.warning("데이터를 가져올 수 없습니다.")
+        return
 
-if bank_data:
-    df = pd.DataFrame(bank_data)
-    has_previous_data = 'is_previous' in df.columns and df['is_previous'].any()
-    
-    # Investing.com 환율과 비교하여 차이 계산
-    if investing_data:
-        investing_usd = investing_data['USD_KRW']
-        investing_jpy = investing_data['JPY_KRW']
-        
-        # USD 차이 계산 (Investing.com - 은행)
-        df['USD_diff'] = investing_usd - df['USD_raw']
-        df['USD'] = df.apply(
-            lambda row: f"{row['USD_raw']:,.2f} ({row['USD_diff']:+.2f})", 
-            axis=1
-        )
-        
-        # JPY 차이 계산 (Investing.com - 은행)
-        df['JPY_diff'] = investing_jpy - df['JPY_raw']
-        df['JPY(100엔)'] = df.apply(
-            lambda row: f"{row['JPY_raw']:,.2f} ({row['JPY_diff']:+.2f})", 
-            axis=1
-        )
-    else:
-        # Investing.com 데이터가 없으면 기본 포맷
-        df['USD'] = df['USD_raw'].apply(lambda x: f"{x:,.2f}")
-        df['JPY(100엔)'] = df['JPY_raw'].apply(lambda x: f"{x:,.2f}")
-        df['USD_diff'] = 0
-        df['JPY_diff'] = 0
-    
-    # 조회일시 순으로 오름차순 정렬
-    df = df.sort_values('조회일시', ascending=True)
-    
-    # 표시용 컬럼만 선택
-    display_df = df[['은행', 'USD', 'JPY(100엔)', '조회일시', '고시회차']]
-    
-    # 스타일 함수 정의
-    def color_diff(val):
-        """차이에 따라 색상 지정"""
-        if '(' not in str(val):
-            return ''
-        
-        # 괄호 안의 숫자 추출
-        try:
-            diff_str = str(val).split('(')[1].split(')')[0]
-            diff = float(diff_str)
-            
-            if diff < 0:
-                # 마이너스 (은행이 낮음, 유리) - 파란색
-                return 'color: #0066cc; font-weight: bold'
-            elif diff > 0:
-                # 플러스 (은행이 높음, 불리) - 빨간색
-                return 'color: #cc0000; font-weight: bold'
-            else:
-                return ''
-        except:
-            return ''
-    
-    # 스타일 적용
-    styled_df = display_df.style.applymap(
-        color_diff, 
-        subset=['USD', 'JPY(100엔)']
-    )
-    
     st.dataframe(
-        styled_df,
+        snapshot.styled(),
         use_container_width=True,
         hide_index=True
     )
-    
+
     # 업데이트 시간 표시
-    st.caption(f"마지막 업데이트: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M:%S')}")
+    st.caption(f"마지막 업데이트: {datetime.fromtimestamp(snapshot.taken_at).strftime('%Y년 %m월 %d일 %H:%M:%S')}")
     st.caption("💡 🔵 파란색 (외화 매도) | 🔴 빨간색 (외화 매수)")
-    if has_previous_data:
+    if snapshot.has_previous:
         st.caption("※ 일부 은행 데이터는 전 영업일(또는 가장 최근 영업일) 기준입니다.")
-else:
-    st.warning("데이터를 가져올 수 없습니다.")
+
+
+@st.fragment
+def render_currency_comparison():
+    """Investing.com 환율표 기준으로 임의 통화의 은행 고시환율 비교"""
+    snapshot = get_snapshot()
+    reference_rates = (snapshot.investing or {}).get('rates') or {}
+    currencies = sorted(
+        set(reference_rates)
+        & {code for item in snapshot.bank_rows for code in (item.get('rates') or {})}
+    )
+    if not currencies:
+        st.info("비교할 수 있는 통화가 없습니다.")
+        return
+
+    currency = st.selectbox("통화", currencies, index=currencies.index('EUR') if 'EUR' in currencies else 0)
+    rows = compare_banks(reference_rates, snapshot.bank_rows, currency)
+    unit = QUOTE_UNITS.get(currency, 1)
+    st.caption(f"Investing.com 기준 {currency}({unit}) ₩{reference_rates[currency]:,.2f}")
+    st.dataframe(
+        [
+            {'은행': row['은행'], f'{currency}({unit})': f"{row['rate']:,.2f}", '차이': f"{row['diff']:+.2f}"}
+            for row in rows
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+@st.fragment
+def render_history():
+    """이력 차트 (기간 전환 시 이 영역만 다시 그림)"""
+    series = get_history_store().series()
+    if not series:
+        st.info("아직 저장된 이력이 없습니다.")
+        return
+
+    col1, col2 = st.columns([2, 3])
+    with col1:
+        selected = st.selectbox(
+            "시리즈",
+            series,
+            format_func=lambda item: f"{item[0]} - {item[1]}",
+        )
+    with col2:
+        range_label = st.radio("기간", list(HISTORY_RANGES), horizontal=True)
+
+    resolution, history_df = load_history(selected[0], selected[1], HISTORY_RANGES[range_label])
+    if history_df.empty:
+        st.info("선택한 기간의 이력이 없습니다.")
+    else:
+        st.line_chart(history_df)
+        st.caption(f"집계 단위: {resolution // 60}분 · {len(history_df)}개 구간 (종가/고가/저가)")
+
+
+# 최초 로드 (이후 각 fragment가 공유 스냅샷을 읽음)
+with st.spinner('환율 데이터 조회 중...'):
+    get_snapshot()
+
+st.title("💱 환율 정보")
+
+header_col, crypto_col = st.columns([3, 2])
+with header_col:
+    render_investing_metrics()
+with crypto_col:
+    render_crypto_tiles()
+
+st.divider()
+
+# 새로고침 버튼 - 스냅샷이 충분히 오래됐을 때만 다시 조회하고 전체를 다시 그림
+# (모든 세션이 같은 스냅샷을 쓰므로 여러 사용자가 연달아 눌러도 조회는 한 번)
+if st.button("🔄 새로고침"):
+    if get_snapshot_holder().invalidate():
+        st.rerun()
+    st.toast(f"방금 조회한 데이터입니다. {MANUAL_REFRESH_MIN_AGE}초 후에 다시 시도하세요.")
+
+# 은행별 환율 비교표
+st.subheader("🏦 은행별 환율 비교")
+render_bank_table()
+
+# 통화별 비교
+st.subheader("🌐 통화별 은행 비교")
+render_currency_comparison()
+
+# 이력 차트
+st.subheader("📈 이력")
+render_history()
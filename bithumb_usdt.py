@@ -1,8 +1,10 @@
-import requests
+import argparse
+import http_client
+import profiling
 from bs4 import BeautifulSoup
 import json
 
-def get_bithumb_usdt():
+def get_bithumb_usdt(timeout: float = 10):
     """
     빗썸에서 테더(USDT) 가격과 변동률 조회
     """
@@ -10,7 +12,7 @@ def get_bithumb_usdt():
     url = "https://api.bithumb.com/public/ticker/USDT_KRW"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=timeout)
         response.raise_for_status()
         
         data = response.json()
@@ -51,14 +53,14 @@ def get_bithumb_usdt():
         return None
 
 
-def get_bithumb_btc():
+def get_bithumb_btc(timeout: float = 10):
     """
     빗썸에서 비트코인(BTC) 가격과 변동률 조회
     """
     url = "https://api.bithumb.com/public/ticker/BTC_KRW"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=timeout)
         response.raise_for_status()
         
         data = response.json()
@@ -99,10 +101,11 @@ def get_bithumb_btc():
         return None
 
 
-if __name__ == "__main__":
+def print_prices():
     print("=== 빗썸 USDT 가격 조회 ===\n")
     
-    usdt_data = get_bithumb_usdt()
+    with profiling.section('빗썸 USDT'):
+        usdt_data = get_bithumb_usdt()
     
     if usdt_data:
         print(f"💵 테더(USDT) 가격: ₩{usdt_data['price']:,.0f}")
@@ -115,7 +118,8 @@ if __name__ == "__main__":
     
     print("\n=== 빗썸 BTC 가격 조회 ===\n")
     
-    btc_data = get_bithumb_btc()
+    with profiling.section('빗썸 BTC'):
+        btc_data = get_bithumb_btc()
     
     if btc_data:
         print(f"₿ 비트코인(BTC) 가격: ₩{btc_data['price']:,.0f}")
@@ -125,3 +129,14 @@ if __name__ == "__main__":
         print(f"🔺 최고가: ₩{btc_data['high_price']:,.0f}")
         print(f"🔻 최저가: ₩{btc_data['low_price']:,.0f}")
         print(f"📦 24시간 거래량: {btc_data['volume']:,.4f} BTC")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="빗썸 USDT/BTC 시세를 조회합니다.")
+    profiling.add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiling.run_cli('bithumb_usdt', print_prices, args)
+
+
+if __name__ == "__main__":
+    main()
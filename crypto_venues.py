@@ -0,0 +1,80 @@
+"""
+거래소별 USDT/BTC 시세 조회
+
+참고:
+- KRW 마켓: 빗썸, 업비트
+- USD(USDT) 마켓: 바이낸스
+- 각 거래소의 API 주소는 환경 변수로 바꿀 수 있어 로컬 대역 서버로 시험할 수 있음
+"""
+import os
+
+import http_client
+
+BITHUMB_API = os.getenv("DONDON_BITHUMB_API", "https://api.bithumb.com")
+UPBIT_API = os.getenv("DONDON_UPBIT_API", "https://api.upbit.com")
+BINANCE_API = os.getenv("DONDON_BINANCE_API", "https://api.binance.com")
+
+
+def _quote(venue, asset, quote, price, volume):
+    return {
+        'venue': venue,
+        'asset': asset,
+        'quote': quote,      # 'KRW' 또는 'USD'
+        'price': float(price),
+        'volume': float(volume),  # 24시간 거래량 (asset 수량)
+    }
+
+
+def get_bithumb_quotes(base_url: str = BITHUMB_API, timeout: float = 10):
+    """
+    빗썸 USDT/BTC 원화 시세 (ALL_KRW 한 번으로 조회)
+    """
+    response = http_client.get(f"{base_url}/public/ticker/ALL_KRW", timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    if data.get('status') != '0000':
+        raise RuntimeError(f"빗썸 API 오류: {data.get('message', '알 수 없는 오류')}")
+
+    tickers = data['data']
+    return [
+        _quote('빗썸', asset, 'KRW', tickers[asset]['closing_price'], tickers[asset]['units_traded_24H'])
+        for asset in ('USDT', 'BTC')
+        if asset in tickers
+    ]
+
+
+def get_upbit_quotes(base_url: str = UPBIT_API, timeout: float = 10):
+    """
+    업비트 USDT/BTC 원화 시세
+    """
+    response = http_client.get(
+        f"{base_url}/v1/ticker",
+        params={'markets': 'KRW-USDT,KRW-BTC'},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return [
+        _quote('업비트', item['market'].split('-')[1], 'KRW', item['trade_price'], item['acc_trade_volume_24h'])
+        for item in response.json()
+    ]
+
+
+def get_binance_quotes(base_url: str = BINANCE_API, timeout: float = 10):
+    """
+    바이낸스 BTC/USDT 시세 (USDT = USD로 간주)
+    """
+    response = http_client.get(
+        f"{base_url}/api/v3/ticker/24hr",
+        params={'symbol': 'BTCUSDT'},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    item = response.json()
+    return [_quote('바이낸스', 'BTC', 'USD', item['lastPrice'], item['volume'])]
+
+
+VENUES = {
+    'bithumb': get_bithumb_quotes,
+    'upbit': get_upbit_quotes,
+    'binance': get_binance_quotes,
+}
@@ -0,0 +1,88 @@
+"""
+크롤러 공용 HTTP 요청 함수
+
+모든 fetcher는 requests 대신 이 모듈을 통해 요청하며,
+요청 전에 호스트별 속도 제한(rate_limiter)을 거친다.
+스레드마다 requests.Session을 하나씩 두어 연결을 재사용한다.
+observe()로 콜백을 걸어 두면 요청마다 속도 제한 대기와 네트워크 시간을 알려준다 (profiling).
+DONDON_UPSTREAM(또는 set_upstream)을 지정하면 모든 요청을 그 주소로 보낸다 (reporting.simulator).
+"""
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from rate_limiter import acquire
+
+_local = threading.local()
+_observer = contextvars.ContextVar('http_observer', default=None)
+
+# 예: http://127.0.0.1:8900 → https://bank.shinhan.com/a?b=1 요청이 http://127.0.0.1:8900/bank.shinhan.com/a?b=1로 감
+UPSTREAM = os.getenv("DONDON_UPSTREAM") or None
+
+
+def _session():
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        _local.session = session
+    return session
+
+
+@contextlib.contextmanager
+def observe(callback):
+    """이 컨텍스트 안의 요청마다 callback(host, 속도 제한 대기 초, 네트워크 초) 호출 (바깥 콜백도 함께 호출)"""
+    parent = _observer.get()
+    if parent is not None:
+        inner = callback
+
+        def callback(*args):
+            inner(*args)
+            parent(*args)
+
+    token = _observer.set(callback)
+    try:
+        yield
+    finally:
+        _observer.reset(token)
+
+
+def set_upstream(base_url):
+    """모든 요청을 base_url/<원래 호스트>/<경로>로 보냄 (None이면 원래 주소로)"""
+    global UPSTREAM
+    UPSTREAM = base_url.rstrip('/') if base_url else None
+
+
+def _rewrite(parts):
+    url = f"{UPSTREAM}/{parts.netloc}{parts.path or '/'}"
+    return f"{url}?{parts.query}" if parts.query else url
+
+
+def request(method, url, *, priority=None, **kwargs):
+    """속도 제한을 적용한 HTTP 요청 (priority: rate_limiter.INTERACTIVE/BACKFILL)"""
+    parts = urlsplit(url)
+    # 속도 제한·관측은 시뮬레이터로 돌려도 원래 호스트 기준
+    host = parts.hostname
+    if UPSTREAM:
+        url = _rewrite(parts)
+    started = time.perf_counter()
+    acquire(host, priority)
+    sent = time.perf_counter()
+    try:
+        return _session().request(method, url, **kwargs)
+    finally:
+        callback = _observer.get()
+        if callback is not None:
+            callback(host, sent - started, time.perf_counter() - sent)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
@@ -1,21 +1,24 @@
 """
-신한은행, 국민은행, Investing.com 환율 정보 통합 크롤러
+신한은행, 국민은행, 하나은행, 우리은행, NH농협은행, IBK기업은행, Investing.com 환율 정보 통합 크롤러
 
 참고:
 - 신한은행: 공식 API 사용
 - 국민은행: HTML 파싱
 - 하나은행: AJAX POST 요청 사용
+- 우리은행, NH농협은행, IBK기업은행: 응답 HTML을 정규식으로 직접 파싱
 - Investing.com: 참고용
 """
-import requests
+import argparse
+import http_client
 import json
+import profiling
 import re
 from datetime import datetime
 from typing import Optional
 from bs4 import BeautifulSoup
 
 
-def get_shinhan_exchange_rate(target_date: Optional[datetime] = None):
+def get_shinhan_exchange_rate(target_date: Optional[datetime] = None, timeout: float = 10):
     """
     신한은행 API에서 환율 정보 조회
     """
@@ -95,7 +98,7 @@ def get_shinhan_exchange_rate(target_date: Optional[datetime] = None):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=data)
+        response = http_client.post(url, headers=headers, json=data, timeout=timeout)
         response.raise_for_status()
         
         result = response.json()
@@ -110,6 +113,7 @@ def get_shinhan_exchange_rate(target_date: Optional[datetime] = None):
         
         usd_rate = None
         jpy_rate = None
+        rates = {}
         
         for item in rates_list:
             currency_code = item.get('통화CODE')
@@ -117,6 +121,8 @@ def get_shinhan_exchange_rate(target_date: Optional[datetime] = None):
                 usd_rate = item.get('매매기준환율')
             elif currency_code == 'JPY':
                 jpy_rate = item.get('매매기준환율')
+            if currency_code and item.get('매매기준환율'):
+                rates[currency_code] = float(item['매매기준환율'])
         
         return {
             'bank': '신한은행',
@@ -124,7 +130,8 @@ def get_shinhan_exchange_rate(target_date: Optional[datetime] = None):
             'time': announce_time,
             'round': announce_round,
             'USD': usd_rate,
-            'JPY': jpy_rate
+            'JPY': jpy_rate,
+            'rates': rates
         }
 
     except Exception as e:
@@ -132,25 +139,10 @@ def get_shinhan_exchange_rate(target_date: Optional[datetime] = None):
         return None
 
 
-def get_kbstar_exchange_rate(target_date: Optional[datetime] = None):
-    """
-    국민은행(KB Star) 환율 정보 크롤링
-    """
-    url = "https://obank.kbstar.com/quics?page=C101423"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-    }
-    
+def parse_kbstar_exchange_rate(html: str):
+    """국민은행 환율 페이지 파싱 (4번째 표: 고시일시/회차, 5번째 표: 통화별 매매기준율)"""
+    soup = BeautifulSoup(html, 'html.parser')
     try:
-        _ = target_date or datetime.now()  # 파라미터 호환용
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         # 환율등록일시(회차) 추출 - 4번째 테이블
         announce_datetime = None
         announce_time = None
@@ -169,7 +161,6 @@ def get_kbstar_exchange_rate(target_date: Optional[datetime] = None):
                     if first_td:
                         # 예: "2025.11.27 19:27:13 (584회차)"
                         text = first_td.text.strip()
-                        import re
                         match = re.match(r'(\d{4})\.(\d{2})\.(\d{2})\s+(\d{2}):(\d{2}):(\d{2})\s+\((\d+)회차\)', text)
                         if match:
                             year, month, day, hour, minute, second, round_num = match.groups()
@@ -180,6 +171,7 @@ def get_kbstar_exchange_rate(target_date: Optional[datetime] = None):
         # USD, JPY 환율 추출 - 5번째 테이블
         usd_rate = None
         jpy_rate = None
+        rates = {}
         
         if len(tables) >= 5:
             rate_table = tables[4]  # 5번째 테이블
@@ -189,13 +181,20 @@ def get_kbstar_exchange_rate(target_date: Optional[datetime] = None):
                 for row in rows:
                     tds = row.find_all('td')
                     if len(tds) >= 3:
-                        # 첫 번째 td에서 통화 코드 찾기
-                        currency_code = tds[0].text.strip()
+                        # 첫 번째 td에서 통화 코드 찾기 (통화 코드가 없는 행은 건너뜀)
+                        code = _CURRENCY_CODE_RE.search(tds[0].text)
+                        if not code:
+                            continue
+                        currency_code = code.group(1)
                         if currency_code == 'USD':
                             # 매매기준율은 3번째 td (인덱스 2)
                             usd_rate = tds[2].text.strip().replace(',', '')
                         elif currency_code == 'JPY':
                             jpy_rate = tds[2].text.strip().replace(',', '')
+                        try:
+                            rates.setdefault(currency_code, float(tds[2].text.strip().replace(',', '')))
+                        except ValueError:
+                            pass
         
         return {
             'bank': '국민은행',
@@ -203,57 +202,42 @@ def get_kbstar_exchange_rate(target_date: Optional[datetime] = None):
             'time': announce_time,
             'round': announce_round,
             'USD': float(usd_rate) if usd_rate else None,
-            'JPY': float(jpy_rate) if jpy_rate else None
+            'JPY': float(jpy_rate) if jpy_rate else None,
+            'rates': rates
         }
-        
-    except Exception as e:
-        print(f"국민은행 조회 오류: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+    finally:
+        # 파싱 트리는 순환 참조가 많아 GC를 기다리지 않고 바로 해제
+        soup.decompose()
 
 
-def get_hanabank_exchange_rate(target_date: Optional[datetime] = None):
+def get_kbstar_exchange_rate(target_date: Optional[datetime] = None, timeout: float = 10):
     """
-    하나은행 환율 정보 크롤링 (POST 요청 사용)
+    국민은행(KB Star) 환율 정보 크롤링
     """
-    url = "https://www.kebhana.com/cms/rate/wpfxd651_01i_01.do"
+    url = "https://obank.kbstar.com/quics?page=C101423"
     
     headers = {
-        'Accept': 'text/javascript, text/html, application/xml, text/xml, */*',
-        'Accept-Language': 'ko-KR,ko;q=0.9',
-        'Connection': 'keep-alive',
-        'Content-type': 'application/x-www-form-urlencoded; charset=UTF-8',
-        'Origin': 'https://www.kebhana.com',
-        'Referer': 'https://www.kebhana.com/cms/rate/index.do?contentUrl=/cms/rate/wpfxd651_01i.do',
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'X-Prototype-Version': '1.5.1.1',
-        'X-Requested-With': 'XMLHttpRequest',
-    }
-    
-    target_dt = target_date or datetime.now()
-    date_str = target_dt.strftime('%Y%m%d')
-    date_formatted = target_dt.strftime('%Y-%m-%d')
-    
-    data = {
-        'ajax': 'true',
-        'curCd': '',
-        'tmpInqStrDt': date_formatted,
-        'pbldDvCd': '3',  # 3 = 현재/최종
-        'pbldSqn': '',
-        'inqStrDt': date_str,
-        'inqKindCd': '1',
-        'hid_key_data': '',
-        'hid_enc_data': '',
-        'requestTarget': 'searchContentDiv'
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
     }
     
     try:
-        response = requests.post(url, headers=headers, data=data, timeout=10)
+        _ = target_date or datetime.now()  # 파라미터 호환용
+        response = http_client.get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
+        return parse_kbstar_exchange_rate(response.text)
+
+    except Exception as e:
+        print(f"국민은행 조회 오류: {e}")
+        return None
+
+
+def parse_hanabank_exchange_rate(html: str):
+    """하나은행 환율 응답 파싱 (고시일시/회차는 본문 텍스트, 매매기준율은 9번째 셀)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    try:
         # 고시일시/회차 추출
         announce_datetime = None
         announce_time = None
@@ -261,7 +245,7 @@ def get_hanabank_exchange_rate(target_date: Optional[datetime] = None):
         
         # 고시일시 패턴: "2025년11월27일 19시36분00초 (731회차)"
         datetime_pattern = r'(\d{4})년(\d{2})월(\d{2})일.*?(\d{2})시(\d{2})분(\d{2})초.*?\((\d+)회차\)'
-        matches = re.findall(datetime_pattern, response.text, re.DOTALL)
+        matches = re.findall(datetime_pattern, html, re.DOTALL)
         if matches:
             year, month, day, hour, minute, second, round_num = matches[0]
             announce_datetime = f"{year}{month}{day}"
@@ -271,6 +255,7 @@ def get_hanabank_exchange_rate(target_date: Optional[datetime] = None):
         # USD, JPY 환율 추출
         usd_rate = None
         jpy_rate = None
+        rates = {}
         
         tables = soup.find_all('table')
         for table in tables:
@@ -284,6 +269,13 @@ def get_hanabank_exchange_rate(target_date: Optional[datetime] = None):
                 first_cell = cells[0].text.strip()
                 
                 # 매매기준율은 9번째 셀 (인덱스 8)
+                code = _CURRENCY_CODE_RE.search(first_cell)
+                if code and code.group(1) not in rates:
+                    try:
+                        rates[code.group(1)] = float(cells[8].text.strip().replace(',', ''))
+                    except ValueError:
+                        pass
+                
                 if '미국 USD' in first_cell or first_cell == '미국 USD':
                     rate_text = cells[8].text.strip().replace(',', '')
                     try:
@@ -304,19 +296,317 @@ def get_hanabank_exchange_rate(target_date: Optional[datetime] = None):
             'time': announce_time,
             'round': announce_round,
             'USD': usd_rate,
-            'JPY': jpy_rate
+            'JPY': jpy_rate,
+            'rates': rates
         }
+    finally:
+        soup.decompose()
+
+
+def get_hanabank_exchange_rate(target_date: Optional[datetime] = None, timeout: float = 10):
+    """
+    하나은행 환율 정보 크롤링 (POST 요청 사용)
+    """
+    url = "https://www.kebhana.com/cms/rate/wpfxd651_01i_01.do"
+    
+    headers = {
+        'Accept': 'text/javascript, text/html, application/xml, text/xml, */*',
+        'Accept-Language': 'ko-KR,ko;q=0.9',
+        'Connection': 'keep-alive',
+        'Content-type': 'application/x-www-form-urlencoded; charset=UTF-8',
+        'Origin': 'https://www.kebhana.com',
+        'Referer': 'https://www.kebhana.com/cms/rate/index.do?contentUrl=/cms/rate/wpfxd651_01i.do',
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'X-Prototype-Version': '1.5.1.1',
+        'X-Requested-With': 'XMLHttpRequest',
+    }
+    
+    target_dt = target_date or datetime.now()
+    date_str = target_dt.strftime('%Y%m%d')
+    date_formatted = target_dt.strftime('%Y-%m-%d')
+    
+    data = {
+        'ajax': 'true',
+        'curCd': '',
+        'tmpInqStrDt': date_formatted,
+        'pbldDvCd': '3',  # 3 = 현재/최종
+        'pbldSqn': '',
+        'inqStrDt': date_str,
+        'inqKindCd': '1',
+        'hid_key_data': '',
+        'hid_enc_data': '',
+        'requestTarget': 'searchContentDiv'
+    }
+    
+    try:
+        response = http_client.post(url, headers=headers, data=data, timeout=timeout)
+        response.raise_for_status()
         
+        return parse_hanabank_exchange_rate(response.text)
+
     except Exception as e:
         print(f"하나은행 조회 오류: {e}")
-        import traceback
-        traceback.print_exc()
         return None
 
 
-def get_investing_exchange_rate():
+# 우리/농협/IBK 응답은 단순한 표 구조라 트리를 만들지 않고 정규식으로 바로 추출
+_ROW_RE = re.compile(r'<tr[^>]*>(.*?)</tr>', re.S | re.I)
+_CELL_RE = re.compile(r'<t[dh][^>]*>(.*?)</t[dh]>', re.S | re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+_ANNOUNCE_RE = re.compile(
+    r'(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})\s*일?\s*'
+    r'(\d{1,2})\s*[:시]\s*(\d{2})\s*(?:[:분]\s*(\d{2})\s*초?)?'
+)
+_ROUND_RE = re.compile(r'(\d+)\s*회')
+_CURRENCY_CODE_RE = re.compile(r'\b([A-Z]{3})\b')
+
+
+def _iter_table_rows(html: str):
+    """<tr>별 셀 텍스트 목록"""
+    for row in _ROW_RE.finditer(html):
+        cells = _CELL_RE.findall(row.group(1))
+        if cells:
+            yield [_TAG_RE.sub('', cell).replace('&nbsp;', ' ').strip() for cell in cells]
+
+
+def _parse_announce(html: str):
+    """고시일시/회차 추출 → (YYYYMMDD, HHMMSS, 회차)"""
+    announce_date = None
+    announce_time = None
+    announce_round = None
+
+    match = _ANNOUNCE_RE.search(html)
+    if match:
+        year, month, day, hour, minute, second = match.groups()
+        announce_date = f"{year}{int(month):02d}{int(day):02d}"
+        announce_time = f"{int(hour):02d}{minute}{second or '00'}"
+        round_match = _ROUND_RE.search(html, match.end(), match.end() + 200)
+        if round_match:
+            announce_round = round_match.group(1)
+
+    return announce_date, announce_time, announce_round
+
+
+def _parse_rate_rows(html: str, code_index: int, rate_index: int):
+    """통화 셀에서 통화 코드를 찾아 통화별 매매기준율 추출 → {'USD': ..., 'JPY': ..., ...}"""
+    rates = {}
+
+    for cells in _iter_table_rows(html):
+        if len(cells) <= max(code_index, rate_index):
+            continue
+        code = _CURRENCY_CODE_RE.search(cells[code_index])
+        if not code or code.group(1) in rates:
+            continue
+        try:
+            rates[code.group(1)] = float(cells[rate_index].replace(',', ''))
+        except ValueError:
+            continue
+
+    return rates
+
+
+def parse_woori_exchange_rate(html: str):
+    """우리은행 환율 응답 파싱 (통화코드 | 통화명 | 송금 보낼때 | 받을때 | 현찰 살때 | 팔때 | 매매기준율 ...)"""
+    announce_date, announce_time, announce_round = _parse_announce(html)
+    rates = _parse_rate_rows(html, code_index=0, rate_index=6)
+    return {
+        'bank': '우리은행',
+        'date': announce_date,
+        'time': announce_time,
+        'round': announce_round,
+        'USD': rates.get('USD'),
+        'JPY': rates.get('JPY'),
+        'rates': rates
+    }
+
+
+def get_woori_exchange_rate(target_date: Optional[datetime] = None, timeout: float = 10):
+    """
+    우리은행 환율 정보 크롤링 (POST 요청 사용)
+    """
+    url = "https://spot.wooribank.com/pot/jcc?withyou=FXXRT0021&__ID=c012238"
+
+    headers = {
+        'Accept': 'text/html, */*; q=0.01',
+        'Accept-Language': 'ko-KR,ko;q=0.9',
+        'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
+        'Origin': 'https://spot.wooribank.com',
+        'Referer': 'https://spot.wooribank.com/pot/Dream?withyou=FXXRT0021',
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'X-Requested-With': 'XMLHttpRequest',
+    }
+
+    target_dt = target_date or datetime.now()
+    date_str = target_dt.strftime('%Y%m%d')
+
+    data = {
+        'BAS_DT_601': date_str,
+        'NTC_DIS': 'A',   # A = 최종 고시
+        'INQ_DIS_601': '',
+        'SELECT_DATE_601': target_dt.strftime('%Y.%m.%d'),
+    }
+
+    try:
+        response = http_client.post(url, headers=headers, data=data, timeout=timeout)
+        response.raise_for_status()
+        return parse_woori_exchange_rate(response.text)
+
+    except Exception as e:
+        print(f"우리은행 조회 오류: {e}")
+        return None
+
+
+def parse_nonghyup_exchange_rate(html: str):
+    """NH농협은행 환율 응답 파싱 (통화 | 매매기준율 | 송금 보낼때 | 받을때 | 현찰 살때 | 팔때 ...)"""
+    announce_date, announce_time, announce_round = _parse_announce(html)
+    rates = _parse_rate_rows(html, code_index=0, rate_index=1)
+    return {
+        'bank': 'NH농협은행',
+        'date': announce_date,
+        'time': announce_time,
+        'round': announce_round,
+        'USD': rates.get('USD'),
+        'JPY': rates.get('JPY'),
+        'rates': rates
+    }
+
+
+def get_nonghyup_exchange_rate(target_date: Optional[datetime] = None, timeout: float = 10):
+    """
+    NH농협은행 환율 정보 크롤링 (POST 요청 사용)
+    """
+    url = "https://banking.nonghyup.com/servlet/PGEX0001R.frag"
+
+    headers = {
+        'Accept': 'text/html, */*; q=0.01',
+        'Accept-Language': 'ko-KR,ko;q=0.9',
+        'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
+        'Origin': 'https://banking.nonghyup.com',
+        'Referer': 'https://banking.nonghyup.com/servlet/PGEX0001I.view',
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'X-Requested-With': 'XMLHttpRequest',
+    }
+
+    target_dt = target_date or datetime.now()
+
+    data = {
+        'InqDate': target_dt.strftime('%Y%m%d'),
+        'InqGubun': '1',  # 1 = 최종 고시
+        'CurCd': '',
+    }
+
+    try:
+        response = http_client.post(url, headers=headers, data=data, timeout=timeout)
+        response.raise_for_status()
+        return parse_nonghyup_exchange_rate(response.text)
+
+    except Exception as e:
+        print(f"NH농협은행 조회 오류: {e}")
+        return None
+
+
+def parse_ibk_exchange_rate(html: str):
+    """IBK기업은행 환율 응답 파싱 (통화 | 매매기준율 | 현찰 살때 | 팔때 | 송금 보낼때 | 받을때 ...)"""
+    announce_date, announce_time, announce_round = _parse_announce(html)
+    rates = _parse_rate_rows(html, code_index=0, rate_index=1)
+    return {
+        'bank': 'IBK기업은행',
+        'date': announce_date,
+        'time': announce_time,
+        'round': announce_round,
+        'USD': rates.get('USD'),
+        'JPY': rates.get('JPY'),
+        'rates': rates
+    }
+
+
+def get_ibk_exchange_rate(target_date: Optional[datetime] = None, timeout: float = 10):
+    """
+    IBK기업은행 환율 정보 크롤링
+    """
+    url = "https://www.ibk.co.kr/fxtr/excRateList.ibk"
+
+    headers = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.9',
+        'Referer': 'https://www.ibk.co.kr/fxtr/excRateList.ibk?pageId=IR03010100',
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    }
+
+    target_dt = target_date or datetime.now()
+
+    params = {
+        'pageId': 'IR03010100',
+        'srchDt': target_dt.strftime('%Y%m%d'),
+        'ntcGbn': 'L',  # L = 최종 고시
+    }
+
+    try:
+        response = http_client.get(url, headers=headers, params=params, timeout=timeout)
+        response.raise_for_status()
+        return parse_ibk_exchange_rate(response.text)
+
+    except Exception as e:
+        print(f"IBK기업은행 조회 오류: {e}")
+        return None
+
+
+# Investing.com 환율표의 통화 ID (행: pair_{ID}, 셀: last_{행 ID}_{열 ID})
+INVESTING_CURRENCY_IDS = {12: 'USD', 2: 'JPY', 28: 'KRW'}
+
+_INVESTING_TABLE_RE = re.compile(r'<table[^>]*id="exchange_rates_1".*?</table>', re.S)
+_INVESTING_HEADER_RE = re.compile(r'<th[^>]*>(.*?)</th>', re.S)
+_INVESTING_ROW_RE = re.compile(r'<tr[^>]*id="pair_(\d+)"[^>]*>(.*?)</tr>', re.S)
+_INVESTING_CELL_RE = re.compile(r'id="last_(\d+)_(\d+)"[^>]*>([^<]*)<')
+
+
+def parse_investing_rate_table(html: str):
+    """
+    Investing.com 환율표(exchange_rates_1) 전체를 한 번에 파싱
+    반환: {'USD/KRW': 1 USD당 KRW, 'JPY/KRW': 1 JPY당 KRW, ...}
+    """
+    table_match = _INVESTING_TABLE_RE.search(html)
+    if not table_match:
+        return None
+    table = table_match.group(0)
+
+    currency_ids = dict(INVESTING_CURRENCY_IDS)
+    rows = _INVESTING_ROW_RE.findall(table)
+
+    # 행 ID → 통화 코드 (행 첫머리의 통화 코드)
+    for row_id, row_html in rows:
+        code = _CURRENCY_CODE_RE.search(_TAG_RE.sub(' ', row_html))
+        if code:
+            currency_ids.setdefault(int(row_id), code.group(1))
+
+    # 열 ID → 통화 코드 (헤더 순서와 첫 행의 셀 순서를 맞춤)
+    header_codes = []
+    for cell in _INVESTING_HEADER_RE.findall(table):
+        code = _CURRENCY_CODE_RE.search(_TAG_RE.sub(' ', cell))
+        if code:
+            header_codes.append(code.group(1))
+    if rows:
+        column_ids = [int(col_id) for _, col_id, _ in _INVESTING_CELL_RE.findall(rows[0][1])]
+        if len(column_ids) == len(header_codes):
+            for col_id, code in zip(column_ids, header_codes):
+                currency_ids.setdefault(col_id, code)
+
+    pairs = {}
+    for row_id, col_id, text in _INVESTING_CELL_RE.findall(table):
+        base = currency_ids.get(int(row_id))
+        quote = currency_ids.get(int(col_id))
+        if not base or not quote or base == quote:
+            continue
+        try:
+            pairs[f"{base}/{quote}"] = float(text.strip().replace(',', ''))
+        except ValueError:
+            continue
+    return pairs
+
+
+def get_investing_exchange_rate(timeout: float = 10):
     """
-    Investing.com에서 환율 정보 크롤링
+    Investing.com에서 환율 정보 크롤링 (환율표 전체 통화쌍 포함)
     """
     url = "https://kr.investing.com/currencies/exchange-rates-table"
     
@@ -326,34 +616,15 @@ def get_investing_exchange_rate():
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 환율표 테이블 찾기
-        table = soup.find('table', {'id': 'exchange_rates_1'})
+        pairs = parse_investing_rate_table(response.text)
         
-        if not table:
+        if pairs is None:
             print("환율 테이블을 찾을 수 없습니다.")
             return None
         
-        # USD/KRW 환율
-        usd_row = table.find('tr', {'id': 'pair_12'})
-        usd_krw = None
-        if usd_row:
-            usd_krw_td = usd_row.find('td', {'id': 'last_12_28'})
-            if usd_krw_td:
-                usd_krw = usd_krw_td.text.strip().replace(',', '')
-        
-        # JPY/KRW 환율 (100엔 기준)
-        jpy_row = table.find('tr', {'id': 'pair_2'})
-        jpy_krw = None
-        if jpy_row:
-            jpy_krw_td = jpy_row.find('td', {'id': 'last_2_28'})
-            if jpy_krw_td:
-                jpy_krw = jpy_krw_td.text.strip().replace(',', '')
-        
         # 현재 시간
         current_time = datetime.now()
         
@@ -361,8 +632,9 @@ def get_investing_exchange_rate():
             'source': 'Investing.com',
             'date': current_time.strftime('%Y%m%d'),
             'time': current_time.strftime('%H%M%S'),
-            'USD_KRW': float(usd_krw) if usd_krw else None,
-            'JPY_KRW': float(jpy_krw) if jpy_krw else None
+            'USD_KRW': pairs.get('USD/KRW'),
+            'JPY_KRW': pairs.get('JPY/KRW'),  # 1엔 기준
+            'pairs': pairs
         }
         
     except Exception as e:
@@ -370,9 +642,9 @@ def get_investing_exchange_rate():
         return None
 
 
-def main():
+def print_exchange_rates():
     """
-    메인 함수 - 신한은행, 국민은행, 하나은행, Investing.com 환율 정보 출력
+    은행별 환율과 Investing.com 환율 정보 출력
     """
     print("=" * 60)
     print("환율 정보 조회")
@@ -380,7 +652,8 @@ def main():
     
     # 신한은행 환율 조회
     print("\n[신한은행]")
-    shinhan_data = get_shinhan_exchange_rate()
+    with profiling.section('신한은행'):
+        shinhan_data = get_shinhan_exchange_rate()
     if shinhan_data:
         print(f"고시날짜: {shinhan_data['date']}")
         print(f"고시시간: {shinhan_data['time']}")
@@ -390,7 +663,8 @@ def main():
     
     # 국민은행 환율 조회
     print("\n[국민은행]")
-    kbstar_data = get_kbstar_exchange_rate()
+    with profiling.section('국민은행'):
+        kbstar_data = get_kbstar_exchange_rate()
     if kbstar_data:
         print(f"고시날짜: {kbstar_data['date']}")
         print(f"고시시간: {kbstar_data['time']}")
@@ -402,7 +676,8 @@ def main():
     
     # 하나은행 환율 조회
     print("\n[하나은행]")
-    hana_data = get_hanabank_exchange_rate()
+    with profiling.section('하나은행'):
+        hana_data = get_hanabank_exchange_rate()
     if hana_data:
         print(f"고시날짜: {hana_data['date']}")
         print(f"고시시간: {hana_data['time']}")
@@ -412,9 +687,28 @@ def main():
         if hana_data['JPY']:
             print(f"JPY(100엔) 매매기준환율: {hana_data['JPY']:,.2f}")
     
+    # 우리은행, NH농협은행, IBK기업은행 환율 조회
+    for name, fetcher in (
+        ('우리은행', get_woori_exchange_rate),
+        ('NH농협은행', get_nonghyup_exchange_rate),
+        ('IBK기업은행', get_ibk_exchange_rate),
+    ):
+        print(f"\n[{name}]")
+        with profiling.section(name):
+            bank_data = fetcher()
+        if bank_data:
+            print(f"고시날짜: {bank_data['date']}")
+            print(f"고시시간: {bank_data['time']}")
+            print(f"고시회차: {bank_data['round']}회차")
+            if bank_data['USD']:
+                print(f"USD 매매기준환율: {bank_data['USD']:,.2f}")
+            if bank_data['JPY']:
+                print(f"JPY(100엔) 매매기준환율: {bank_data['JPY']:,.2f}")
+
     # Investing.com 환율 조회
     print("\n[Investing.com]")
-    investing_data = get_investing_exchange_rate()
+    with profiling.section('Investing.com'):
+        investing_data = get_investing_exchange_rate()
     if investing_data:
         print(f"조회 시간: {investing_data['date']} {investing_data['time']}")
         print(f"USD/KRW: {investing_data['USD_KRW']:,.4f}")
@@ -423,5 +717,15 @@ def main():
     print("\n" + "=" * 60)
 
 
+def main():
+    """
+    메인 함수 - --profile이면 소스별 네트워크/파싱 시간을 나눠 기록
+    """
+    parser = argparse.ArgumentParser(description="은행별 환율과 Investing.com 환율을 조회합니다.")
+    profiling.add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiling.run_cli('mybank', print_exchange_rates, args)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,238 @@
+"""
+실행 프로파일링 (--profile)
+
+참고:
+- section(이름)으로 감싼 구간마다 벽시계 시간, 네트워크 시간(http_client 요청),
+  속도 제한 대기, 스레드 CPU 시간(파싱 등)을 나누어 기록
+- 구간마다 cProfile을 켜서 함수별 통계를 남기고(.prof, pstats/snakeviz로 정렬),
+  모든 스레드를 주기적으로 샘플링해 flamegraph.pl/speedscope가 읽는 collapsed stack(.folded)을 만듦
+- 프로파일링 중이 아니면 section()은 아무 일도 하지 않음
+"""
+import argparse
+import contextlib
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+import http_client
+
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls')
+SAMPLE_INTERVAL = 0.005  # 초
+REPORT_TOP = 30
+
+_session = contextvars.ContextVar('profile_session', default=None)
+_thread_state = threading.local()
+
+
+class SectionStats:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.network = 0.0
+        self.throttle = 0.0
+        self.requests = 0
+        self.profiles = []
+
+    @property
+    def other(self):
+        """네트워크·CPU 외 시간 (스레드 대기, 락 등)"""
+        return max(0.0, self.wall - self.network - self.throttle - self.cpu)
+
+
+class ProfileSession:
+    def __init__(self, name, interval=SAMPLE_INTERVAL):
+        self.name = name
+        self.interval = interval
+        self.sections = {}
+        self.stacks = Counter()
+        self.labels = {}  # 스레드 id → 현재 구간 이름
+        self.main_thread = threading.get_ident()
+        self.started = None
+        self.wall = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample_loop, name='profile-sampler', daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+        self.wall = time.perf_counter() - self.started
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                label = self.labels.get(tid)
+                if label is None:
+                    if tid != self.main_thread:
+                        continue  # 구간 밖에서 쉬고 있는 작업 스레드
+                    label = '(main)'
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(label)
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    @contextlib.contextmanager
+    def section(self, name):
+        with self._lock:
+            stats = self.sections.setdefault(name, SectionStats(name))
+        tid = threading.get_ident()
+        previous_label = self.labels.get(tid)
+        self.labels[tid] = name
+
+        # cProfile은 스레드마다 하나만 켤 수 있으므로 바깥 구간이 이미 켰으면 생략
+        profile = None
+        if not getattr(_thread_state, 'profiling', False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                _thread_state.profiling = True
+            except ValueError:
+                profile = None  # 다른 스레드에서 이미 프로파일러 사용 중 (Python 3.12+)
+
+        def on_request(host, throttle, network):
+            with self._lock:
+                stats.requests += 1
+                stats.throttle += throttle
+                stats.network += network
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            with http_client.observe(on_request):
+                yield stats
+        finally:
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            if profile is not None:
+                profile.disable()
+                _thread_state.profiling = False
+            if previous_label is None:
+                self.labels.pop(tid, None)
+            else:
+                self.labels[tid] = previous_label
+            with self._lock:
+                stats.calls += 1
+                stats.wall += wall
+                stats.cpu += cpu
+                if profile is not None:
+                    stats.profiles.append(profile)
+
+    def summary_lines(self):
+        lines = [
+            f"[프로파일] {self.name} 전체 {self.wall:.3f}초, 샘플 {sum(self.stacks.values())}개",
+            f"{'구간':<16}{'횟수':>5}{'전체':>9}{'네트워크':>9}{'속도제한':>9}{'CPU':>9}{'기타':>9}{'요청':>5}",
+        ]
+        for stats in sorted(self.sections.values(), key=lambda s: s.wall, reverse=True):
+            lines.append(
+                f"{stats.name:<16}{stats.calls:>5}{stats.wall:>9.3f}{stats.network:>9.3f}"
+                f"{stats.throttle:>9.3f}{stats.cpu:>9.3f}{stats.other:>9.3f}{stats.requests:>5}"
+            )
+        return lines
+
+    def _stats(self, profiles):
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def write(self, out_dir, sort='cumulative'):
+        """보고서(.txt), cProfile 통계(.prof), collapsed stack(.folded) 저장 → 파일 경로 목록"""
+        os.makedirs(out_dir, exist_ok=True)
+        base = os.path.join(out_dir, self.name)
+        paths = []
+
+        report = io.StringIO()
+        report.write("\n".join(self.summary_lines()) + "\n")
+        report.write("\n(시간 단위: 초, CPU는 해당 구간 스레드의 CPU 시간 = 파싱·가공)\n")
+
+        all_profiles = [p for stats in self.sections.values() for p in stats.profiles]
+        for stats in sorted(self.sections.values(), key=lambda s: s.wall, reverse=True):
+            if not stats.profiles:
+                continue
+            report.write(f"\n=== {stats.name} (상위 {REPORT_TOP}개, {sort} 순) ===\n")
+            section_stats = self._stats(stats.profiles)
+            section_stats.stream = report
+            section_stats.sort_stats(sort).print_stats(REPORT_TOP)
+
+        if all_profiles:
+            self._stats(all_profiles).dump_stats(base + '.prof')
+            paths.append(base + '.prof')
+
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        paths.append(base + '.txt')
+
+        with open(base + '.folded', 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        paths.append(base + '.folded')
+        return paths
+
+
+@contextlib.contextmanager
+def section(name):
+    """프로파일링 중이면 구간 기록, 아니면 아무 일도 하지 않음"""
+    session = _session.get()
+    if session is None:
+        yield None
+        return
+    with session.section(name) as stats:
+        yield stats
+
+
+def run_profiled(name, fn, out_dir='profile', sort='cumulative', interval=SAMPLE_INTERVAL):
+    """fn()을 프로파일링하며 실행하고 보고서를 out_dir에 저장"""
+    session = ProfileSession(name, interval)
+    token = _session.set(session)
+    session.start()
+    try:
+        return fn()
+    finally:
+        session.stop()
+        _session.reset(token)
+        paths = session.write(out_dir, sort)
+        print("\n" + "\n".join(session.summary_lines()), file=sys.stderr)
+        print("보고서: " + ", ".join(paths), file=sys.stderr)
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", nargs="?", const="profile", metavar="DIR",
+                        help="프로파일링 후 DIR(기본: profile)에 보고서·.prof·.folded 저장")
+    parser.add_argument("--profile-sort", choices=SORT_KEYS, default='cumulative', help="보고서 정렬 기준")
+
+
+def run_cli(name, fn, args):
+    """--profile이 주어졌으면 프로파일링하며, 아니면 그대로 fn() 실행"""
+    if not getattr(args, 'profile', None):
+        return fn()
+    return run_profiled(name, fn, args.profile, args.profile_sort)
+
+
+if __name__ == "__main__":
+    # python profiling.py profile/send_report.prof --sort tottime
+    parser = argparse.ArgumentParser(description="저장된 .prof 파일을 정렬해 출력합니다.")
+    parser.add_argument("path", help=".prof 파일")
+    parser.add_argument("--sort", choices=SORT_KEYS, default='cumulative', help="정렬 기준")
+    parser.add_argument("--top", type=int, default=REPORT_TOP, help="출력할 함수 수")
+    args = parser.parse_args()
+    pstats.Stats(args.path).sort_stats(args.sort).print_stats(args.top)
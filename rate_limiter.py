@@ -0,0 +1,168 @@
+"""
+호스트별 토큰 버킷 속도 제한
+
+참고:
+- 버킷 상태는 호스트마다 로컬 파일에 저장하고 파일 잠금으로 보호하므로,
+  대시보드·리포트·수집기 등 여러 프로세스가 같은 한도를 나눠 씀
+- 우선순위: 대화형(INTERACTIVE) 요청이 대기 중이면 백필(BACKFILL) 요청은 양보하고,
+  백필은 버킷에 예비분(burst의 절반)이 남아 있을 때만 토큰을 가져감
+  (버킷이 가득 차도 예비분을 남길 수 없는 burst=1이면 가득 찼을 때만)
+- 상주 수집기·알림 평가처럼 사람이 기다리지 않는 조회는 BACKFILL로 요청
+- 한도 설정: DONDON_RATE_LIMITS="bank.shinhan.com=1/3,api.bithumb.com=5/10" (초당 요청 수/버스트)
+"""
+import contextlib
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+INTERACTIVE = 0
+BACKFILL = 1
+
+DEFAULT_LIMIT = (2.0, 4)  # 초당 요청 수, 버스트
+HOST_LIMITS = {
+    'bank.shinhan.com': (1.0, 3),
+    'obank.kbstar.com': (1.0, 3),
+    'www.kebhana.com': (1.0, 3),
+    'spot.wooribank.com': (1.0, 3),
+    'banking.nonghyup.com': (1.0, 3),
+    'www.ibk.co.kr': (1.0, 3),
+    'kr.investing.com': (0.5, 2),
+    'api.bithumb.com': (5.0, 10),
+    'api.upbit.com': (5.0, 10),
+    'api.binance.com': (10.0, 20),
+    'kapi.kakao.com': (5.0, 10),     # 카카오톡 나에게 보내기 (outbox)
+    'api.telegram.org': (20.0, 30),  # 텔레그램 봇 (outbox, 봇 전체 한도 초당 30건)
+}
+
+RATE_LIMIT_DIR = os.getenv("DONDON_RATE_DIR", os.path.join(tempfile.gettempdir(), "dondon-ratelimit"))
+
+request_priority = contextvars.ContextVar('request_priority', default=INTERACTIVE)
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _parse_limits(value):
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        host, _, spec = item.partition('=')
+        rate, _, burst = spec.partition('/')
+        try:
+            limit = (float(rate), int(burst or 1))
+        except ValueError:
+            limit = None
+        if limit is None or limit[0] <= 0 or limit[1] < 1:
+            print(f"[속도 제한 설정 무시] {item} (초당 요청 수 > 0, 버스트 >= 1)")
+            continue
+        limits[host.strip()] = limit
+    return limits
+
+
+HOST_LIMITS.update(_parse_limits(os.getenv("DONDON_RATE_LIMITS", "")))
+
+
+def get_limit(host):
+    return HOST_LIMITS.get(host, DEFAULT_LIMIT)
+
+
+@contextlib.contextmanager
+def priority(level):
+    """with priority(BACKFILL): 블록 안의 요청 우선순위 지정"""
+    token = request_priority.set(level)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+@contextlib.contextmanager
+def _host_lock(host):
+    """같은 호스트 버킷에 대한 프로세스 내·프로세스 간 상호 배제"""
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(host, threading.Lock())
+
+    os.makedirs(RATE_LIMIT_DIR, exist_ok=True)
+    path = os.path.join(RATE_LIMIT_DIR, f"{host}.lock")
+    with thread_lock:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT)
+        try:
+            if os.name == 'nt':
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield os.path.join(RATE_LIMIT_DIR, f"{host}.json")
+            finally:
+                if os.name == 'nt':
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+def _read_state(path, burst, now):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'tokens': float(burst), 'updated': now, 'interactive_until': 0.0}
+
+
+def _write_state(path, state):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+
+def _try_acquire(host, level):
+    """토큰을 가져오면 0, 아니면 다시 시도하기까지 기다릴 초"""
+    rate, burst = get_limit(host)
+    with _host_lock(host) as state_path:
+        now = time.time()
+        state = _read_state(state_path, burst, now)
+        tokens = min(float(burst), state['tokens'] + (now - state['updated']) * rate)
+        state['updated'] = now
+
+        if level == INTERACTIVE:
+            need = 1.0
+        else:
+            # 백필은 대화형 요청이 기다리는 동안 양보하고, 예비분은 남겨 둠
+            if now < state.get('interactive_until', 0.0):
+                state['tokens'] = tokens
+                _write_state(state_path, state)
+                return state['interactive_until'] - now
+            # 버킷은 burst까지만 차므로 그 이상을 요구하면 영원히 기다리게 됨
+            need = min(float(burst), 1.0 + burst / 2)
+
+        if tokens >= need:
+            state['tokens'] = tokens - 1.0
+            _write_state(state_path, state)
+            return 0.0
+
+        wait = (need - tokens) / rate
+        if level == INTERACTIVE:
+            state['interactive_until'] = max(state.get('interactive_until', 0.0), now + wait)
+        state['tokens'] = tokens
+        _write_state(state_path, state)
+        return wait
+
+
+def acquire(host, level=None):
+    """host에 요청을 보내도 될 때까지 대기"""
+    if not host:
+        return
+    level = request_priority.get() if level is None else level
+    while True:
+        wait = _try_acquire(host, level)
+        if wait <= 0:
+            return
+        time.sleep(wait)
@@ -0,0 +1,258 @@
+"""김치 프리미엄·은행 스프레드 임계값 알림 엔진"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+ALERT_STATE_PATH = os.getenv("DONDON_ALERT_STATE", "alert_state.json")
+MIN_ZSCORE_SAMPLES = 10
+
+
+@dataclass
+class AlertRules:
+    """알림 규칙 (None이면 해당 규칙 비활성)"""
+    premium_above: Optional[float] = None       # 김치프리미엄 상한 (%)
+    premium_below: Optional[float] = None       # 김치프리미엄 하한 (%)
+    spread_zscore_above: Optional[float] = None  # 은행 스프레드 z-score 절댓값
+    spread_window: int = 60                      # z-score 계산용 표본 수
+    rate_change_above: Optional[float] = None   # 고시회차 간 환율 변화 (원)
+    cooldown_seconds: int = 1800                 # 같은 알림 재전송 최소 간격
+
+
+@dataclass
+class Alert:
+    key: str
+    message: str
+
+
+class RollingStats:
+    """고정 길이 윈도우의 평균/표준편차를 O(1)로 유지"""
+
+    def __init__(self, size: int):
+        self.values: Deque[float] = deque(maxlen=size)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+
+    def zscore(self, value: float) -> Optional[float]:
+        n = len(self.values)
+        if n < MIN_ZSCORE_SAMPLES:
+            return None
+        mean = self.total / n
+        variance = max(self.total_sq / n - mean * mean, 0.0)
+        std = math.sqrt(variance)
+        if std == 0:
+            return None
+        return (value - mean) / std
+
+
+class AlertEngine:
+    """
+    스냅샷마다 규칙을 평가해 새로 발생한 알림만 돌려줌
+    - 조건이 유지되는 동안에는 한 번만 알림 (해제 후 다시 발생하면 재알림)
+    - 같은 키는 cooldown_seconds 안에 다시 보내지 않음
+    """
+
+    def __init__(self, rules: AlertRules):
+        self.rules = rules
+        self.active: set = set()
+        self.last_sent: Dict[str, float] = {}
+        self.spreads: Dict[str, RollingStats] = {}
+        self.last_rounds: Dict[str, Tuple[str, Optional[float], Optional[float]]] = {}
+
+    def evaluate(self, bank_data: list, investing_data: Optional[dict],
+                 bithumb_data: Optional[dict], now: Optional[float] = None) -> List[Alert]:
+        now = time.time() if now is None else now
+        triggered: List[Alert] = []
+        usd_base = investing_data['USD_KRW'] if investing_data else None
+
+        if usd_base and bithumb_data:
+            premium = ((bithumb_data['price'] - usd_base) / usd_base) * 100
+            if self.rules.premium_above is not None and premium > self.rules.premium_above:
+                triggered.append(Alert('premium_above', f"김치프리미엄 {premium:+.2f}% (기준 {self.rules.premium_above:+.2f}% 초과)"))
+            if self.rules.premium_below is not None and premium < self.rules.premium_below:
+                triggered.append(Alert('premium_below', f"김치프리미엄 {premium:+.2f}% (기준 {self.rules.premium_below:+.2f}% 미만)"))
+
+        for item in bank_data:
+            bank = item['은행']
+            usd = item.get('USD_raw')
+
+            if usd_base and usd and self.rules.spread_zscore_above is not None:
+                spread = usd_base - usd
+                stats = self.spreads.setdefault(bank, RollingStats(self.rules.spread_window))
+                z = stats.zscore(spread)
+                stats.push(spread)
+                if z is not None and abs(z) > self.rules.spread_zscore_above:
+                    triggered.append(Alert(f"spread:{bank}", f"{bank} USD 스프레드 {spread:+.2f}원 (z={z:+.1f})"))
+
+            if self.rules.rate_change_above is not None:
+                current = (str(item.get('고시회차')), usd, item.get('JPY_raw'))
+                previous = self.last_rounds.get(bank)
+                self.last_rounds[bank] = current
+                if previous and previous[0] != current[0]:
+                    for label, old, new in (('USD', previous[1], current[1]), ('JPY(100엔)', previous[2], current[2])):
+                        if old and new and abs(new - old) >= self.rules.rate_change_above:
+                            triggered.append(Alert(
+                                f"round:{bank}:{label}:{current[0]}",
+                                f"{bank} {label} {old:,.2f} → {new:,.2f} ({new - old:+.2f}, {current[0]})",
+                            ))
+
+        return self._filter(triggered, now)
+
+    def _filter(self, triggered: List[Alert], now: float) -> List[Alert]:
+        """중복·쿨다운 제거"""
+        current_keys = {alert.key for alert in triggered}
+        fresh = []
+        active = set()
+        for alert in triggered:
+            if alert.key in self.active:
+                active.add(alert.key)
+                continue
+            last = self.last_sent.get(alert.key)
+            if last is not None and now - last < self.rules.cooldown_seconds:
+                # 쿨다운으로 보내지 않은 알림은 활성으로 치지 않음 (쿨다운이 끝난 뒤 조건이 유지되면 전송)
+                continue
+            fresh.append(alert)
+            active.add(alert.key)
+            self.last_sent[alert.key] = now
+        self.active = active
+        # 쿨다운이 지난 기록은 정리 (회차별 키가 계속 쌓이지 않도록)
+        self.last_sent = {
+            key: sent_at for key, sent_at in self.last_sent.items()
+            if now - sent_at < self.rules.cooldown_seconds or key in current_keys
+        }
+        return fresh
+
+    def to_state(self) -> dict:
+        return {
+            'active': sorted(self.active),
+            'last_sent': self.last_sent,
+            'spreads': {bank: list(stats.values) for bank, stats in self.spreads.items()},
+            'last_rounds': self.last_rounds,
+        }
+
+    def load_state(self, state: dict):
+        self.active = set(state.get('active', []))
+        self.last_sent = dict(state.get('last_sent', {}))
+        for bank, values in state.get('spreads', {}).items():
+            stats = RollingStats(self.rules.spread_window)
+            for value in values:
+                stats.push(value)
+            self.spreads[bank] = stats
+        self.last_rounds = {bank: tuple(value) for bank, value in state.get('last_rounds', {}).items()}
+
+
+def format_alert_message(alerts: List[Alert]) -> str:
+    """동시에 발생한 알림을 하나의 메시지로 묶음"""
+    lines = [f"[환율 알림] {time.strftime('%Y-%m-%d %H:%M')}", ""]
+    lines.extend(f"- {alert.message}" for alert in alerts)
+    return "\n".join(lines)
+
+
+def load_engine(rules: AlertRules, path: str = ALERT_STATE_PATH) -> AlertEngine:
+    engine = AlertEngine(rules)
+    if os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                engine.load_state(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"[알림 상태 로드 실패] {e}")
+    return engine
+
+
+def save_engine(engine: AlertEngine, path: str = ALERT_STATE_PATH):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(engine.to_state(), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def dispatch_alerts(alerts: List[Alert], *, kakao: bool, telegram: bool, dry_run: bool = False):
+    """카카오톡/텔레그램 전송 (outbox를 거치므로 실패해도 워커가 재시도)"""
+    if not alerts:
+        return
+    message = format_alert_message(alerts)
+    channels = [channel for channel, enabled in (('kakao', kakao), ('telegram', telegram)) if enabled]
+
+    if dry_run:
+        from reporting.send_report import send_kakao_message, send_telegram_message
+
+        if kakao:
+            send_kakao_message(message, dry_run=True)
+        if telegram:
+            send_telegram_message(message, dry_run=True)
+        return
+
+    from reporting.outbox import enqueue_and_deliver
+
+    enqueue_and_deliver(channels, {'message': message}, scope='alert')
+
+
+def add_rule_arguments(parser: argparse.ArgumentParser):
+    """알림 규칙 인자 (alerts·collector CLI 공용)"""
+    parser.add_argument("--premium-above", type=float, help="김치프리미엄(%%)이 이 값을 넘으면 알림")
+    parser.add_argument("--premium-below", type=float, help="김치프리미엄(%%)이 이 값 미만이면 알림")
+    parser.add_argument("--zscore-above", type=float, help="은행 USD 스프레드 z-score 절댓값 기준")
+    parser.add_argument("--window", type=int, default=60, help="z-score 계산 표본 수")
+    parser.add_argument("--rate-change-above", type=float, help="고시회차 간 환율 변화 기준(원)")
+    parser.add_argument("--cooldown", type=int, default=1800, help="같은 알림 재전송 최소 간격(초)")
+    parser.add_argument("--state", default=ALERT_STATE_PATH, help="알림 상태 파일 경로")
+
+
+def rules_from_args(args: argparse.Namespace) -> AlertRules:
+    return AlertRules(
+        premium_above=args.premium_above,
+        premium_below=args.premium_below,
+        spread_zscore_above=args.zscore_above,
+        spread_window=args.window,
+        rate_change_above=args.rate_change_above,
+        cooldown_seconds=args.cooldown,
+    )
+
+
+def has_thresholds(rules: AlertRules) -> bool:
+    return any(value is not None for value in (
+        rules.premium_above, rules.premium_below, rules.spread_zscore_above, rules.rate_change_above,
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="환율 임계값 알림을 평가하고 전송합니다.")
+    add_rule_arguments(parser)
+    parser.add_argument("--dry-run", action="store_true", help="메시지를 전송하지 않고 출력만 합니다.")
+    parser.add_argument("--kakao", action="store_true", help="카카오톡으로 전송합니다.")
+    parser.add_argument("--telegram", action="store_true", help="텔레그램으로 전송합니다.")
+    parser.add_argument("--all", action="store_true", help="카카오톡과 텔레그램 모두로 전송합니다.")
+    args = parser.parse_args()
+
+    import rate_limiter
+    from reporting.exchange_fetcher import load_exchange_rates
+
+    engine = load_engine(rules_from_args(args), args.state)
+    # 주기 실행용이므로 대시보드 요청에 양보
+    with rate_limiter.priority(rate_limiter.BACKFILL):
+        bank_data, investing_data, bithumb_data, _ = load_exchange_rates()
+    alerts = engine.evaluate(bank_data, investing_data, bithumb_data)
+    save_engine(engine, args.state)
+
+    if not args.kakao and not args.telegram and not args.all:
+        args.kakao = True
+    dispatch_alerts(alerts, kakao=args.all or args.kakao, telegram=args.all or args.telegram, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
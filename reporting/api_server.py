@@ -0,0 +1,295 @@
+"""환율 스냅샷 JSON API 서버
+
+다른 도구가 대시보드를 긁거나 직접 크롤링하지 않도록, 이력 저장소에 기록된
+최신 스냅샷과 이력을 JSON으로 제공한다. 이 서버는 크롤링을 하지 않는다.
+
+- GET /api/snapshot                 최신 스냅샷 전체
+- GET /api/sources                  소스 이름 목록
+- GET /api/sources/<이름>            소스 하나의 값 (은행 이름, investing, bithumb_usdt, bithumb_btc)
+- GET /api/history?source=&metric=&start=&end=&max_points=
+                                    OHLC 이력 (start/end: epoch 초, 기본 최근 1일)
+- GET /api/export?format=csv|jsonl&source=&currency=&start=&end=&derived=1
+                                    원본 이력을 chunk 단위로 스트리밍 (Transfer-Encoding: chunked)
+
+응답 본문은 스냅샷 버전마다 한 번만 직렬화해 재사용하고, ETag/Cache-Control을 붙인다.
+DB 연결은 요청 스레드마다 새로 열지 않고 작은 풀(StorePool)에서 빌려 쓴다.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from reporting.export import TEXT_ENCODERS, open_chunks
+from reporting.history import HISTORY_DB_PATH, HistoryStore
+
+SNAPSHOT_MAX_AGE = 10
+HISTORY_MAX_AGE = 60
+VERSION_CHECK_INTERVAL = 1.0  # 초, 새 스냅샷 확인 주기
+HISTORY_CACHE_SIZE = 256
+POOL_SIZE = 4  # 놀고 있을 때 열어 둘 DB 연결 수
+
+Response = Tuple[bytes, str]  # (본문, ETag)
+
+
+def _encode(payload) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+    return body, etag
+
+
+def split_sources(payload: dict) -> Dict[str, dict]:
+    """스냅샷을 소스 이름 → 값으로 분리"""
+    sources = {item['은행']: item for item in payload.get('banks') or []}
+    for key in ('investing', 'bithumb_usdt', 'bithumb_btc'):
+        if payload.get(key):
+            sources[key] = payload[key]
+    return sources
+
+
+class StorePool:
+    """HistoryStore 연결 풀 (동시 요청이 많으면 더 열고, 반납 시 size개까지만 남김)"""
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle: List[HistoryStore] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[HistoryStore]:
+        with self._lock:
+            store = self._idle.pop() if self._idle else None
+        if store is None:
+            store = HistoryStore(self.db_path)
+        try:
+            yield store
+        finally:
+            with self._lock:
+                if not self._closed and len(self._idle) < self.size:
+                    self._idle.append(store)
+                    store = None
+            if store is not None:
+                store.close()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for store in idle:
+            store.close()
+
+
+class SnapshotCache:
+    """스냅샷 버전별로 미리 직렬화한 응답 보관 (버전이 바뀔 때만 다시 만듦)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.pool = StorePool(db_path)
+        self._lock = threading.Lock()
+        self._history_lock = threading.Lock()
+        self.version: Optional[int] = None
+        self.checked_at = 0.0
+        self.responses: Dict[str, Response] = {}
+        self.history: Dict[tuple, Response] = {}
+
+    def close(self):
+        self.pool.close()
+
+    def refresh(self):
+        now = time.monotonic()
+        if now - self.checked_at < VERSION_CHECK_INTERVAL:
+            return
+        with self._lock:
+            if now - self.checked_at < VERSION_CHECK_INTERVAL:
+                return
+            self.checked_at = now
+            with self.pool.connection() as store:
+                if store.latest_snapshot_id() == self.version:
+                    return
+                latest = store.latest_snapshot()
+            if latest is None:
+                return
+            version, payload = latest
+            sources = split_sources(payload)
+            responses = {'/api/snapshot': _encode(payload), '/api/sources': _encode(sorted(sources))}
+            for name, value in sources.items():
+                responses[f'/api/sources/{name}'] = _encode({'source': name, 'ts': payload['ts'], 'value': value})
+            # 참조 교체로 원자적으로 반영
+            self.responses = responses
+            with self._history_lock:
+                self.history = {}
+            self.version = version
+
+    def get(self, path: str) -> Optional[Response]:
+        self.refresh()
+        return self.responses.get(path)
+
+    def get_history(self, source: str, metric: str, start: int, end: int, max_points: int) -> Response:
+        self.refresh()
+        # 같은 분 안의 요청은 같은 응답을 공유하도록 end를 분 단위로 맞춤
+        # (버전을 키에 넣어, 조회 도중 스냅샷이 바뀌면 이전 버전 응답이 새 캐시에 들어가지 않게 함)
+        key = (self.version, source, metric, start - start % 60, end - end % 60, max_points)
+        with self._history_lock:
+            cached = self.history.get(key)
+        if cached is not None:
+            return cached
+        with self.pool.connection() as store:
+            resolution, rows = store.query(source, metric, key[3], key[4], max_points)
+        response = _encode({
+            'source': source,
+            'metric': metric,
+            'resolution': resolution,
+            'columns': ['bucket', 'open', 'high', 'low', 'close'],
+            'rows': rows,
+        })
+        with self._history_lock:
+            if len(self.history) >= HISTORY_CACHE_SIZE:
+                self.history = {}
+            self.history[key] = response
+        return response
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    cache: SnapshotCache = None  # serve()에서 설정
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = unquote(parts.path).rstrip('/')
+
+        if path == '/api/export':
+            self._export(parse_qs(parts.query))
+            return
+
+        if path == '/api/history':
+            response = self._history(parse_qs(parts.query))
+            max_age = HISTORY_MAX_AGE
+        else:
+            response = self.cache.get(path)
+            max_age = SNAPSHOT_MAX_AGE
+
+        if response is None:
+            self._send(404, b'{"error":"not found"}')
+            return
+
+        body, etag = response
+        headers = {'ETag': etag, 'Cache-Control': f'public, max-age={max_age}'}
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, b'', headers)
+            return
+        self._send(200, body, headers)
+
+    def _history(self, query: dict) -> Optional[Response]:
+        source = query.get('source', [None])[0]
+        metric = query.get('metric', [None])[0]
+        if not source or not metric:
+            return None
+        try:
+            end = int(query.get('end', [time.time()])[0])
+            start = int(query.get('start', [end - 86400])[0])
+            max_points = min(int(query.get('max_points', [500])[0]), 5000)
+        except ValueError:
+            return None
+        return self.cache.get_history(source, metric, start, end, max_points)
+
+    def _export(self, query: dict):
+        # 응답 헤더를 보내기 전에 인자와 첫 chunk까지 확인해, 실패하면 400/500으로 응답
+        fmt = query.get('format', ['csv'])[0]
+        if fmt not in TEXT_ENCODERS:
+            self._send(400, b'{"error":"format must be csv or jsonl"}')
+            return
+        try:
+            start = int(query['start'][0]) if 'start' in query else None
+            end = int(query['end'][0]) if 'end' in query else None
+        except ValueError:
+            self._send(400, b'{"error":"start/end must be epoch seconds"}')
+            return
+        if start is not None and end is not None and start > end:
+            self._send(400, b'{"error":"start must not be after end"}')
+            return
+        derived = query.get('derived', ['0'])[0]
+        if derived not in ('0', '1'):
+            self._send(400, b'{"error":"derived must be 0 or 1"}')
+            return
+
+        with self.cache.pool.connection() as store:
+            try:
+                chunks = open_chunks(
+                    store, sources=query.get('source'), metrics=query.get('currency'),
+                    start=start, end=end, derived=derived == '1',
+                )
+                first = next(chunks, None)
+            except Exception as e:
+                print(f"[내보내기 실패] {e}")
+                self._send(500, b'{"error":"export failed"}')
+                return
+            if first is not None:
+                chunks = itertools.chain([first], chunks)
+
+            self.send_response(200)
+            content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+            self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for piece in TEXT_ENCODERS[fmt](chunks if first is not None else ()):
+                    data = piece.encode('utf-8')
+                    if data:
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            except Exception as e:
+                # 이미 200을 보냈으므로 마지막 chunk 없이 연결을 끊어 클라이언트가 잘린 응답임을 알게 함
+                print(f"[내보내기 중단] {e}")
+                self.close_connection = True
+                return
+            self.wfile.write(b'0\r\n\r\n')
+
+    def _send(self, status: int, body: bytes, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = '127.0.0.1', port: int = 8502, db_path: str = HISTORY_DB_PATH) -> ThreadingHTTPServer:
+    handler = type('BoundApiHandler', (ApiHandler,), {'cache': SnapshotCache(db_path)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="최신 환율 스냅샷을 JSON API로 제공합니다.")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩 주소")
+    parser.add_argument("--port", type=int, default=8502, help="포트")
+    parser.add_argument("--db", default=HISTORY_DB_PATH, help="이력 저장소 경로")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.db)
+    print(f"API 서버 시작: http://{args.host}:{args.port}/api/snapshot")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.cache.close()
+
+
+if __name__ == "__main__":
+    main()
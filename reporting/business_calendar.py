@@ -0,0 +1,113 @@
+"""한국 은행 영업일 달력
+
+연도별 휴일 표를 로컬 JSON 파일(reporting/data/kr_holidays.json)에서 한 번만 읽어
+집합으로 보관하므로 영업일 판정은 O(1)이다. 표를 갱신할 때는 네트워크 없이
+파일만 수정하거나, DONDON_HOLIDAYS_FILE로 추가 파일을 지정하면 된다.
+표에 없는 연도는 주말만 휴일로 보고, 연도마다 한 번 경고를 출력한다.
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, Optional, Union
+
+HOLIDAYS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'kr_holidays.json')
+EXTRA_HOLIDAYS_ENV = 'DONDON_HOLIDAYS_FILE'
+
+DateLike = Union[date, datetime]
+
+_warned_years = set()
+
+
+def _read_holiday_file(path: str) -> Dict[int, Dict[str, str]]:
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+    return {int(year): days for year, days in raw.items()}
+
+
+@lru_cache(maxsize=1)
+def load_holiday_table() -> Dict[int, FrozenSet[date]]:
+    """연도 → 휴일 집합 (기본 파일 + DONDON_HOLIDAYS_FILE 병합)"""
+    merged: Dict[int, set] = {}
+    paths = [HOLIDAYS_PATH]
+    extra = os.getenv(EXTRA_HOLIDAYS_ENV)
+    if extra:
+        paths.append(extra)
+
+    for path in paths:
+        try:
+            table = _read_holiday_file(path)
+        except (OSError, ValueError) as e:
+            print(f"[휴일 표 로드 실패] {path}: {e}")
+            continue
+        for year, days in table.items():
+            merged.setdefault(year, set()).update(date.fromisoformat(day) for day in days)
+
+    return {year: frozenset(days) for year, days in merged.items()}
+
+
+def reload_holiday_table():
+    """휴일 파일 수정 후 다시 읽기"""
+    load_holiday_table.cache_clear()
+    _warned_years.clear()
+
+
+def _as_date(value: DateLike) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def is_holiday(value: DateLike) -> bool:
+    day = _as_date(value)
+    table = load_holiday_table()
+    if day.year not in table and day.year not in _warned_years:
+        _warned_years.add(day.year)
+        print(f"[휴일 표 없음] {day.year}년 휴일이 {HOLIDAYS_PATH}에 없어 주말만 휴일로 봅니다. 표를 갱신하세요.")
+    return day in table.get(day.year, ())
+
+
+def is_business_day(value: DateLike) -> bool:
+    """주말·공휴일이 아닌 은행 영업일 여부"""
+    day = _as_date(value)
+    return day.weekday() < 5 and not is_holiday(day)
+
+
+def previous_business_day(value: DateLike, inclusive: bool = True) -> date:
+    """value 이전(포함)의 가장 가까운 영업일"""
+    day = _as_date(value)
+    if not inclusive:
+        day -= timedelta(days=1)
+    while not is_business_day(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def next_business_day(value: DateLike, inclusive: bool = False) -> date:
+    """value 이후의 가장 가까운 영업일"""
+    day = _as_date(value)
+    if not inclusive:
+        day += timedelta(days=1)
+    while not is_business_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def iter_business_days(start: DateLike, max_days: int) -> Iterator[datetime]:
+    """start부터 과거 방향으로 영업일만 max_days개 순회 (datetime 입력이면 시각 유지)"""
+    candidate = start if isinstance(start, datetime) else datetime.combine(start, datetime.min.time())
+    yielded = 0
+    while yielded < max_days:
+        if is_business_day(candidate):
+            yield candidate
+            yielded += 1
+        candidate = candidate - timedelta(days=1)
+
+
+def seconds_until_business_day(now: Optional[datetime] = None) -> float:
+    """휴일이면 다음 영업일 0시까지 남은 초, 영업일이면 0"""
+    now = now or datetime.now()
+    if is_business_day(now):
+        return 0.0
+    next_day = datetime.combine(next_business_day(now), datetime.min.time())
+    return (next_day - now).total_seconds()
@@ -0,0 +1,296 @@
+"""상주 수집기
+
+레지스트리의 각 소스를 poll_interval마다 조회해 이력·스냅샷을 기록하고 알림 규칙을 평가한다.
+수 주 동안 떠 있어도 메모리가 늘지 않도록 메모리에 두는 구조는 모두 크기를 제한한다.
+
+- 소스별 최근 샘플: 링 버퍼 (deque(maxlen))
+- 이미 기록한 은행 고시회차: 크기 제한 LRU
+- 소스별 최신 결과: 소스 수만큼만 보관
+- HTML 파싱 트리는 파싱 직후 decompose (mybank)
+
+tracemalloc을 켜 두면 SIGUSR1(또는 종료 시)에 시작 시점 대비 할당 증가 상위 항목을 출력한다.
+fixture로 수천 번 폴링해 RSS가 평탄한지 보는 soak 점검은 reporting.soak에 있다.
+"""
+from __future__ import annotations
+
+import argparse
+import contextvars
+import gc
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+import rate_limiter
+from reporting.alerts import (
+    ALERT_STATE_PATH,
+    Alert,
+    AlertRules,
+    add_rule_arguments,
+    dispatch_alerts,
+    format_alert_message,
+    has_thresholds,
+    load_engine,
+    rules_from_args,
+    save_engine,
+)
+from reporting.business_calendar import is_business_day, seconds_until_business_day
+from reporting.exchange_fetcher import assemble_rates, fetch_source
+from reporting.history import HISTORY_DB_PATH, HistoryStore, snapshot_payload, snapshot_rows
+from reporting.outbox import enqueue_and_deliver
+from reporting.sources import KIND_BANK, Source, get_sources
+
+RING_SIZE = 720          # 소스별 최근 샘플 수 (10초 주기면 2시간)
+SEEN_ROUNDS_SIZE = 256   # 기록한 고시회차 기억 개수
+MAX_IDLE = 60            # 초, 한 번에 쉬는 최대 시간
+TRACE_FRAMES = 10
+TRACE_TOP = 15
+
+Summary = Tuple[float, Optional[float], Optional[float]]  # (시각, USD 또는 가격, JPY)
+
+
+class BoundedLRU:
+    """maxsize를 넘으면 가장 오래 쓰지 않은 항목부터 버리는 dict"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        if key in self._data:
+            self._data.move_to_end(key)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default=None):
+        if key not in self:
+            return default
+        return self._data[key]
+
+    def put(self, key: Hashable, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+def _summary(ts: float, result: Optional[dict]) -> Summary:
+    """링 버퍼에는 결과 전체 대신 숫자 몇 개만 보관"""
+    if not result:
+        return ts, None, None
+    if 'price' in result:
+        return ts, result['price'], None
+    return ts, result.get('USD') or result.get('USD_KRW'), result.get('JPY') or result.get('JPY_KRW')
+
+
+def current_rss_mb() -> Optional[float]:
+    """현재 RSS (Linux는 /proc, 그 외에는 최대 RSS로 대신)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class Collector:
+    def __init__(self, sources: Optional[List[Source]] = None, db_path: str = HISTORY_DB_PATH, *,
+                 ring_size: int = RING_SIZE, rules: Optional[AlertRules] = None, kakao: bool = False,
+                 telegram: bool = False, dry_run: bool = False, alert_state_path: str = ALERT_STATE_PATH):
+        self.sources = sources if sources is not None else get_sources()
+        self.recent: Dict[str, Deque[Summary]] = {s.key: deque(maxlen=ring_size) for s in self.sources}
+        self.latest: Dict[str, dict] = {}
+        self.seen_rounds = BoundedLRU(SEEN_ROUNDS_SIZE)
+        self.next_due: Dict[str, float] = {s.key: 0.0 for s in self.sources}
+        self.store = HistoryStore(db_path)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, len(self.sources)), thread_name_prefix='collector')
+        self.alert_state_path = alert_state_path
+        # rules가 있으면 수집할 때마다 알림 규칙 평가
+        self.engine = load_engine(rules, alert_state_path) if rules is not None else None
+        self.kakao = kakao
+        self.telegram = telegram
+        self.dry_run = dry_run
+        self.cycles = 0
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._report_requested = threading.Event()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.store.close()
+
+    def due_sources(self, now: float) -> List[Source]:
+        """지금 조회할 소스 (휴일에는 이미 값이 있는 은행을 건너뜀)"""
+        moment = datetime.fromtimestamp(now)
+        due = []
+        for source in self.sources:
+            if self.next_due[source.key] > now:
+                continue
+            if source.kind == KIND_BANK and source.key in self.latest and not is_business_day(moment):
+                self.next_due[source.key] = now + seconds_until_business_day(moment)
+                continue
+            due.append(source)
+        return due
+
+    def poll_once(self, now: Optional[float] = None) -> int:
+        """조회할 때가 된 소스를 병렬 조회·기록하고 조회한 소스 수를 돌려줌"""
+        now = time.time() if now is None else now
+        due = self.due_sources(now)
+        if not due:
+            return 0
+
+        # 사람이 기다리는 조회(대시보드·리포트)가 먼저 토큰을 가져가도록 백필 우선순위로 조회
+        with rate_limiter.priority(rate_limiter.BACKFILL):
+            futures = [
+                (source, self.executor.submit(contextvars.copy_context().run, fetch_source, source))
+                for source in due
+            ]
+        changed = set()
+        for source, future in futures:
+            result = future.result()
+            self.next_due[source.key] = now + source.poll_interval
+            self.recent[source.key].append(_summary(now, result))
+            if not result:
+                continue
+            if source.kind == KIND_BANK:
+                # 같은 고시회차는 한 번만 기록
+                round_key = (source.key, result.get('date'), result.get('round'))
+                if round_key in self.seen_rounds and source.key in self.latest:
+                    continue
+                self.seen_rounds.put(round_key, now)
+            self.latest[source.key] = result
+            changed.add(source.key)
+
+        if changed:
+            self.record(now, changed)
+        self.cycles += 1
+        return len(due)
+
+    def record(self, now: float, changed: Set[str]):
+        """
+        이번에 새 값을 받은 소스(changed)만 이력에 샘플로 남기고, 스냅샷은 전체 최신 값으로 저장
+        (빗썸 시세가 10초마다 바뀌어도 고시회차가 그대로인 은행 샘플은 다시 쓰지 않음)
+        """
+        bank_data, investing_data, bithumb_data, btc_data = assemble_rates(self.sources, self.latest)
+        payload = snapshot_payload(bank_data, investing_data, bithumb_data, btc_data, ts=int(now))
+        fresh = assemble_rates(self.sources, {key: self.latest[key] for key in changed})
+        self.store.record(snapshot_rows(*fresh), payload['ts'])
+        self.store.save_snapshot(payload)
+
+        if self.engine is not None:
+            alerts = self.engine.evaluate(bank_data, investing_data, bithumb_data, now)
+            save_engine(self.engine, self.alert_state_path)
+            self.send_alerts(alerts)
+
+    def send_alerts(self, alerts: List[Alert]):
+        """outbox에 넣고 바로 한 번 전송 (실패분은 outbox 워커가 재시도, 드라이런이면 출력만)"""
+        channels = [channel for channel, enabled in (('kakao', self.kakao), ('telegram', self.telegram)) if enabled]
+        if not alerts or not channels:
+            return
+        if self.dry_run:
+            dispatch_alerts(alerts, kakao=self.kakao, telegram=self.telegram, dry_run=True)
+            return
+        enqueue_and_deliver(channels, {'message': format_alert_message(alerts)}, scope='alert')
+
+    def idle_seconds(self, now: float) -> float:
+        """다음 조회까지 쉴 시간"""
+        if not self.next_due:
+            return MAX_IDLE
+        return min(max(0.0, min(self.next_due.values()) - now), MAX_IDLE)
+
+    def run(self, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"[수집 실패] {e}")
+            if self._report_requested.is_set():
+                self._report_requested.clear()
+                print(self.memory_report())
+            stop.wait(self.idle_seconds(time.time()))
+
+    # --- 메모리 진단 ---
+
+    def start_tracing(self, frames: int = TRACE_FRAMES):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._baseline = tracemalloc.take_snapshot()
+
+    def request_report(self, *_):
+        """시그널 핸들러에서 호출 (실제 출력은 수집 루프에서)"""
+        self._report_requested.set()
+
+    def memory_report(self, limit: int = TRACE_TOP) -> str:
+        """시작 시점 대비 할당이 늘어난 위치 상위 limit개"""
+        rss = current_rss_mb()
+        lines = [f"[메모리] 폴링 {self.cycles}회, RSS {rss:.1f}MB" if rss else f"[메모리] 폴링 {self.cycles}회"]
+        lines.append(
+            f"링 버퍼 {sum(len(ring) for ring in self.recent.values())}개, "
+            f"고시회차 {len(self.seen_rounds)}개, 최신 결과 {len(self.latest)}개"
+        )
+        if self._baseline is None:
+            lines.append("tracemalloc 꺼짐 (--tracemalloc으로 시작)")
+            return "\n".join(lines)
+
+        gc.collect()
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<frozen *>')]
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        for stat in snapshot.compare_to(self._baseline.filter_traces(ignore), 'lineno')[:limit]:
+            lines.append(str(stat))
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시세를 상주 수집해 이력에 기록합니다.")
+    parser.add_argument("--db", default=HISTORY_DB_PATH, help="이력 저장소 경로")
+    parser.add_argument("--alerts", action="store_true", help="수집할 때마다 알림 규칙 평가 (아래 기준 인자 사용)")
+    parser.add_argument("--kakao", action="store_true", help="알림을 카카오톡으로 전송")
+    parser.add_argument("--telegram", action="store_true", help="알림을 텔레그램으로 전송")
+    parser.add_argument("--dry-run", action="store_true", help="알림 메시지를 전송하지 않고 출력만")
+    parser.add_argument("--tracemalloc", action="store_true", help="할당 추적 (SIGUSR1 또는 종료 시 증가 상위 출력)")
+    add_rule_arguments(parser)
+    args = parser.parse_args()
+
+    rules = None
+    if args.alerts or args.kakao or args.telegram:
+        rules = rules_from_args(args)
+        if not has_thresholds(rules):
+            print("알림 기준이 없어 알림을 평가하지 않습니다. --premium-above 등 기준 인자를 지정하세요.")
+            rules = None
+
+    collector = Collector(
+        db_path=args.db, rules=rules, kakao=args.kakao, telegram=args.telegram,
+        dry_run=args.dry_run, alert_state_path=args.state,
+    )
+    if args.tracemalloc:
+        collector.start_tracing()
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, collector.request_report)
+
+    stop = threading.Event()
+    print(f"수집 시작: 소스 {len(collector.sources)}개 → {args.db}")
+    try:
+        collector.run(stop)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.tracemalloc:
+            print(collector.memory_report())
+        collector.close()
+
+
+if __name__ == "__main__":
+    main()
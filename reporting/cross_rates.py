@@ -0,0 +1,125 @@
+"""Investing.com 환율표 기반 교차환율 행렬
+
+get_investing_exchange_rate가 돌려주는 통화쌍 전체('pairs')를 통화×통화 행렬로 만들고,
+USD를 거친 삼각 환율·호가와의 차이·은행 고시환율 비교를 배열 연산으로 계산한다.
+추가 요청 없이 환율표에 있는 모든 통화의 기준 환율을 얻을 수 있다.
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+PIVOT = 'USD'
+# 은행 고시 단위 (그 외 통화는 1단위)
+QUOTE_UNITS = {'JPY': 100, 'IDR': 100, 'VND': 100}
+
+
+@dataclass(frozen=True)
+class CrossRateMatrix:
+    currencies: Tuple[str, ...]
+    quoted: np.ndarray   # quoted[i, j] = 1 currencies[i]당 currencies[j] (없으면 NaN)
+
+    @property
+    def index(self) -> Dict[str, int]:
+        return {code: i for i, code in enumerate(self.currencies)}
+
+    def triangulated(self, pivot: str = PIVOT) -> np.ndarray:
+        """pivot 통화를 거친 교차환율 implied[i, j] = quoted[i, p] × quoted[p, j] (표에 pivot이 없으면 모두 NaN)"""
+        p = self.index.get(pivot)
+        if p is None:
+            return np.full_like(self.quoted, np.nan)
+        to_pivot = self.quoted[:, p].copy()
+        from_pivot = self.quoted[p, :].copy()
+        # 한 방향만 호가된 경우 역수로 보충
+        to_pivot = np.where(np.isnan(to_pivot), 1.0 / from_pivot, to_pivot)
+        from_pivot = np.where(np.isnan(from_pivot), 1.0 / to_pivot, from_pivot)
+        to_pivot[p] = from_pivot[p] = 1.0
+        return np.outer(to_pivot, from_pivot)
+
+    def filled(self, pivot: str = PIVOT) -> np.ndarray:
+        """호가가 있으면 호가, 없으면 삼각 환율"""
+        return np.where(np.isnan(self.quoted), self.triangulated(pivot), self.quoted)
+
+    def deviation(self, pivot: str = PIVOT) -> np.ndarray:
+        """호가 대비 삼각 환율 차이 (비율, 호가가 없으면 NaN)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.triangulated(pivot) / self.quoted - 1.0
+
+    def inconsistent_pairs(self, tolerance: float = 0.001, pivot: str = PIVOT) -> List[Tuple[str, str, float]]:
+        """삼각 환율과 tolerance 이상 어긋나는 호가 목록"""
+        deviation = self.deviation(pivot)
+        rows, cols = np.nonzero(np.abs(np.nan_to_num(deviation)) > tolerance)
+        return [(self.currencies[i], self.currencies[j], float(deviation[i, j])) for i, j in zip(rows, cols)]
+
+    def krw_rates(self, pivot: str = PIVOT) -> Dict[str, float]:
+        """통화별 원화 환율 (은행 고시 단위 기준, 예: JPY는 100엔당)"""
+        if 'KRW' not in self.index:
+            return {}
+        krw = self.filled(pivot)[:, self.index['KRW']]
+        return {
+            code: float(krw[i] * QUOTE_UNITS.get(code, 1))
+            for i, code in enumerate(self.currencies)
+            if code != 'KRW' and not np.isnan(krw[i])
+        }
+
+
+def build_matrix(pairs: Dict[str, float]) -> CrossRateMatrix:
+    """{'USD/KRW': 1450.5, ...} → CrossRateMatrix (대각선은 1)"""
+    codes = sorted({code for pair in pairs for code in pair.split('/')})
+    index = {code: i for i, code in enumerate(codes)}
+    quoted = np.full((len(codes), len(codes)), np.nan)
+    np.fill_diagonal(quoted, 1.0)
+    if pairs:
+        rows, cols = zip(*(pair.split('/') for pair in pairs))
+        quoted[[index[c] for c in rows], [index[c] for c in cols]] = list(pairs.values())
+    return CrossRateMatrix(tuple(codes), quoted)
+
+
+def compare_banks(krw_rates: Dict[str, float], bank_data: list, currency: str) -> List[dict]:
+    """
+    은행 고시환율과 기준 환율 비교 (load_exchange_rates의 bank_data 사용)
+    diff = 기준 - 은행 (대시보드의 USD/JPY 차이와 같은 방향)
+    """
+    reference = krw_rates.get(currency)
+    names = [item['은행'] for item in bank_data if (item.get('rates') or {}).get(currency)]
+    if not names:
+        return []
+    bank_rates = np.array([item['rates'][currency] for item in bank_data if (item.get('rates') or {}).get(currency)], dtype=float)
+    diffs = reference - bank_rates if reference else np.full(len(bank_rates), np.nan)
+    return [
+        {'은행': name, 'rate': float(rate), 'reference': reference, 'diff': float(diff)}
+        for name, rate, diff in zip(names, bank_rates, diffs)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Investing.com 환율표로 교차환율과 일관성을 확인합니다.")
+    parser.add_argument("--tolerance", type=float, default=0.001, help="삼각 환율 허용 오차 (비율)")
+    args = parser.parse_args()
+
+    from mybank import get_investing_exchange_rate
+
+    investing = get_investing_exchange_rate()
+    if not investing or not investing.get('pairs'):
+        print("Investing.com 환율표를 가져올 수 없습니다.")
+        return
+
+    matrix = build_matrix(investing['pairs'])
+    print("[원화 기준 환율]")
+    for code, rate in matrix.krw_rates().items():
+        unit = QUOTE_UNITS.get(code, 1)
+        print(f"{code}({unit}) {rate:,.2f}")
+
+    print("\n[삼각 환율 불일치]")
+    inconsistent = matrix.inconsistent_pairs(args.tolerance)
+    for base, quote, deviation in inconsistent:
+        print(f"{base}/{quote} {deviation * 100:+.3f}%")
+    if not inconsistent:
+        print("없음")
+
+
+if __name__ == "__main__":
+    main()
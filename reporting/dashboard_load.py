@@ -0,0 +1,266 @@
+"""대시보드 동시 세션 부하 측정
+
+Streamlit AppTest로 app.py 세션 여러 개를 동시에 띄워 rerun을 반복하고,
+세션 수를 늘려 가며 rerun 지연 분위수와 서버 프로세스의 CPU·RSS를 잰다.
+- 시세는 업스트림 시뮬레이터(reporting.simulator)에서 받으므로 실제 사이트에 요청하지 않음
+- 세션 수마다 새 프로세스에서 측정 (캐시·메모리가 이전 단계의 영향을 받지 않도록)
+- 이력 DB와 속도 제한 상태는 임시 폴더를 사용
+- 결과 JSON에 커밋·버전·설정을 함께 남겨 빌드끼리 비교 (--compare)
+
+python -m reporting.dashboard_load --sessions 1,5,10,20 --reruns 10 --json load.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from reporting.collector import current_rss_mb
+from reporting.simulator import FaultProfile, UpstreamSimulator, latency_summary
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'app.py')
+REFRESH_LABEL = "🔄 새로고침"
+RUN_TIMEOUT = 120.0  # 초, rerun 한 번의 최대 시간
+RSS_INTERVAL = 0.1   # 초, RSS 샘플링 간격
+
+
+class _RssSampler:
+    """측정하는 동안 RSS를 주기적으로 읽어 최댓값 기록"""
+
+    def __init__(self, interval: float = RSS_INTERVAL):
+        self.interval = interval
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb or 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='rss-sampler', daemon=True)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb() or 0.0)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _refresh_button(at):
+    return next(button for button in at.button if button.label == REFRESH_LABEL)
+
+
+def measure_sessions(sessions: int, reruns: int, refresh_every: int = 0,
+                     app_path: str = APP_PATH, timeout: float = RUN_TIMEOUT) -> dict:
+    """
+    이 프로세스에서 세션 sessions개를 동시에 띄워 각각 reruns번 실행
+    refresh_every > 0이면 그 횟수마다 새로고침 버튼을 누름
+    (스냅샷이 MANUAL_REFRESH_MIN_AGE초보다 새것이면 실제 서비스처럼 다시 조회하지 않음)
+    """
+    from streamlit.testing.v1 import AppTest
+
+    barrier = threading.Barrier(sessions)
+
+    def session(_):
+        at = AppTest.from_file(app_path, default_timeout=timeout)
+        latencies, errors = [], 0
+        barrier.wait()  # 모든 세션이 함께 시작
+        for i in range(reruns):
+            started = time.perf_counter()
+            try:
+                if i and refresh_every and i % refresh_every == 0:
+                    _refresh_button(at).click().run()
+                else:
+                    at.run()
+                errors += len(at.exception)
+            except Exception:
+                errors += 1  # 시간 초과 등
+            latencies.append(time.perf_counter() - started)
+        return latencies, errors
+
+    with _RssSampler() as rss:
+        cpu_start = time.process_time()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            results = list(executor.map(session, range(sessions)))
+        wall = time.perf_counter() - started
+        cpu = time.process_time() - cpu_start
+
+    first_runs = [latencies[0] for latencies, _ in results if latencies]
+    reruns_only = [value for latencies, _ in results for value in latencies[1:]]
+    runs = sessions * reruns
+    return {
+        'sessions': sessions,
+        'reruns': reruns,
+        'runs': runs,
+        'errors': sum(errors for _, errors in results),
+        'wall': round(wall, 3),
+        'runs_per_sec': round(runs / wall, 2) if wall else None,
+        'first_run_ms': latency_summary(first_runs),
+        'rerun_ms': latency_summary(reruns_only),
+        'cpu_seconds': round(cpu, 3),
+        'cpu_percent': round(cpu / wall * 100, 1) if wall else None,
+        'rss_start_mb': round(rss.start_mb, 1) if rss.start_mb is not None else None,
+        'rss_peak_mb': round(rss.peak_mb, 1),
+        'rss_end_mb': round(current_rss_mb() or 0.0, 1),
+    }
+
+
+def build_info() -> Dict[str, object]:
+    """현재 커밋 (git이 없으면 None)"""
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    commit = git('rev-parse', '--short', 'HEAD')
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {'commit': commit, 'dirty': bool(status) if status is not None else None}
+
+
+def _streamlit_version() -> Optional[str]:
+    try:
+        from importlib.metadata import version
+        return version('streamlit')
+    except Exception:
+        return None
+
+
+def _upstream_requests(simulator: UpstreamSimulator) -> int:
+    return sum(counter.get('requests', 0) for counter in simulator.stats_payload().values())
+
+
+def run_levels(levels: List[int], reruns: int, refresh_every: int = 0, *,
+               fault: Optional[FaultProfile] = None, timeout: float = RUN_TIMEOUT) -> dict:
+    """세션 수 단계마다 새 프로세스에서 measure_sessions를 실행해 결과를 모음"""
+    simulator = UpstreamSimulator(fault)
+    base_url = simulator.start()
+    measured = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for sessions in levels:
+                output = os.path.join(tmp, f"level-{sessions}.json")
+                env = dict(
+                    os.environ,
+                    DONDON_UPSTREAM=base_url,
+                    DONDON_DB=os.path.join(tmp, f"history-{sessions}.db"),
+                    DONDON_RATE_DIR=os.path.join(tmp, f"ratelimit-{sessions}"),
+                )
+                before = _upstream_requests(simulator)
+                proc = subprocess.run(
+                    [sys.executable, '-m', 'reporting.dashboard_load', '--worker', str(sessions),
+                     '--output', output, '--reruns', str(reruns), '--refresh-every', str(refresh_every),
+                     '--timeout', str(timeout)],
+                    cwd=ROOT, env=env, capture_output=True, text=True,
+                )
+                if proc.returncode != 0:
+                    raise RuntimeError(f"세션 {sessions}개 측정 실패:\n{proc.stderr[-2000:]}")
+                with open(output, encoding='utf-8') as f:
+                    level = json.load(f)
+                level['upstream_requests'] = _upstream_requests(simulator) - before
+                measured.append(level)
+                print(level_line(level))
+    finally:
+        simulator.stop()
+
+    fault = simulator.default
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'build': build_info(),
+        'python': platform.python_version(),
+        'streamlit': _streamlit_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {
+            'sessions': levels, 'reruns': reruns, 'refresh_every': refresh_every, 'timeout': timeout,
+            'latency_ms': fault.latency_ms, 'error_rate': fault.error_rate,
+        },
+        'levels': measured,
+    }
+
+
+def level_line(level: dict) -> str:
+    rerun = level['rerun_ms']
+    return (f"세션 {level['sessions']:>4}  첫 실행 p50 {level['first_run_ms']['p50']}ms  "
+            f"rerun p50 {rerun['p50']}ms p90 {rerun['p90']}ms p99 {rerun['p99']}ms  "
+            f"CPU {level['cpu_percent']}%  RSS 최대 {level['rss_peak_mb']}MB  "
+            f"오류 {level['errors']}  업스트림 요청 {level.get('upstream_requests', '-')}")
+
+
+def compare_lines(base: dict, current: dict) -> List[str]:
+    """세션 수가 같은 단계끼리 rerun p50/p99, CPU, 최대 RSS 비교"""
+    base_levels = {level['sessions']: level for level in base.get('levels', [])}
+    lines = [f"비교 기준: {(base.get('build') or {}).get('commit')} ({base.get('created')})"]
+
+    def delta(new, old, unit):
+        if new is None or old is None:
+            return f"{new}{unit}"
+        return f"{new}{unit} ({new - old:+.1f})"
+
+    for level in current['levels']:
+        old = base_levels.get(level['sessions'])
+        if old is None:
+            continue
+        lines.append(
+            f"세션 {level['sessions']:>4}  "
+            f"rerun p50 {delta(level['rerun_ms']['p50'], old['rerun_ms']['p50'], 'ms')}  "
+            f"p99 {delta(level['rerun_ms']['p99'], old['rerun_ms']['p99'], 'ms')}  "
+            f"CPU {delta(level['cpu_percent'], old['cpu_percent'], '%')}  "
+            f"RSS {delta(level['rss_peak_mb'], old['rss_peak_mb'], 'MB')}"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드(app.py)에 동시 세션 부하를 걸어 rerun 지연·CPU·메모리를 잽니다.")
+    parser.add_argument("--sessions", default="1,5,10,20", help="동시 세션 수 단계 (쉼표 구분)")
+    parser.add_argument("--reruns", type=int, default=10, help="세션마다 실행할 횟수 (첫 실행 포함)")
+    parser.add_argument("--refresh-every", type=int, default=0, help="이 횟수마다 새로고침 버튼 클릭 (0: 누르지 않음)")
+    parser.add_argument("--latency-ms", type=float, default=FaultProfile.latency_ms, help="시뮬레이터 응답 지연 중앙값")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="시뮬레이터 5xx 응답 비율")
+    parser.add_argument("--timeout", type=float, default=RUN_TIMEOUT, help="rerun 한 번의 최대 시간 (초)")
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON으로 저장")
+    parser.add_argument("--compare", metavar="PATH", help="이전 결과 JSON과 비교")
+    parser.add_argument("--max-p99-ms", type=float, help="어느 단계든 rerun p99가 이 값을 넘으면 종료 코드 1")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        level = measure_sessions(args.worker, args.reruns, args.refresh_every, timeout=args.timeout)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(level, f)
+        return
+
+    levels = [int(value) for value in args.sessions.split(',') if value.strip()]
+    fault = FaultProfile(latency_ms=args.latency_ms, error_rate=args.error_rate)
+    result = run_levels(levels, args.reruns, args.refresh_every, fault=fault, timeout=args.timeout)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print("\n".join(compare_lines(json.load(f), result)))
+    if args.max_p99_ms is not None:
+        worst = max((level['rerun_ms']['p99'] or 0.0) for level in result['levels'])
+        if worst > args.max_p99_ms:
+            print(f"rerun p99 {worst}ms > 허용 {args.max_p99_ms}ms")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-import inspect
-from datetime import datetime, timedelta
-from typing import Callable, Optional, Tuple
-
-from bithumb_usdt import get_bithumb_btc, get_bithumb_usdt
-from mybank import (
-    get_hanabank_exchange_rate,
-    get_investing_exchange_rate,
-    get_kbstar_exchange_rate,
-    get_shinhan_exchange_rate,
-)
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import profiling
+from reporting.business_calendar import iter_business_days
+from reporting.cross_rates import build_matrix
+from reporting.hedging import hedged_call
+from reporting.sources import KIND_BANK, Source, get_sources
 
 MAX_LOOKBACK_DAYS = 7
 
@@ -32,47 +32,27 @@ def format_datetime(date_str: Optional[str], time_str: Optional[str]) -> str:
 
 
 def iterate_business_days(start_date: datetime, max_days: int):
-    """가까운 과거 영업일을 순회"""
-    candidate = start_date
-    yielded = 0
-    while yielded < max_days:
-        if candidate.weekday() < 5:  # 월(0)~금(4)
-            yield candidate
-            yielded += 1
-        candidate = candidate - timedelta(days=1)
-
-
-def supports_target_date(fetcher: Callable) -> bool:
-    """주어진 fetcher가 target_date 인자를 지원하는지 확인"""
-    try:
-        sig = inspect.signature(fetcher)
-    except (ValueError, TypeError):
-        return False
-
-    if 'target_date' in sig.parameters:
-        return True
-
-    params = list(sig.parameters.values())
-    if not params:
-        return False
-
-    first = params[0]
-    return first.kind in (
-        inspect.Parameter.POSITIONAL_ONLY,
-        inspect.Parameter.POSITIONAL_OR_KEYWORD,
-    )
-
-
-def fetch_with_fallback(fetcher: Callable[[datetime], Optional[dict]], max_days: int = MAX_LOOKBACK_DAYS):
+    """가까운 과거 영업일을 순회 (주말·공휴일 제외)"""
+    return iter_business_days(start_date, max_days)
+
+
+def fetch_with_fallback(
+    fetcher: Callable[..., Optional[dict]],
+    max_days: int = MAX_LOOKBACK_DAYS,
+    *,
+    supports_target_date: bool = True,
+    timeout: Optional[float] = None,
+):
     """
     지정된 fetcher를 사용해 최근 영업일 순으로 조회하며,
     데이터가 없으면 전 영업일 데이터까지 탐색
     """
     today = datetime.now().date()
+    kwargs = {'timeout': timeout} if timeout is not None else {}
 
-    if not supports_target_date(fetcher):
+    if not supports_target_date:
         try:
-            result = fetcher()
+            result = fetcher(**kwargs)
         except Exception as exc:
             print(f"{fetcher.__name__} 조회 실패(현재일자): {exc}")
             return None
@@ -83,7 +63,7 @@ def fetch_with_fallback(fetcher: Callable[[datetime], Optional[dict]], max_days:
 
     for target_date in iterate_business_days(datetime.now(), max_days):
         try:
-            result = fetcher(target_date)
+            result = fetcher(target_date, **kwargs)
         except Exception as exc:
             print(f"{fetcher.__name__} 조회 실패({target_date.date()}): {exc}")
             continue
@@ -95,69 +75,103 @@ def fetch_with_fallback(fetcher: Callable[[datetime], Optional[dict]], max_days:
     return None
 
 
+def _hedged(key: str, fetcher: Callable[..., Optional[dict]]) -> Callable[..., Optional[dict]]:
+    """fetcher 호출(HTTP 요청 한 번) 단위로 헤지 (전 영업일 탐색 전체를 중복 실행하지 않도록)"""
+    @functools.wraps(fetcher)
+    def call(*args, **kwargs):
+        return hedged_call(key, fetcher, *args, **kwargs)
+    return call
+
+
+def fetch_source(source: Source) -> Optional[dict]:
+    """레지스트리에 선언된 인자에 맞춰 소스 하나를 조회 (hedge=True면 요청마다 헤지 적용)"""
+    timeout = source.timeout if 'timeout' in source.params else None
+    fetcher = _hedged(source.key, source.fetcher) if source.hedge else source.fetcher
+    with profiling.section(source.label):
+        if source.kind == KIND_BANK:
+            return fetch_with_fallback(
+                fetcher,
+                supports_target_date=source.supports_target_date,
+                timeout=timeout,
+            )
+
+        kwargs = {'timeout': timeout} if timeout is not None else {}
+        try:
+            return fetcher(**kwargs)
+        except Exception as exc:
+            print(f"{source.label} 조회 실패: {exc}")
+            return None
+
+
+def fetch_sources(sources: List[Source]) -> Dict[str, Optional[dict]]:
+    """여러 소스를 병렬로 조회 (가장 느린 소스 하나만큼만 걸림)"""
+    if not sources:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        # 호출 측 요청 우선순위(rate_limiter.priority)를 작업 스레드에도 전달
+        futures = {
+            source.key: executor.submit(contextvars.copy_context().run, fetch_source, source)
+            for source in sources
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+
+def to_bank_row(source: Source, result: dict) -> dict:
+    return {
+        '은행': source.label,
+        '조회일시': format_datetime(result['date'], result['time']),
+        '고시회차': f"{result['round']}회차",
+        'USD_raw': result['USD'],
+        'JPY_raw': result['JPY'],
+        'is_previous': result.get('is_previous', False),
+        'rates': result.get('rates', {})
+    }
+
+
+def to_ticker(result: dict) -> dict:
+    return {
+        'price': result['price'],
+        'change_rate': result['change_rate'],
+        'change_amount': result['change_amount'],
+        'volume': result.get('volume'),  # 거래소 가중 김프 계산에 재사용
+    }
+
+
 def load_exchange_rates() -> Tuple[list, Optional[dict], Optional[dict], Optional[dict]]:
-    """환율 데이터 로딩"""
-    bank_data = []
+    """환율 데이터 로딩 (등록된 모든 소스를 병렬 조회)"""
+    sources = get_sources()
+    return assemble_rates(sources, fetch_sources(sources))
+
+
+def assemble_rates(sources: List[Source], results: Dict[str, Optional[dict]]
+                   ) -> Tuple[list, Optional[dict], Optional[dict], Optional[dict]]:
+    """소스별 조회 결과 → (bank_data, investing_data, bithumb_data, btc_data)"""
+    bank_data = [
+        to_bank_row(source, results[source.key])
+        for source in sources
+        if source.kind == KIND_BANK and results.get(source.key)
+    ]
+
     investing_data = None
-    bithumb_data = None
-
-    shinhan = fetch_with_fallback(get_shinhan_exchange_rate)
-    if shinhan:
-        bank_data.append({
-            '은행': '신한은행',
-            '조회일시': format_datetime(shinhan['date'], shinhan['time']),
-            '고시회차': f"{shinhan['round']}회차",
-            'USD_raw': shinhan['USD'],
-            'JPY_raw': shinhan['JPY'],
-            'is_previous': shinhan.get('is_previous', False)
-        })
-
-    kbstar = fetch_with_fallback(get_kbstar_exchange_rate)
-    if kbstar:
-        bank_data.append({
-            '은행': '국민은행',
-            '조회일시': format_datetime(kbstar['date'], kbstar['time']),
-            '고시회차': f"{kbstar['round']}회차",
-            'USD_raw': kbstar['USD'],
-            'JPY_raw': kbstar['JPY'],
-            'is_previous': kbstar.get('is_previous', False)
-        })
-
-    hana = fetch_with_fallback(get_hanabank_exchange_rate)
-    if hana:
-        bank_data.append({
-            '은행': '하나은행',
-            '조회일시': format_datetime(hana['date'], hana['time']),
-            '고시회차': f"{hana['round']}회차",
-            'USD_raw': hana['USD'],
-            'JPY_raw': hana['JPY'],
-            'is_previous': hana.get('is_previous', False)
-        })
-
-    investing = get_investing_exchange_rate()
+    investing = results.get('investing')
     if investing:
+        # 환율표 전체로 통화별 원화 환율 계산 (JPY는 100엔당)
+        rates = build_matrix(investing.get('pairs') or {}).krw_rates()
+        # 환율표로 계산하지 못하면 파싱한 JPY/KRW(1엔 기준)로 대신함 (둘 다 없으면 None)
+        jpy_krw = rates.get('JPY')
+        if jpy_krw is None and investing.get('JPY_KRW'):
+            jpy_krw = investing['JPY_KRW'] * 100  # 100엔당으로 변환
         investing_data = {
             'datetime': format_datetime(investing['date'], investing['time']),
-            'USD_KRW': investing['USD_KRW'],
-            'JPY_KRW': investing['JPY_KRW'] * 100  # 100엔당으로 변환
+            'USD_KRW': rates.get('USD', investing['USD_KRW']),
+            'JPY_KRW': jpy_krw,
+            'rates': rates
         }
 
-    bithumb = get_bithumb_usdt()
-    if bithumb:
-        bithumb_data = {
-            'price': bithumb['price'],
-            'change_rate': bithumb['change_rate'],
-            'change_amount': bithumb['change_amount']
-        }
+    bithumb = results.get('bithumb_usdt')
+    bithumb_data = to_ticker(bithumb) if bithumb else None
 
-    btc_data = None
-    btc = get_bithumb_btc()
-    if btc:
-        btc_data = {
-            'price': btc['price'],
-            'change_rate': btc['change_rate'],
-            'change_amount': btc['change_amount']
-        }
+    btc = results.get('bithumb_btc')
+    btc_data = to_ticker(btc) if btc else None
 
     return bank_data, investing_data, bithumb_data, btc_data
-
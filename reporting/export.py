@@ -0,0 +1,311 @@
+"""이력 내보내기 (CSV / JSONL / Parquet)
+
+이력 저장소의 원본 샘플을 chunk 단위로 읽어 바로 파일에 쓰므로,
+기간이 아무리 길어도 메모리에는 chunk 하나만 올라간다.
+--derived를 주면 같은 시각의 샘플로 김치프리미엄과 은행 스프레드를 함께 계산해 내보낸다.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from reporting.history import HISTORY_DB_PATH, HistoryStore
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+COLUMNS = ('ts', 'source', 'metric', 'value')
+DEFAULT_CHUNK_SIZE = 50_000
+
+PREMIUM_SOURCE = '김치프리미엄'
+SPREAD_METRIC = 'USD_spread'
+
+Sample = Tuple[int, str, str, float]
+
+
+def iter_samples(store: HistoryStore, sources: Optional[Sequence[str]] = None,
+                 metrics: Optional[Sequence[str]] = None, start: Optional[int] = None,
+                 end: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Sample]]:
+    """조건에 맞는 샘플을 시각 순으로 chunk_size개씩 돌려줌"""
+    where = []
+    params: list = []
+    if sources:
+        where.append(f"source IN ({','.join('?' * len(sources))})")
+        params.extend(sources)
+    if metrics:
+        where.append(f"metric IN ({','.join('?' * len(metrics))})")
+        params.extend(metrics)
+    if start is not None:
+        where.append("ts >= ?")
+        params.append(start)
+    if end is not None:
+        where.append("ts <= ?")
+        params.append(end)
+
+    sql = "SELECT ts, source, metric, value FROM samples"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY ts"
+
+    cur = store.conn.execute(sql, params)
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _derived(group: List[Sample]) -> List[Sample]:
+    """같은 시각의 샘플로 김치프리미엄(%)과 은행 USD 스프레드(Investing - 은행) 계산"""
+    ts = group[0][0]
+    usd_base = next((v for _, s, m, v in group if s == 'Investing.com' and m == 'USD'), None)
+    if not usd_base:
+        return []
+    derived = [
+        (ts, source, SPREAD_METRIC, usd_base - value)
+        for _, source, metric, value in group
+        if metric == 'USD' and source != 'Investing.com'
+    ]
+    usdt = next((v for _, s, m, v in group if s == '빗썸' and m == 'USDT'), None)
+    if usdt:
+        derived.append((ts, PREMIUM_SOURCE, 'USDT', (usdt - usd_base) / usd_base * 100))
+    return derived
+
+
+def with_derived(chunks: Iterable[List[Sample]]) -> Iterator[List[Sample]]:
+    """chunk 흐름에 파생 지표를 끼워 넣음 (시각이 chunk 경계에 걸쳐도 한 묶음으로 처리)"""
+    pending: List[Sample] = []
+    for chunk in chunks:
+        rows = pending + chunk
+        # 마지막 시각은 다음 chunk에 이어질 수 있으므로 보류
+        last_ts = rows[-1][0]
+        split = len(rows)
+        while split > 0 and rows[split - 1][0] == last_ts:
+            split -= 1
+        complete, pending = rows[:split], rows[split:]
+        if complete:
+            yield _expand(complete)
+    if pending:
+        yield _expand(pending)
+
+
+def _expand(rows: List[Sample]) -> List[Sample]:
+    out: List[Sample] = []
+    for _, group in itertools.groupby(rows, key=lambda row: row[0]):
+        group = list(group)
+        out.extend(group)
+        out.extend(_derived(group))
+    return out
+
+
+def iter_csv(chunks: Iterable[List[Sample]]) -> Iterator[str]:
+    """chunk마다 CSV 텍스트 한 덩어리 (첫 덩어리는 헤더)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(COLUMNS)
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_jsonl(chunks: Iterable[List[Sample]]) -> Iterator[str]:
+    """chunk마다 JSON Lines 텍스트 한 덩어리"""
+    quoted = {}  # 소스/지표 이름은 몇 개뿐이므로 한 번만 인코딩
+
+    def q(text: str) -> str:
+        value = quoted.get(text)
+        if value is None:
+            value = quoted[text] = json.dumps(text, ensure_ascii=False)
+        return value
+
+    for chunk in chunks:
+        yield "".join(
+            f'{{"ts":{ts},"source":{q(source)},"metric":{q(metric)},"value":{value!r}}}\n'
+            for ts, source, metric, value in chunk
+        )
+
+
+TEXT_ENCODERS = {'csv': iter_csv, 'jsonl': iter_jsonl}
+
+
+def _counted(chunks: Iterable[List[Sample]], counter: list) -> Iterator[List[Sample]]:
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+
+def _write_parquet(chunks: Iterable[List[Sample]], path: str) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet 내보내기에는 pyarrow가 필요합니다. pip install pyarrow")
+
+    schema = pa.schema([
+        ('ts', pa.int64()), ('source', pa.string()), ('metric', pa.string()), ('value', pa.float64()),
+    ])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            ts, source, metric, value = zip(*chunk)
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(ts, pa.int64()), pa.array(source), pa.array(metric), pa.array(value, pa.float64())],
+                schema=schema,
+            ))
+            count += len(chunk)
+    return count
+
+
+def open_chunks(store: HistoryStore, *, sources: Optional[Sequence[str]] = None,
+                metrics: Optional[Sequence[str]] = None, start: Optional[int] = None,
+                end: Optional[int] = None, derived: bool = False,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Sample]]:
+    """필터와 파생 지표를 적용한 chunk 흐름"""
+    if not derived:
+        return iter_samples(store, sources, metrics, start, end, chunk_size)
+    # 파생 지표는 같은 시각의 기준값이 필요하므로 소스 필터 없이 읽은 뒤 거름
+    chunks = with_derived(iter_samples(store, None, None, start, end, chunk_size))
+    return _filtered(chunks, sources, metrics)
+
+
+def export_history(output: str, fmt: str = 'csv', *, sources: Optional[Sequence[str]] = None,
+                   metrics: Optional[Sequence[str]] = None, start: Optional[int] = None,
+                   end: Optional[int] = None, derived: bool = False,
+                   db_path: str = HISTORY_DB_PATH, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """이력을 output 파일로 내보내고 기록한 행 수를 돌려줌 (output='-'이면 표준 출력, csv/jsonl만)"""
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    if fmt == 'parquet' and output == '-':
+        raise ValueError("Parquet은 파일로만 내보낼 수 있습니다.")
+
+    store = HistoryStore(db_path)
+    try:
+        chunks = open_chunks(store, sources=sources, metrics=metrics, start=start, end=end,
+                             derived=derived, chunk_size=chunk_size)
+        if fmt == 'parquet':
+            return _write_parquet(chunks, output)
+
+        counter = [0]
+        pieces = TEXT_ENCODERS[fmt](_counted(chunks, counter))
+        if output == '-':
+            sys.stdout.writelines(pieces)
+        else:
+            with open(output, 'w', encoding='utf-8', newline='') as stream:
+                stream.writelines(pieces)
+        return counter[0]
+    finally:
+        store.close()
+
+
+def _filtered(chunks: Iterable[List[Sample]], sources: Optional[Sequence[str]],
+              metrics: Optional[Sequence[str]]) -> Iterator[List[Sample]]:
+    if not sources and not metrics:
+        yield from chunks
+        return
+    source_set = set(sources or [])
+    metric_set = set(metrics or [])
+    for chunk in chunks:
+        rows = [
+            row for row in chunk
+            if (not source_set or row[1] in source_set) and (not metric_set or row[2] in metric_set)
+        ]
+        if rows:
+            yield rows
+
+
+def _parse_time(value: Optional[str]) -> Optional[int]:
+    """epoch 초 또는 ISO 날짜/시각"""
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_benchmark(rows: int, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """합성 이력 rows개로 형식별 내보내기 처리량 측정"""
+    banks = ['신한은행', '국민은행', '하나은행', '우리은행', 'NH농협은행', 'IBK기업은행']
+    series = [(bank, metric) for bank in banks for metric in ('USD', 'JPY')]
+    series += [('Investing.com', 'USD'), ('Investing.com', 'JPY'), ('빗썸', 'USDT'), ('빗썸', 'BTC')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        store = HistoryStore(db_path)
+        started = time.perf_counter()
+        ts0 = 1_700_000_000
+        snapshots = rows // len(series)
+        with store.conn:
+            store.conn.executemany(
+                "INSERT INTO samples (ts, source, metric, value) VALUES (?, ?, ?, ?)",
+                ((ts0 + i * 60, source, metric, 1400.0 + (i % 100) * 0.01)
+                 for i in range(snapshots) for source, metric in series),
+            )
+        store.close()
+        print(f"합성 이력 {snapshots * len(series):,}행 생성: {time.perf_counter() - started:.1f}초")
+
+        for fmt in FORMATS:
+            for derived in (False, True):
+                output = os.path.join(tmp, f"out.{fmt}")
+                started = time.perf_counter()
+                try:
+                    count = export_history(output, fmt, derived=derived, db_path=db_path, chunk_size=chunk_size)
+                except RuntimeError as e:
+                    print(f"{fmt}: {e}")
+                    break
+                elapsed = time.perf_counter() - started
+                size_mb = os.path.getsize(output) / (1024 * 1024)
+                peak = _peak_rss_mb()
+                label = f"{fmt}{' +derived' if derived else ''}"
+                print(f"{label:16s} {count:>12,}행 {elapsed:6.1f}초 {count / elapsed:>12,.0f}행/초 "
+                      f"{size_mb:8.1f}MB" + (f"  최대 RSS {peak:.0f}MB" if peak else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이력을 CSV/JSONL/Parquet으로 내보냅니다.")
+    parser.add_argument("--format", choices=FORMATS, default='csv', help="출력 형식")
+    parser.add_argument("--output", default='-', help="출력 파일 경로 (기본: 표준 출력)")
+    parser.add_argument("--source", action="append", help="소스 (예: 신한은행, Investing.com, 빗썸, 김치프리미엄)")
+    parser.add_argument("--currency", action="append", help="통화/지표 (예: USD, JPY, USDT, USD_spread)")
+    parser.add_argument("--start", help="시작 시각 (epoch 초 또는 2026-01-01T00:00)")
+    parser.add_argument("--end", help="종료 시각 (epoch 초 또는 2026-01-31T23:59)")
+    parser.add_argument("--derived", action="store_true", help="김치프리미엄·은행 스프레드 포함")
+    parser.add_argument("--db", default=HISTORY_DB_PATH, help="이력 저장소 경로")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="한 번에 읽을 행 수")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="합성 이력 ROWS행으로 처리량 측정")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, args.chunk_size)
+        return
+
+    count = export_history(
+        args.output, args.format,
+        sources=args.source, metrics=args.currency,
+        start=_parse_time(args.start), end=_parse_time(args.end),
+        derived=args.derived, db_path=args.db, chunk_size=args.chunk_size,
+    )
+    print(f"{count:,}행 내보냄", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
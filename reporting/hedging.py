@@ -0,0 +1,150 @@
+"""느린 소스에 대한 헤지 요청
+
+소스별 지연 시간 히스토그램에서 p95를 구해, 첫 요청이 그 시간 안에 끝나지 않으면
+같은 요청을 한 번 더 보내고 먼저 돌아온 결과를 쓴다.
+추가 요청은 예산(기본: 일반 요청의 10%) 안에서만 허용한다.
+히스토그램은 프로세스 메모리에만 있으므로 표본(min_samples)이 쌓이는 상주 프로세스
+(대시보드·수집기·API 서버)에서만 헤지가 동작하고, 한 번 돌고 끝나는 CLI는 헤지하지 않는다.
+"""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import http_client
+
+# 10ms ~ 약 82초 구간을 로그 간격(약 12%)으로 나눈 버킷 경계
+BUCKET_BOUNDS: List[float] = [0.01 * (1.12 ** i) for i in range(80)]
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='hedge')
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램 (기록·분위수 조회 모두 O(버킷 수) 이하)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        index = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수의 버킷 상한 (표본이 없으면 None)"""
+        with self._lock:
+            if not self.total:
+                return None
+            target = math.ceil(q * self.total)
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= target:
+                    return BUCKET_BOUNDS[min(index, len(BUCKET_BOUNDS) - 1)]
+        return BUCKET_BOUNDS[-1]
+
+
+@dataclass
+class HedgePolicy:
+    quantile: float = 0.95
+    min_samples: int = 20        # 이보다 표본이 적으면 헤지하지 않음
+    budget_ratio: float = 0.1    # 일반 요청 대비 추가 요청 비율 상한
+    max_budget: float = 5.0      # 쌓아 둘 수 있는 추가 요청 수
+    min_delay: float = 0.05      # 헤지 대기 시간 하한 (초)
+
+
+class HedgeState:
+    """소스 하나의 히스토그램과 추가 요청 예산"""
+
+    def __init__(self, policy: HedgePolicy):
+        self.policy = policy
+        self.histogram = LatencyHistogram()
+        self.budget = 0.0
+        self.requests = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> Optional[float]:
+        if self.histogram.total < self.policy.min_samples:
+            return None
+        delay = self.histogram.quantile(self.policy.quantile)
+        return max(delay, self.policy.min_delay) if delay is not None else None
+
+    def on_request(self):
+        with self._lock:
+            self.requests += 1
+            self.budget = min(self.policy.max_budget, self.budget + self.policy.budget_ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.budget < 1.0:
+                return False
+            self.budget -= 1.0
+            self.hedges += 1
+            return True
+
+
+_states: Dict[str, HedgeState] = {}
+_states_lock = threading.Lock()
+
+
+def get_hedge_state(key: str, policy: Optional[HedgePolicy] = None) -> HedgeState:
+    with _states_lock:
+        state = _states.get(key)
+        if state is None:
+            state = _states[key] = HedgeState(policy or HedgePolicy())
+        return state
+
+
+def _timed(histogram: LatencyHistogram, fn: Callable, args: tuple, kwargs: dict):
+    """
+    네트워크 시간을 기록 (먼저 끝난 쪽이 채택돼도 늦게 끝난 요청까지 모두 기록)
+    속도 제한 대기는 p95를 부풀리므로 빼고, http_client를 거치지 않는 fn이면 전체 실행 시간
+    """
+    network: List[float] = []
+    started = time.perf_counter()
+    try:
+        with http_client.observe(lambda host, wait, seconds: network.append(seconds)):
+            return fn(*args, **kwargs)
+    finally:
+        histogram.record(sum(network) if network else time.perf_counter() - started)
+
+
+def hedged_call(key: str, fn: Callable, *args, policy: Optional[HedgePolicy] = None, **kwargs):
+    """
+    fn(*args, **kwargs)를 실행하되, p95 안에 끝나지 않으면 한 번 더 실행해 먼저 온 결과 사용
+    fn이 None을 돌려주면 실패로 보고 다른 쪽 결과를 기다림
+    """
+    state = get_hedge_state(key, policy)
+    state.on_request()
+
+    primary = _executor.submit(contextvars.copy_context().run, _timed, state.histogram, fn, args, kwargs)
+    pending = {primary}
+
+    delay = state.hedge_delay()
+    if delay is not None:
+        done, _ = wait(pending, timeout=delay)
+        if not done and state.try_spend():
+            pending.add(_executor.submit(contextvars.copy_context().run, _timed, state.histogram, fn, args, kwargs))
+
+    result = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as exc:
+                print(f"{key} 조회 실패: {exc}")
+                continue
+            if result is not None:
+                return result
+    return result
@@ -0,0 +1,246 @@
+"""환율·시세 이력 저장소 (SQLite)
+
+원본 샘플과 함께 1분/5분/1시간/1일 OHLC 버킷을 기록 시점에 미리 집계해 두고,
+조회 구간에 맞는 해상도를 골라 항상 제한된 개수의 점만 돌려준다.
+- 1일 버킷은 한국 시간 자정 기준
+- 원본 샘플과 촘촘한 버킷은 보관 기간이 지나면 지움 (1일 버킷은 계속 보관)
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+HISTORY_DB_PATH = os.getenv("DONDON_DB", "dondon.db")
+
+# 집계 해상도 (초)
+RESOLUTIONS = (60, 300, 3600, 86400)
+KST_OFFSET = 9 * 3600  # 1일 버킷을 한국 시간 자정에 맞춤
+# 해상도별 보관 기간 (초, None이면 계속 보관)
+ROLLUP_RETENTION = {60: 3 * 86400, 300: 30 * 86400, 3600: 400 * 86400, 86400: None}
+SAMPLE_RETENTION = int(os.getenv("DONDON_SAMPLE_RETENTION_DAYS", "180")) * 86400
+PRUNE_INTERVAL = 3600  # 초, 보관 기간 정리 주기 (프로세스·DB 파일별)
+DEFAULT_MAX_POINTS = 500
+SNAPSHOT_KEEP = 100  # 보관할 최근 스냅샷 수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    ts INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_series ON samples (source, metric, ts);
+CREATE INDEX IF NOT EXISTS idx_samples_ts ON samples (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    source TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    resolution INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    PRIMARY KEY (source, metric, resolution, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rollups_resolution ON rollups (resolution, source, metric, bucket);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (source, metric, resolution, bucket, open, high, low, close)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, metric, resolution, bucket) DO UPDATE SET
+    high = MAX(high, excluded.high),
+    low = MIN(low, excluded.low),
+    close = excluded.close
+"""
+
+Row = Tuple[str, str, float]
+
+_last_prune = {}  # DB 경로 → 마지막 정리 시각
+
+
+def bucket_start(ts: int, resolution: int) -> int:
+    """ts가 속한 버킷의 시작 시각 (1일 버킷은 한국 시간 자정)"""
+    offset = KST_OFFSET if resolution >= 86400 else 0
+    return ts - (ts + offset) % resolution
+
+
+def snapshot_rows(bank_data: list, investing_data: Optional[dict],
+                  bithumb_data: Optional[dict], btc_data: Optional[dict]) -> List[Row]:
+    """load_exchange_rates 결과를 (source, metric, value) 행으로 변환"""
+    rows: List[Row] = []
+    for item in bank_data:
+        if item.get('USD_raw'):
+            rows.append((item['은행'], 'USD', float(item['USD_raw'])))
+        if item.get('JPY_raw'):
+            rows.append((item['은행'], 'JPY', float(item['JPY_raw'])))
+    if investing_data:
+        if investing_data.get('USD_KRW'):
+            rows.append(('Investing.com', 'USD', float(investing_data['USD_KRW'])))
+        if investing_data.get('JPY_KRW'):
+            rows.append(('Investing.com', 'JPY', float(investing_data['JPY_KRW'])))
+    if bithumb_data:
+        rows.append(('빗썸', 'USDT', float(bithumb_data['price'])))
+    if btc_data:
+        rows.append(('빗썸', 'BTC', float(btc_data['price'])))
+    return rows
+
+
+def snapshot_payload(bank_data: list, investing_data: Optional[dict],
+                     bithumb_data: Optional[dict], btc_data: Optional[dict],
+                     ts: Optional[int] = None) -> dict:
+    """API 등 다른 프로세스와 공유할 최신 스냅샷"""
+    ts = int(ts if ts is not None else time.time())
+    return {
+        'ts': ts,
+        'taken_at': datetime.fromtimestamp(ts).isoformat(timespec='seconds'),
+        'banks': bank_data,
+        'investing': investing_data,
+        'bithumb_usdt': bithumb_data,
+        'bithumb_btc': btc_data,
+    }
+
+
+class HistoryStore:
+    def __init__(self, path: str = HISTORY_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """이전 버전 DB: UTC 자정 기준 1일 버킷을 원본 샘플에서 한국 시간 기준으로 다시 집계"""
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+            return
+        day = RESOLUTIONS[-1]
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM rollups WHERE resolution = ? AND (bucket + ?) % ? != 0",
+                (day, KST_OFFSET, day),
+            )
+            cur = self.conn.execute("SELECT ts, source, metric, value FROM samples ORDER BY ts")
+            while True:
+                chunk = cur.fetchmany(10000)
+                if not chunk:
+                    break
+                self.conn.executemany(_UPSERT_ROLLUP, [
+                    (source, metric, day, bucket_start(ts, day), value, value, value, value)
+                    for ts, source, metric, value in chunk
+                ])
+            self.conn.execute("PRAGMA user_version = 1")
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, rows: Iterable[Row], ts: Optional[int] = None):
+        """원본 샘플 저장 + 모든 해상도의 OHLC 버킷 갱신"""
+        ts = int(ts if ts is not None else time.time())
+        rows = list(rows)
+        if not rows:
+            return
+        rollups = [
+            (source, metric, resolution, bucket_start(ts, resolution), value, value, value, value)
+            for source, metric, value in rows
+            for resolution in RESOLUTIONS
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO samples (ts, source, metric, value) VALUES (?, ?, ?, ?)",
+                [(ts, source, metric, value) for source, metric, value in rows],
+            )
+            self.conn.executemany(_UPSERT_ROLLUP, rollups)
+        if ts - _last_prune.get(self.path, 0) >= PRUNE_INTERVAL:
+            self.prune(ts)
+
+    def prune(self, now: Optional[int] = None):
+        """보관 기간이 지난 원본 샘플과 버킷 삭제"""
+        now = int(now if now is not None else time.time())
+        _last_prune[self.path] = now
+        with self.conn:
+            self.conn.execute("DELETE FROM samples WHERE ts < ?", (now - SAMPLE_RETENTION,))
+            for resolution, retention in ROLLUP_RETENTION.items():
+                if retention is not None:
+                    self.conn.execute(
+                        "DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                        (resolution, now - retention),
+                    )
+
+    def save_snapshot(self, payload: dict):
+        """최신 스냅샷 저장 (최근 SNAPSHOT_KEEP개만 보관)"""
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO snapshots (ts, payload) VALUES (?, ?)",
+                (payload['ts'], json.dumps(payload, ensure_ascii=False)),
+            )
+            self.conn.execute("DELETE FROM snapshots WHERE id <= ?", (cur.lastrowid - SNAPSHOT_KEEP,))
+
+    def latest_snapshot_id(self) -> Optional[int]:
+        return self.conn.execute("SELECT MAX(id) FROM snapshots").fetchone()[0]
+
+    def latest_snapshot(self) -> Optional[Tuple[int, dict]]:
+        """(스냅샷 id, payload)"""
+        row = self.conn.execute("SELECT id, payload FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+        if not row:
+            return None
+        return row[0], json.loads(row[1])
+
+    def series(self) -> List[Tuple[str, str]]:
+        """저장된 (source, metric) 목록"""
+        cur = self.conn.execute(
+            "SELECT DISTINCT source, metric FROM rollups WHERE resolution = ? ORDER BY source, metric",
+            (RESOLUTIONS[-1],),
+        )
+        return cur.fetchall()
+
+    def query(self, source: str, metric: str, start: int, end: int,
+              max_points: int = DEFAULT_MAX_POINTS) -> Tuple[int, List[tuple]]:
+        """
+        구간 [start, end]의 OHLC 버킷 조회
+        반환: (사용한 해상도, [(bucket, open, high, low, close), ...])
+        """
+        resolution = pick_resolution(end - start, max_points, age=int(time.time()) - start)
+        cur = self.conn.execute(
+            "SELECT bucket, open, high, low, close FROM rollups "
+            "WHERE source = ? AND metric = ? AND resolution = ? AND bucket BETWEEN ? AND ? "
+            "ORDER BY bucket",
+            (source, metric, resolution, bucket_start(start, resolution), end),
+        )
+        return resolution, cur.fetchall()
+
+
+def pick_resolution(span_seconds: int, max_points: int = DEFAULT_MAX_POINTS, age: Optional[int] = None) -> int:
+    """점 개수가 max_points를 넘지 않는 가장 촘촘한 해상도 (age: 구간 시작이 지금보다 몇 초 전인지, 보관 기간 밖 해상도 제외)"""
+    for resolution in RESOLUTIONS:
+        retention = ROLLUP_RETENTION.get(resolution)
+        if age is not None and retention is not None and age > retention:
+            continue
+        if span_seconds / resolution <= max_points:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+def record_snapshot(bank_data: list, investing_data: Optional[dict],
+                    bithumb_data: Optional[dict], btc_data: Optional[dict],
+                    path: str = HISTORY_DB_PATH):
+    """스냅샷을 이력에 기록 (실패해도 호출 측 흐름은 유지)"""
+    try:
+        store = HistoryStore(path)
+        try:
+            payload = snapshot_payload(bank_data, investing_data, bithumb_data, btc_data)
+            store.record(snapshot_rows(bank_data, investing_data, bithumb_data, btc_data), payload['ts'])
+            store.save_snapshot(payload)
+        finally:
+            store.close()
+    except sqlite3.Error as e:
+        print(f"[이력 저장 실패] {e}")
@@ -0,0 +1,317 @@
+"""카카오톡/텔레그램 전송 outbox (SQLite)
+
+완성된 메시지를 먼저 outbox에 한 번 넣고, 워커가 전송한다.
+- 같은 멱등 키는 한 번만 들어가므로 같은 리포트를 다시 넣어도 중복 전송하지 않음
+- 실패하면 지수 백오프로 다시 시도하고 MAX_ATTEMPTS번 실패하면 failed로 남김
+- 채널별 속도 제한은 rate_limiter의 호스트 버킷을 그대로 사용 (kapi.kakao.com, api.telegram.org)
+- 재시도는 저장된 메시지만 다시 보내므로 크롤링을 다시 하지 않음
+
+워커: python -m reporting.outbox (--once면 보낼 때가 된 메시지만 보내고 종료)
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rate_limiter import acquire
+
+OUTBOX_DB_PATH = os.getenv("DONDON_OUTBOX", "outbox.db")
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 30        # 초, 첫 재시도 대기
+BACKOFF_MAX = 3600       # 초
+LEASE_SECONDS = 120      # 전송 중인 메시지를 다른 워커가 가져가지 않는 시간
+SENT_KEEP_SECONDS = 7 * 86400
+IDLE_MAX = 30            # 초, 워커가 한 번에 쉬는 최대 시간
+CLAIM_BATCH = 50         # 한 번에 가져가는 메시지 수
+DEFAULT_CONCURRENCY = 8  # 동시에 보내는 메시지 수
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+CHANNEL_HOSTS = {'kakao': 'kapi.kakao.com', 'telegram': 'api.telegram.org'}
+CHANNEL_LABELS = {'kakao': '카카오톡', 'telegram': '텔레그램'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt);
+"""
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    id: int
+    key: str
+    channel: str
+    payload: dict
+    attempts: int
+
+
+def idempotency_key(scope: str, channel: str, message: str) -> str:
+    """같은 채널에 같은 내용이면 같은 키 (scope: 'report', 'alert' 등)"""
+    digest = hashlib.blake2b(f"{channel}\n{message}".encode('utf-8'), digest_size=16).hexdigest()
+    return f"{scope}:{channel}:{digest}"
+
+
+def backoff_delay(attempts: int) -> float:
+    """attempts번 실패한 뒤 다음 시도까지 대기 (지수 백오프 + 지터)"""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class Outbox:
+    def __init__(self, path: str = OUTBOX_DB_PATH):
+        self.path = path
+        # 트랜잭션을 직접 관리 (가져가기는 BEGIN IMMEDIATE로 워커 간 경합 방지)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, channel: str, payload: dict, key: str, now: Optional[float] = None) -> bool:
+        """메시지 추가 (같은 키가 이미 있으면 무시하고 False)"""
+        now = time.time() if now is None else now
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO outbox (idempotency_key, channel, payload, status, next_attempt, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, channel, json.dumps(payload, ensure_ascii=False), PENDING, now, now),
+        )
+        return cur.rowcount == 1
+
+    def enqueue_many(self, items: List[Tuple[str, dict, str]], now: Optional[float] = None) -> int:
+        """(channel, payload, key) 여러 개를 한 트랜잭션으로 추가 → 새로 들어간 수"""
+        now = time.time() if now is None else now
+        before = self.conn.total_changes
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, channel, payload, status, next_attempt, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, channel, json.dumps(payload, ensure_ascii=False), PENDING, now, now)
+                 for channel, payload, key in items],
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return self.conn.total_changes - before
+
+    def claim_due(self, now: Optional[float] = None, limit: int = CLAIM_BATCH) -> List[OutboxMessage]:
+        """보낼 때가 된 메시지를 전송 중으로 바꾸고 돌려줌 (임대 시간이 지난 전송 중 메시지 포함)"""
+        now = time.time() if now is None else now
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                "SELECT id, idempotency_key, channel, payload, attempts FROM outbox "
+                "WHERE status IN (?, ?) AND next_attempt <= ? ORDER BY next_attempt LIMIT ?",
+                (PENDING, SENDING, now, limit),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE outbox SET status = ?, next_attempt = ? WHERE id = ?",
+                [(SENDING, now + LEASE_SECONDS, row[0]) for row in rows],
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [OutboxMessage(row[0], row[1], row[2], json.loads(row[3]), row[4]) for row in rows]
+
+    def mark_sent(self, message: OutboxMessage, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self.conn.execute(
+            "UPDATE outbox SET status = ?, sent_at = ?, attempts = attempts + 1, last_error = NULL WHERE id = ?",
+            (SENT, now, message.id),
+        )
+
+    def mark_failed(self, message: OutboxMessage, error: str, now: Optional[float] = None) -> Optional[float]:
+        """실패 기록 → 다음 시도 시각 (더 시도하지 않으면 None)"""
+        now = time.time() if now is None else now
+        attempts = message.attempts + 1
+        if attempts >= MAX_ATTEMPTS:
+            status, next_attempt = FAILED, now
+        else:
+            status, next_attempt = PENDING, now + backoff_delay(attempts)
+        self.conn.execute(
+            "UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+            (status, attempts, next_attempt, error[:1000], message.id),
+        )
+        return next_attempt if status == PENDING else None
+
+    def next_due(self) -> Optional[float]:
+        return self.conn.execute(
+            "SELECT MIN(next_attempt) FROM outbox WHERE status IN (?, ?)", (PENDING, SENDING)
+        ).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+    def failed(self, limit: int = 20) -> List[Tuple[int, str, int, str]]:
+        return self.conn.execute(
+            "SELECT id, channel, attempts, last_error FROM outbox WHERE status = ? ORDER BY id DESC LIMIT ?",
+            (FAILED, limit),
+        ).fetchall()
+
+    def retry_failed(self, now: Optional[float] = None) -> int:
+        """failed 메시지를 다시 대기열로 (시도 횟수 초기화)"""
+        now = time.time() if now is None else now
+        cur = self.conn.execute(
+            "UPDATE outbox SET status = ?, attempts = 0, next_attempt = ? WHERE status = ?",
+            (PENDING, now, FAILED),
+        )
+        return cur.rowcount
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """오래된 전송 완료 기록 정리 (멱등 키 보관 기간 = SENT_KEEP_SECONDS)"""
+        now = time.time() if now is None else now
+        cur = self.conn.execute(
+            "DELETE FROM outbox WHERE status = ? AND sent_at < ?", (SENT, now - SENT_KEEP_SECONDS)
+        )
+        return cur.rowcount
+
+
+def default_senders() -> Dict[str, Callable[..., None]]:
+    from reporting.send_report import send_kakao_message, send_telegram_message
+
+    return {'kakao': send_kakao_message, 'telegram': send_telegram_message}
+
+
+def _send(message: OutboxMessage, senders: Dict[str, Callable[..., None]]):
+    sender = senders.get(message.channel)
+    if sender is None:
+        raise RuntimeError(f"알 수 없는 채널: {message.channel}")
+    acquire(CHANNEL_HOSTS.get(message.channel))
+    sender(**message.payload)
+
+
+def deliver_due(outbox: Outbox, senders: Optional[Dict[str, Callable[..., None]]] = None,
+                now: Optional[float] = None, concurrency: int = 1) -> Tuple[int, int]:
+    """
+    보낼 때가 된 메시지 전송 → (성공 수, 실패 수)
+    concurrency개까지 동시에 보내고, 결과 기록은 호출 스레드에서만 함 (SQLite 연결 공유 안 함)
+    """
+    senders = senders or default_senders()
+    # 임대·재시도·전송 시각은 기록할 때마다 새로 읽음 (긴 전송 중에 임대가 만료돼 다른 워커가
+    # 같은 메시지를 가져가지 않도록). now를 주면 고정 시각 (테스트용)
+    clock = time.time if now is None else (lambda: now)
+    sent = failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        while True:
+            batch = outbox.claim_due(clock(), limit=CLAIM_BATCH)
+            futures = {executor.submit(_send, message, senders): message for message in batch}
+            for future in as_completed(futures):
+                message = futures[future]
+                label = CHANNEL_LABELS.get(message.channel, message.channel)
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1
+                    failed_at = clock()
+                    retry_at = outbox.mark_failed(message, str(e), failed_at)
+                    if retry_at is None:
+                        print(f"[{label} 전송 실패] {e} ({MAX_ATTEMPTS}회 실패, 재시도 중단)")
+                    else:
+                        print(f"[{label} 전송 실패] {e} ({retry_at - failed_at:.0f}초 후 재시도)")
+                else:
+                    sent += 1
+                    outbox.mark_sent(message, clock())
+            if len(batch) < CLAIM_BATCH:
+                return sent, failed
+
+
+def enqueue_and_deliver(channels: List[str], payload: dict, scope: str,
+                        path: str = OUTBOX_DB_PATH) -> Tuple[int, int]:
+    """채널마다 메시지를 넣고 바로 한 번 전송 (실패분은 워커가 재시도)"""
+    outbox = Outbox(path)
+    try:
+        for channel in channels:
+            key = idempotency_key(scope, channel, payload['message'])
+            if not outbox.enqueue(channel, payload, key):
+                print(f"[{CHANNEL_LABELS.get(channel, channel)}] 이미 전송 대기열에 있는 메시지입니다.")
+        return deliver_due(outbox)
+    finally:
+        outbox.close()
+
+
+def enqueue_batch_and_deliver(items: List[Tuple[str, dict, str]], concurrency: int = DEFAULT_CONCURRENCY,
+                              path: str = OUTBOX_DB_PATH) -> Tuple[int, int, int]:
+    """(channel, payload, key) 목록을 한 번에 넣고 동시에 전송 → (새로 넣은 수, 성공 수, 실패 수)"""
+    outbox = Outbox(path)
+    try:
+        queued = outbox.enqueue_many(items)
+        sent, failed = deliver_due(outbox, concurrency=concurrency)
+        return queued, sent, failed
+    finally:
+        outbox.close()
+
+
+def run_worker(path: str = OUTBOX_DB_PATH, once: bool = False, concurrency: int = DEFAULT_CONCURRENCY):
+    outbox = Outbox(path)
+    senders = default_senders()
+    try:
+        while True:
+            sent, failed = deliver_due(outbox, senders, concurrency=concurrency)
+            if sent or failed:
+                print(f"전송 {sent}건, 실패 {failed}건")
+            outbox.prune()
+            if once:
+                return
+            next_due = outbox.next_due()
+            idle = IDLE_MAX if next_due is None else min(max(next_due - time.time(), 0.5), IDLE_MAX)
+            time.sleep(idle)
+    finally:
+        outbox.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="outbox에 쌓인 카카오톡/텔레그램 메시지를 전송합니다.")
+    parser.add_argument("--db", default=OUTBOX_DB_PATH, help="outbox 파일 경로")
+    parser.add_argument("--once", action="store_true", help="보낼 때가 된 메시지만 보내고 종료")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 보낼 메시지 수")
+    parser.add_argument("--status", action="store_true", help="상태별 메시지 수와 최근 실패 출력")
+    parser.add_argument("--retry-failed", action="store_true", help="재시도를 멈춘 메시지를 다시 대기열에 넣음")
+    args = parser.parse_args()
+
+    if args.status or args.retry_failed:
+        outbox = Outbox(args.db)
+        try:
+            if args.retry_failed:
+                print(f"{outbox.retry_failed()}건을 다시 대기열에 넣었습니다.")
+            for status, count in sorted(outbox.counts().items()):
+                print(f"{status}: {count}")
+            for message_id, channel, attempts, error in outbox.failed():
+                print(f"  #{message_id} {CHANNEL_LABELS.get(channel, channel)} {attempts}회: {error}")
+        finally:
+            outbox.close()
+        return
+
+    try:
+        run_worker(args.db, once=args.once, concurrency=args.concurrency)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
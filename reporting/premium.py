@@ -0,0 +1,134 @@
+"""거래소별 김치 프리미엄 집계
+
+여러 거래소 시세를 병렬로 받아 하나의 표로 정규화한 뒤,
+거래소별·거래대금 가중 프리미엄을 NumPy 배열 연산 한 번으로 계산한다.
+리포트처럼 은행 시세도 함께 받는 곳은 venue_sources()를 fetch_sources에 같이 넣어
+조회를 한 번에 끝내고, 이미 받은 빗썸 시세는 ticker_quotes()로 다시 쓴다.
+대시보드도 스냅샷의 빗썸 시세를 다시 쓰고 나머지 거래소만 병렬 조회한다.
+"""
+from __future__ import annotations
+
+import argparse
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import profiling
+from crypto_venues import VENUES
+from reporting.sources import KIND_VENUE, Source
+
+QUOTE_COLUMNS = ['venue', 'asset', 'quote', 'price', 'volume']
+
+
+def fetch_venue_quotes(venues: Optional[Iterable[str]] = None, timeout: float = 10) -> List[dict]:
+    """거래소 시세를 병렬 조회 (실패한 거래소는 건너뜀)"""
+    names = list(venues) if venues is not None else list(VENUES)
+    if not names:
+        return []
+
+    def fetch(name: str) -> List[dict]:
+        try:
+            with profiling.section(name):
+                return VENUES[name](timeout=timeout)
+        except Exception as e:
+            print(f"{name} 시세 조회 오류: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, fetch, name) for name in names]
+        results = [future.result() for future in futures]
+    return [quote for quotes in results for quote in quotes]
+
+
+def venue_sources(venues: Optional[Iterable[str]] = None, timeout: float = 10) -> List[Source]:
+    """거래소 시세 조회를 fetch_sources에 함께 넣기 위한 소스 목록 (결과 키: 'venue:<이름>')"""
+    names = list(venues) if venues is not None else list(VENUES)
+    return [Source(f"venue:{name}", name, VENUES[name], KIND_VENUE, timeout=timeout) for name in names]
+
+
+def ticker_quotes(venue: str, tickers: Dict[str, Optional[dict]]) -> List[dict]:
+    """이미 받은 원화 시세 {자산: get_bithumb_usdt 등의 결과} → 프리미엄 계산용 행"""
+    return [
+        {'venue': venue, 'asset': asset, 'quote': 'KRW', 'price': float(ticker['price']), 'volume': float(ticker['volume'])}
+        for asset, ticker in tickers.items()
+        if ticker and ticker.get('volume') is not None
+    ]
+
+
+def compute_premiums(quotes: List[dict], usd_krw: float) -> Dict[str, object]:
+    """
+    김치 프리미엄 계산
+    - USDT 기준가: 1 USD
+    - BTC 기준가: USD 마켓 가격의 거래량 가중 평균
+    - 프리미엄(%) = (원화 가격 / (기준가 × USD/KRW) - 1) × 100
+    반환: {'table': 거래소별 DataFrame, 'weighted': {asset: 거래대금 가중 프리미엄}}
+    """
+    table = pd.DataFrame(quotes, columns=QUOTE_COLUMNS)
+    if table.empty or not usd_krw:
+        table['premium'] = pd.Series(dtype=float)
+        return {'table': table, 'weighted': {}}
+
+    assets, asset_idx = np.unique(table['asset'].to_numpy(), return_inverse=True)
+    price = table['price'].to_numpy(dtype=float)
+    volume = table['volume'].to_numpy(dtype=float)
+    is_krw = table['quote'].to_numpy() == 'KRW'
+    is_usd = ~is_krw
+
+    # 자산별 USD 기준가 (USD 마켓 거래량 가중 평균, USDT는 1)
+    usd_volume = np.bincount(asset_idx, weights=np.where(is_usd, volume, 0.0), minlength=len(assets))
+    usd_notional = np.bincount(asset_idx, weights=np.where(is_usd, price * volume, 0.0), minlength=len(assets))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        usd_ref = np.where(usd_volume > 0, usd_notional / usd_volume, np.nan)
+    usd_ref[assets == 'USDT'] = 1.0
+
+    with np.errstate(invalid='ignore'):
+        premium = np.where(is_krw, (price / (usd_ref[asset_idx] * usd_krw) - 1) * 100, np.nan)
+
+    # 거래대금(원) 가중 평균
+    valid = is_krw & ~np.isnan(premium)
+    krw_notional = np.where(valid, price * volume, 0.0)
+    weight_sum = np.bincount(asset_idx, weights=krw_notional, minlength=len(assets))
+    weighted_sum = np.bincount(asset_idx, weights=np.where(valid, premium, 0.0) * krw_notional, minlength=len(assets))
+
+    table['premium'] = premium
+    weighted = {
+        str(asset): float(weighted_sum[i] / weight_sum[i])
+        for i, asset in enumerate(assets)
+        if weight_sum[i] > 0
+    }
+    return {'table': table, 'weighted': weighted}
+
+
+def load_premiums(usd_krw: float, venues: Optional[Iterable[str]] = None, timeout: float = 10) -> Dict[str, object]:
+    """거래소 시세 조회 + 프리미엄 계산"""
+    return compute_premiums(fetch_venue_quotes(venues, timeout), usd_krw)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="거래소별 김치 프리미엄을 출력합니다.")
+    parser.add_argument("--usd-krw", type=float, help="기준 USD/KRW (생략하면 Investing.com 조회)")
+    parser.add_argument("--venue", action="append", choices=sorted(VENUES), help="조회할 거래소 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    usd_krw = args.usd_krw
+    if usd_krw is None:
+        from mybank import get_investing_exchange_rate
+
+        investing = get_investing_exchange_rate()
+        usd_krw = investing['USD_KRW'] if investing else None
+    if not usd_krw:
+        print("USD/KRW 기준 환율을 가져올 수 없습니다.")
+        return
+
+    result = load_premiums(usd_krw, args.venue)
+    print(f"USD/KRW: {usd_krw:,.2f}")
+    print(result['table'].to_string(index=False))
+    for asset, premium in result['weighted'].items():
+        print(f"{asset} 거래대금 가중 김프: {premium:+.2f}%")
+
+
+if __name__ == "__main__":
+    main()
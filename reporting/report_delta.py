@@ -0,0 +1,144 @@
+"""리포트 변동 감지
+
+마지막으로 보낸 리포트의 값(은행별 고시회차·환율, 기준 환율, 김프, 가상자산 가격)을 저장해 두고,
+이번 값과 비교해 임계값 이상 움직인 항목만 골라낸다.
+- 고시회차가 그대로인 은행은 값 비교 없이 변동 없음으로 처리
+- 임계값에 못 미친 항목은 저장값을 갱신하지 않으므로 작은 변동이 쌓이면 결국 보고됨
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+REPORT_STATE_PATH = os.getenv("DONDON_REPORT_STATE", "report_state.json")
+
+CURRENCY_LABELS = {'USD': 'USD', 'JPY': 'JPY(100엔)'}
+
+
+@dataclass
+class ChangeThresholds:
+    rate: float = 1.0        # 원, 은행 고시환율
+    reference: float = 1.0   # 원, Investing.com 기준 환율
+    premium: float = 0.3     # %p, 김치프리미엄
+    crypto_pct: float = 1.0  # %, 테더/비트 가격
+
+
+@dataclass(frozen=True)
+class Change:
+    key: str      # 상태 키 (예: 'bank:신한은행:USD')
+    line: str     # 변동 메시지 한 줄
+    value: object  # 저장할 새 값
+
+
+def report_state(ctx) -> Dict[str, object]:
+    """ReportContext → 비교용 평평한 상태 {키: 값}"""
+    state: Dict[str, object] = {}
+    for item in ctx.bank_data:
+        bank = item['은행']
+        state[f"round:{bank}"] = f"{item['조회일시']} {item['고시회차']}"
+        for currency, field in (('USD', 'USD_raw'), ('JPY', 'JPY_raw')):
+            if item.get(field):
+                state[f"bank:{bank}:{currency}"] = float(item[field])
+    if ctx.investing_data:
+        if ctx.investing_data.get('USD_KRW'):
+            state["reference:USD"] = float(ctx.investing_data['USD_KRW'])
+        if ctx.investing_data.get('JPY_KRW'):
+            state["reference:JPY"] = float(ctx.investing_data['JPY_KRW'])
+    if ctx.kimchi_premium is not None:
+        state["premium:USDT"] = ctx.kimchi_premium
+    if ctx.bithumb_data:
+        state["crypto:USDT"] = float(ctx.bithumb_data['price'])
+    if ctx.btc_data:
+        state["crypto:BTC"] = float(ctx.btc_data['price'])
+    return state
+
+
+def _round_label(value: Optional[str]) -> str:
+    return value.rsplit(' ', 1)[-1] if value else '-'
+
+
+def detect_changes(previous: Dict[str, object], current: Dict[str, object],
+                   thresholds: ChangeThresholds) -> List[Change]:
+    """임계값 이상 움직인 항목 (이전 값이 없으면 새 항목으로 보고)"""
+    changes: List[Change] = []
+    for key, value in current.items():
+        kind, _, rest = key.partition(':')
+        if kind == 'round':
+            continue
+        old = previous.get(key)
+
+        if kind == 'bank':
+            bank, currency = rest.rsplit(':', 1)
+            round_key = f"round:{bank}"
+            # 고시회차가 그대로면 값도 그대로
+            if old is not None and previous.get(round_key) == current.get(round_key):
+                continue
+            if old is not None and abs(value - old) < thresholds.rate:
+                continue
+            name = bank.split('은행')[0]
+            rounds = f" {_round_label(previous.get(round_key))}→{_round_label(current.get(round_key))}"
+            changes.append(Change(key, _format_move(f"{name} {CURRENCY_LABELS[currency]}", old, value) + rounds, value))
+        elif kind == 'reference':
+            if old is not None and abs(value - old) < thresholds.reference:
+                continue
+            changes.append(Change(key, _format_move(f"기준 {CURRENCY_LABELS[rest]}", old, value), value))
+        elif kind == 'premium':
+            if old is not None and abs(value - old) < thresholds.premium:
+                continue
+            if old is None:
+                line = f"김프 {value:+.2f}%"
+            else:
+                line = f"김프 {old:+.2f}% → {value:+.2f}% ({value - old:+.2f}%p)"
+            changes.append(Change(key, line, value))
+        elif kind == 'crypto':
+            if old and abs(value - old) / old * 100 < thresholds.crypto_pct:
+                continue
+            name = '테더' if rest == 'USDT' else '비트'
+            if old:
+                line = f"{name} {old:,.0f} → {value:,.0f} ({(value - old) / old * 100:+.2f}%)"
+            else:
+                line = f"{name} {value:,.0f}"
+            changes.append(Change(key, line, value))
+    return changes
+
+
+def _format_move(label: str, old: Optional[float], new: float) -> str:
+    if old is None:
+        return f"{label} {new:,.2f}"
+    return f"{label} {old:,.2f} → {new:,.2f} ({new - old:+.2f})"
+
+
+def apply_changes(previous: Dict[str, object], current: Dict[str, object],
+                  changes: List[Change]) -> Dict[str, object]:
+    """보고한 항목만 새 값으로 갱신 (고시회차는 현재 값으로)"""
+    state = dict(previous)
+    for change in changes:
+        state[change.key] = change.value
+    state.update({key: value for key, value in current.items() if key.startswith('round:')})
+    return state
+
+
+def render_delta_lines(now_str: str, changes: List[Change], footer: List[str]) -> List[str]:
+    lines = [f"[환율 변동] {now_str}", ""]
+    lines.extend(change.line for change in changes)
+    return lines + footer
+
+
+def load_report_state(path: str = REPORT_STATE_PATH) -> Dict[str, object]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[리포트 상태 로드 실패] {e}")
+        return {}
+
+
+def save_report_state(state: Dict[str, object], path: str = REPORT_STATE_PATH):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
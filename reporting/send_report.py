@@ -4,13 +4,32 @@ import argparse
 import asyncio
 import json
 import os
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
 
 import requests
 from telegram import Bot
 
-from reporting.exchange_fetcher import format_datetime, load_exchange_rates
+import profiling
+from crypto_venues import VENUES
+
+from reporting.exchange_fetcher import assemble_rates, fetch_sources, format_datetime
+from reporting.history import record_snapshot
+from reporting.outbox import enqueue_and_deliver
+from reporting.premium import compute_premiums, ticker_quotes, venue_sources
+from reporting.report_delta import (
+    REPORT_STATE_PATH,
+    ChangeThresholds,
+    apply_changes,
+    detect_changes,
+    load_report_state,
+    render_delta_lines,
+    report_state,
+    save_report_state,
+)
+from reporting.sources import KIND_BANK, get_sources
 
 
 KAKAO_MEMO_URL = "https://kapi.kakao.com/v2/api/talk/memo/default/send"
@@ -18,80 +37,150 @@ KAKAO_TOKEN_URL = "https://kauth.kakao.com/oauth/token"
 STREAMLIT_APP_URL = "https://dondon.streamlit.app/"
 
 
-def build_report_lines() -> List[str]:
-    bank_data, investing_data, bithumb_data, btc_data = load_exchange_rates()
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M")
+@dataclass(frozen=True)
+class ReportContext:
+    """한 번 조회한 시세 (구독자 수와 관계없이 주기마다 한 번만 만듦)"""
+    now_str: str
+    bank_data: Tuple[dict, ...]
+    investing_data: Optional[dict]
+    bithumb_data: Optional[dict]
+    btc_data: Optional[dict]
+    weighted_premium: Optional[float]  # 거래소 가중 USDT 김프
 
-    lines = [f"[실시간 환율] {now_str}"]
+    @property
+    def usd_base(self) -> Optional[float]:
+        return self.investing_data['USD_KRW'] if self.investing_data else None
 
-    usd_base = investing_data['USD_KRW'] if investing_data else None
-    jpy_base = investing_data['JPY_KRW'] if investing_data else None
+    @property
+    def kimchi_premium(self) -> Optional[float]:
+        if not self.bithumb_data or not self.usd_base:
+            return None
+        return ((self.bithumb_data['price'] - self.usd_base) / self.usd_base) * 100
 
-    if investing_data:
-        lines.append("")
-        lines.append(f"{investing_data['USD_KRW']:,.2f}")
-        lines.append(f"{investing_data['JPY_KRW']:,.2f}")
 
-    # Helper to find bank entries
-    def find_bank(bank_name: str):
-        for item in bank_data:
-            if item['은행'] == bank_name:
-                return item
-        return None
+@dataclass(frozen=True)
+class ReportView:
+    """리포트에 넣을 항목 (banks가 비어 있으면 등록된 모든 은행)"""
+    banks: Tuple[str, ...] = ()
+    currencies: Tuple[str, ...] = ('USD', 'JPY')
+    crypto: bool = True
 
-    lines.append("")
-    lines.append("[달러 환율]")
-    for bank in ["신한은행", "국민은행", "하나은행"]:
-        item = find_bank(bank)
-        if not item:
-            lines.append(f"{bank.split('은행')[0]}  -")
-            continue
-        diff_text = ""
-        if usd_base:
-            diff = usd_base - item['USD_raw']
-            diff_text = f" ({diff:+.2f})"
-        lines.append(
-            f"{bank.split('은행')[0]}  {item['USD_raw']:,.2f}{diff_text} {item['고시회차']}"
-        )
 
-    lines.append("")
-    lines.append("[엔화 환율]")
-    for bank in ["신한은행", "국민은행", "하나은행"]:
-        item = find_bank(bank)
-        if not item:
-            lines.append(f"{bank.split('은행')[0]}  -")
-            continue
-        diff_text = ""
-        if jpy_base:
-            diff = jpy_base - item['JPY_raw']
-            diff_text = f" ({diff:+.2f})"
-        lines.append(
-            f"{bank.split('은행')[0]} {item['JPY_raw']:,.2f}{diff_text} {item['고시회차']}"
-        )
+DEFAULT_VIEW = ReportView()
+CURRENCY_TITLES = {'USD': '달러', 'JPY': '엔화'}
 
-    lines.append("")
-    lines.append("[테더]")
-    if bithumb_data:
-        kimchi_text = ""
-        if usd_base:
-            kimchi = ((bithumb_data['price'] - usd_base) / usd_base) * 100
-            kimchi_text = f" (김프 {kimchi:+.2f}%)"
-        lines.append(f"{bithumb_data['price']:,.0f}{kimchi_text}")
-    else:
-        lines.append("-")
 
-    lines.append("")
-    lines.append("[비트]")
-    if btc_data:
-        lines.append(f"{btc_data['price']:,.0f}")
+def load_report_context() -> ReportContext:
+    # 은행·기준 시세와 거래소 시세를 한 번의 병렬 조회로 받음 (빗썸은 레지스트리 소스 결과를 그대로 사용)
+    sources = get_sources()
+    venues = venue_sources([name for name in VENUES if name != 'bithumb'])
+    results = fetch_sources(sources + venues)
+    bank_data, investing_data, bithumb_data, btc_data = assemble_rates(sources, results)
+    record_snapshot(bank_data, investing_data, bithumb_data, btc_data)
+
+    usd_base = investing_data['USD_KRW'] if investing_data else None
+    weighted = None
+    if usd_base and bithumb_data:
+        quotes = ticker_quotes('빗썸', {'USDT': results.get('bithumb_usdt'), 'BTC': results.get('bithumb_btc')})
+        quotes += [quote for venue in venues for quote in results.get(venue.key) or []]
+        weighted = compute_premiums(quotes, usd_base)['weighted'].get('USDT')
+    return ReportContext(
+        now_str=datetime.now().strftime("%Y-%m-%d %H:%M"),
+        bank_data=tuple(bank_data),
+        investing_data=investing_data,
+        bithumb_data=bithumb_data,
+        btc_data=btc_data,
+        weighted_premium=weighted,
+    )
+
+
+def _header_section(ctx: ReportContext) -> List[str]:
+    lines = [f"[실시간 환율] {ctx.now_str}"]
+    if ctx.investing_data:
+        lines.append("")
+        for key in ('USD_KRW', 'JPY_KRW'):
+            value = ctx.investing_data.get(key)
+            lines.append(f"{value:,.2f}" if value is not None else "-")
+    return lines
+
+
+def _bank_rate(item: dict, currency: str) -> Optional[float]:
+    if currency == 'USD':
+        return item['USD_raw']
+    if currency == 'JPY':
+        return item['JPY_raw']
+    return (item.get('rates') or {}).get(currency)
+
+
+def _currency_section(currency: str, banks: Tuple[str, ...]) -> Callable[[ReportContext], List[str]]:
+    title = CURRENCY_TITLES.get(currency, currency)
+    separator = "  " if currency == 'USD' else " "
+
+    def render(ctx: ReportContext) -> List[str]:
+        rows = {item['은행']: item for item in ctx.bank_data}
+        base = (ctx.investing_data.get('rates') or {}).get(currency) if ctx.investing_data else None
+        if currency == 'JPY' and ctx.investing_data:
+            base = ctx.investing_data['JPY_KRW']
+        elif currency == 'USD':
+            base = ctx.usd_base
+
+        lines = ["", f"[{title} 환율]"]
+        for bank in banks:
+            name = bank.split('은행')[0]
+            item = rows.get(bank)
+            rate = _bank_rate(item, currency) if item else None
+            if rate is None:
+                lines.append(f"{name}  -")
+                continue
+            diff_text = f" ({base - rate:+.2f})" if base else ""
+            lines.append(f"{name}{separator}{rate:,.2f}{diff_text} {item['고시회차']}")
+        return lines
+
+    return render
+
+
+def _crypto_section(ctx: ReportContext) -> List[str]:
+    lines = ["", "[테더]"]
+    if ctx.bithumb_data:
+        kimchi = ctx.kimchi_premium
+        kimchi_text = f" (김프 {kimchi:+.2f}%)" if kimchi is not None else ""
+        lines.append(f"{ctx.bithumb_data['price']:,.0f}{kimchi_text}")
+        if ctx.weighted_premium is not None:
+            lines.append(f"거래소 가중 김프 {ctx.weighted_premium:+.2f}%")
     else:
         lines.append("-")
 
     lines.append("")
-    lines.append(f"상세: {STREAMLIT_APP_URL}")
+    lines.append("[비트]")
+    lines.append(f"{ctx.btc_data['price']:,.0f}" if ctx.btc_data else "-")
     return lines
 
 
+def _footer_section(ctx: ReportContext) -> List[str]:
+    return ["", f"상세: {STREAMLIT_APP_URL}"]
+
+
+@lru_cache(maxsize=256)
+def compile_report(view: ReportView, registered_banks: Tuple[str, ...]) -> Tuple[Callable[[ReportContext], List[str]], ...]:
+    """보기 설정 → 섹션 렌더러 목록 (같은 설정은 한 번만 만듦)"""
+    banks = tuple(bank for bank in registered_banks if not view.banks or bank in view.banks)
+    sections = [_header_section]
+    sections.extend(_currency_section(currency, banks) for currency in view.currencies)
+    if view.crypto:
+        sections.append(_crypto_section)
+    sections.append(_footer_section)
+    return tuple(sections)
+
+
+def render_report_lines(view: ReportView, ctx: ReportContext) -> List[str]:
+    banks = tuple(source.label for source in get_sources(KIND_BANK))
+    return [line for section in compile_report(view, banks) for line in section(ctx)]
+
+
+def build_report_lines() -> List[str]:
+    return render_report_lines(DEFAULT_VIEW, load_report_context())
+
+
 def format_datetime_str(value: str | None) -> str:
     if not value or value == "-":
         return "-"
@@ -115,16 +204,19 @@ def refresh_access_token(refresh_token: str) -> str:
     return data["access_token"]
 
 
-def send_kakao_message(message: str, *, dry_run: bool = False):
+def send_kakao_message(message: str, *, dry_run: bool = False,
+                       access_token_env: str = "KAKAO_ACCESS_TOKEN",
+                       refresh_token_env: str = "KAKAO_REFRESH_TOKEN"):
+    """카카오톡 나에게 보내기 (구독자별 토큰은 환경 변수 이름으로 지정)"""
     if dry_run:
         print(message)
         return
 
-    access_token = os.getenv("KAKAO_ACCESS_TOKEN")
-    refresh_token = os.getenv("KAKAO_REFRESH_TOKEN")
+    access_token = os.getenv(access_token_env)
+    refresh_token = os.getenv(refresh_token_env)
     
     if not access_token:
-        raise RuntimeError("환경 변수 KAKAO_ACCESS_TOKEN이 필요합니다. Kakao OAuth로 발급한 사용자의 액세스 토큰을 설정하세요.")
+        raise RuntimeError(f"환경 변수 {access_token_env}이 필요합니다. Kakao OAuth로 발급한 사용자의 액세스 토큰을 설정하세요.")
 
     payload = {
         "object_type": "text",
@@ -165,7 +257,7 @@ def send_kakao_message(message: str, *, dry_run: bool = False):
                 timeout=10,
             )
             if response.status_code == 200:
-                print(f"[알림] Access token이 자동으로 갱신되었습니다. 다음 실행을 위해 환경 변수 KAKAO_ACCESS_TOKEN을 업데이트하세요: {new_access_token}")
+                print(f"[알림] Access token이 자동으로 갱신되었습니다. 다음 실행을 위해 환경 변수 {access_token_env}을 업데이트하세요: {new_access_token}")
         except Exception as e:
             raise RuntimeError(f"토큰 갱신 후 재시도 실패: {e}")
 
@@ -173,28 +265,26 @@ def send_kakao_message(message: str, *, dry_run: bool = False):
         raise RuntimeError(f"Kakao API 오류: {response.status_code} {response.text}")
 
 
-async def send_telegram_message_async(message: str, *, dry_run: bool = False):
-    """텔레그램 봇을 통해 메시지 전송 (비동기)"""
+async def send_telegram_message_async(message: str, *, dry_run: bool = False, chat_id: Optional[str] = None):
+    """텔레그램 봇을 통해 메시지 전송 (비동기, chat_id가 없으면 TELEGRAM_CHAT_ID)"""
     if dry_run:
         print("[텔레그램] " + message)
         return
 
     bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+    chat_id = chat_id or os.getenv("TELEGRAM_CHAT_ID")
     
     if not bot_token:
         raise RuntimeError("환경 변수 TELEGRAM_BOT_TOKEN이 필요합니다. BotFather에서 발급받은 봇 토큰을 설정하세요.")
     if not chat_id:
         raise RuntimeError("환경 변수 TELEGRAM_CHAT_ID가 필요합니다. 봇에게 메시지를 보낼 사용자의 chat_id를 설정하세요.")
 
-    # 텔레그램은 마크다운 형식 지원, 링크는 HTML 형식으로
-    message_with_link = f"{message}\n\n상세: {STREAMLIT_APP_URL}"
-    
+    # 상세 링크는 리포트 꼬리말(_footer_section)에 이미 들어 있음
     bot = Bot(token=bot_token)
     try:
         await bot.send_message(
             chat_id=int(chat_id),
-            text=message_with_link,
+            text=message,
             parse_mode="HTML",
             disable_web_page_preview=False,
         )
@@ -202,11 +292,56 @@ async def send_telegram_message_async(message: str, *, dry_run: bool = False):
         raise RuntimeError(f"텔레그램 API 오류: {e}")
 
 
-def send_telegram_message(message: str, *, dry_run: bool = False):
+def send_telegram_message(message: str, *, dry_run: bool = False, chat_id: Optional[str] = None):
     """텔레그램 봇을 통해 메시지 전송 (동기 래퍼)"""
     if os.name == 'nt':  # Windows
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    asyncio.run(send_telegram_message_async(message, dry_run=dry_run))
+    asyncio.run(send_telegram_message_async(message, dry_run=dry_run, chat_id=chat_id))
+
+
+def run_report(args: argparse.Namespace):
+    with profiling.section('리포트 작성'):
+        ctx = load_report_context()
+        lines = render_report_lines(DEFAULT_VIEW, ctx)
+
+    # 변동 기준 전송: 마지막으로 보낸 값과 비교
+    state = None
+    if args.mode != 'full':
+        thresholds = ChangeThresholds(args.rate_threshold, args.reference_threshold, args.premium_threshold, args.crypto_threshold)
+        previous = load_report_state(args.state)
+        current = report_state(ctx)
+        changes = detect_changes(previous, current, thresholds)
+        if not changes:
+            print("[리포트] 임계값 이상 변동이 없어 전송하지 않습니다.")
+            return
+        if args.mode == 'delta' and previous:
+            lines = render_delta_lines(ctx.now_str, changes, _footer_section(ctx))
+            state = apply_changes(previous, current, changes)
+        else:
+            state = current
+    message = "\n".join(lines)
+
+    # 옵션이 없으면 기본적으로 카카오톡으로 전송 (하위 호환성)
+    if not args.kakao and not args.telegram and not args.all:
+        args.kakao = True
+
+    channels = [
+        channel for channel, enabled in (('kakao', args.all or args.kakao), ('telegram', args.all or args.telegram))
+        if enabled
+    ]
+
+    if args.dry_run:
+        if 'kakao' in channels:
+            send_kakao_message(message, dry_run=True)
+        if 'telegram' in channels:
+            send_telegram_message(message, dry_run=True)
+        return
+
+    # outbox에 넣고 바로 전송, 실패한 채널은 outbox 워커가 다시 크롤링하지 않고 재시도
+    with profiling.section('전송'):
+        enqueue_and_deliver(channels, {'message': message}, scope='report')
+    if state is not None:
+        save_report_state(state, args.state)
 
 
 def main():
@@ -215,28 +350,19 @@ def main():
     parser.add_argument("--kakao", action="store_true", help="카카오톡으로 전송합니다.")
     parser.add_argument("--telegram", action="store_true", help="텔레그램으로 전송합니다.")
     parser.add_argument("--all", action="store_true", help="카카오톡과 텔레그램 모두로 전송합니다.")
+    parser.add_argument("--mode", choices=('full', 'changed', 'delta'), default='full',
+                        help="full: 항상 전체 전송, changed: 변동이 있을 때만 전체 전송, delta: 변동 항목만 전송")
+    parser.add_argument("--rate-threshold", type=float, default=ChangeThresholds.rate, help="은행 고시환율 변동 기준 (원)")
+    parser.add_argument("--reference-threshold", type=float, default=ChangeThresholds.reference,
+                        help="Investing.com 기준 환율 변동 기준 (원)")
+    parser.add_argument("--premium-threshold", type=float, default=ChangeThresholds.premium, help="김프 변동 기준 (%%p)")
+    parser.add_argument("--crypto-threshold", type=float, default=ChangeThresholds.crypto_pct, help="테더/비트 가격 변동 기준 (%%)")
+    parser.add_argument("--state", default=REPORT_STATE_PATH, help="마지막으로 보낸 리포트 상태 파일")
+    profiling.add_profile_arguments(parser)
     args = parser.parse_args()
 
-    lines = build_report_lines()
-    message = "\n".join(lines)
-
-    # 옵션이 없으면 기본적으로 카카오톡으로 전송 (하위 호환성)
-    if not args.kakao and not args.telegram and not args.all:
-        args.kakao = True
-
-    if args.all or args.kakao:
-        try:
-            send_kakao_message(message, dry_run=args.dry_run)
-        except Exception as e:
-            print(f"[카카오톡 전송 실패] {e}")
-
-    if args.all or args.telegram:
-        try:
-            send_telegram_message(message, dry_run=args.dry_run)
-        except Exception as e:
-            print(f"[텔레그램 전송 실패] {e}")
+    profiling.run_cli('send_report', lambda: run_report(args), args)
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,576 @@
+"""업스트림 시뮬레이터
+
+실제 은행·거래소 사이트에 부하를 주지 않고 파이프라인을 시험하기 위한 로컬 대역 서버.
+신한은행 JSON, 국민·하나·우리·농협·IBK HTML, Investing.com 환율표, 빗썸·업비트·바이낸스 시세를
+실제 응답과 같은 구조로 돌려준다.
+
+- 호스트별 장애 설정: 지연 분포(로그정규, 중앙값·sigma), 5xx 비율, 응답 없음(타임아웃) 비율,
+  깨진 응답(잘린 본문·점검 페이지) 비율
+- 고시회차는 round_interval초마다 올라가고 은행 환율도 회차마다 움직임
+- fetcher는 DONDON_UPSTREAM 환경 변수(또는 http_client.set_upstream)로 이 서버를 바라봄
+  (원래 호스트가 경로 앞에 붙음: http://127.0.0.1:8900/bank.shinhan.com/serviceEndpoint/httpDigital)
+- GET /_sim/stats: 호스트별 요청·장애 주입 횟수, GET·POST /_sim/faults: 장애 설정 조회·변경
+
+장애 설정 파일 (JSON, 호스트별 값은 default를 덮어씀):
+{"default": {"latency_ms": 80, "latency_sigma": 0.6, "error_rate": 0.02},
+ "hosts": {"www.kebhana.com": {"timeout_rate": 0.1}, "kr.investing.com": {"malformed_rate": 0.2}}}
+
+--bench는 시뮬레이터를 띄운 채 load_exchange_rates()를 반복 호출해 처리량과 꼬리 지연을 잰다.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import http_client
+import rate_limiter
+from reporting.exchange_fetcher import assemble_rates, fetch_sources
+from reporting.hedging import get_hedge_state
+from reporting.sources import KIND_BANK, get_sources
+
+DEFAULT_PORT = 8900
+ROUND_INTERVAL = 60.0  # 초, 고시회차가 바뀌는 간격
+UNLIMITED = (1e6, 10 ** 6)  # 부하 측정 시 속도 제한 해제용 (초당 요청 수, 버스트)
+
+EXTRA_CURRENCIES = ('EUR', 'GBP', 'CNY', 'HKD', 'CAD', 'AUD', 'CHF', 'SGD', 'THB', 'NZD')
+INVESTING_IDS = {12: 'USD', 2: 'JPY', 28: 'KRW'}
+
+BANK_HOSTS = {
+    'obank.kbstar.com': 'kbstar',
+    'www.kebhana.com': 'hana',
+    'spot.wooribank.com': 'woori',
+    'banking.nonghyup.com': 'nonghyup',
+    'www.ibk.co.kr': 'ibk',
+}
+# 은행별 조회일자 요청 인자
+DATE_FIELDS = ('조회일자', 'inqStrDt', 'BAS_DT_601', 'InqDate', 'srchDt')
+
+MAINTENANCE_PAGE = "<html><body><h1>서비스 점검 중입니다</h1></body></html>".encode('utf-8')
+
+
+# --- 응답 fixture (reporting.soak도 사용) ---
+
+def fixture_rates(step: int) -> Dict[str, float]:
+    """통화별 매매기준율 (JPY는 100엔당, step마다 조금씩 움직임)"""
+    usd = 1400 + (step % 50) * 0.1
+    rates = {'USD': usd, 'JPY': 930 + (step % 30) * 0.1}
+    rates.update({code: 100 + i * 50 + (step % 7) * 0.1 for i, code in enumerate(EXTRA_CURRENCIES)})
+    return rates
+
+
+def bank_page(bank: str, round_num: int, rates: Dict[str, float], announced: datetime) -> str:
+    """국민·하나·우리·농협·IBK 응답과 같은 구조의 HTML"""
+    if bank == 'kbstar':
+        rows = "".join(f"<tr><td>{code}</td><td>-</td><td>{rate:,.2f}</td></tr>" for code, rate in rates.items())
+        filler = "<table><tbody><tr><td>-</td></tr></tbody></table>" * 3
+        return (f"<html><body>{filler}<table><tbody><tr><td>{announced:%Y.%m.%d %H:%M:%S} ({round_num}회차)</td></tr>"
+                f"</tbody></table><table><tbody>{rows}</tbody></table></body></html>")
+    if bank == 'hana':
+        names = {'USD': '미국 USD', 'JPY': '일본 JPY (100)'}
+        rows = "".join(
+            f"<tr><td>{names.get(code, code)}</td>" + "<td>0</td>" * 7 + f"<td>{rate:,.2f}</td></tr>"
+            for code, rate in rates.items()
+        )
+        return f"<div>{announced:%Y년%m월%d일 %H시%M분%S초} ({round_num}회차)</div><table>{rows}</table>"
+    rate_index = 6 if bank == 'woori' else 1
+    rows = "".join(
+        "<tr>" + "".join(
+            f"<td>{code if i == 0 else (f'{rate:,.2f}' if i == rate_index else '0')}</td>" for i in range(8)
+        ) + "</tr>"
+        for code, rate in rates.items()
+    )
+    return f"<p>고시일시 {announced:%Y.%m.%d %H:%M:%S} {round_num}회</p><table>{rows}</table>"
+
+
+def shinhan_payload(round_num: int, rates: Dict[str, float], announced: datetime) -> dict:
+    """신한은행 환율 API 응답"""
+    return {
+        'dataHeader': {'resultCode': '200'},
+        'dataBody': {
+            '고시일자': announced.strftime('%Y%m%d'),
+            '고시시간': announced.strftime('%H%M%S'),
+            '고시회차': round_num,
+            'R_RIBF3730_1': [{'통화CODE': code, '매매기준환율': round(rate, 2)} for code, rate in rates.items()],
+        },
+    }
+
+
+def investing_page(step: int) -> str:
+    """Investing.com 환율표 (exchange_rates_1)"""
+    krw = {'USD': 1402 + (step % 50) * 0.1, 'JPY': 9.32 + (step % 30) * 0.001, 'KRW': 1.0}
+    header = "<th></th>" + "".join(f"<th>{code}</th>" for code in INVESTING_IDS.values())
+    rows = "".join(
+        f'<tr id="pair_{rid}"><td>{base}</td>' + "".join(
+            f'<td id="last_{rid}_{cid}">{krw[base] / krw[quote]:,.4f}</td>' for cid, quote in INVESTING_IDS.items()
+        ) + "</tr>"
+        for rid, base in INVESTING_IDS.items()
+    )
+    return f'<table id="exchange_rates_1"><tr>{header}</tr>{rows}</table>'
+
+
+def crypto_prices(step: int) -> Dict[str, float]:
+    """원화 가격 (USDT, BTC)"""
+    drift = 1 + (step % 20) * 0.001
+    return {'USDT': 1450.0 * drift, 'BTC': 1.4e8 * drift}
+
+
+def _bithumb_ticker(price: float) -> dict:
+    prev = price / 1.001
+    return {
+        'closing_price': f"{price:.2f}", 'prev_closing_price': f"{prev:.2f}",
+        'max_price': f"{price * 1.002:.2f}", 'min_price': f"{prev * 0.998:.2f}",
+        'units_traded_24H': "123456.789",
+    }
+
+
+# --- 장애 설정 ---
+
+@dataclass
+class FaultProfile:
+    latency_ms: float = 30.0     # 지연 중앙값
+    latency_sigma: float = 0.5   # 로그정규 sigma (클수록 꼬리가 김)
+    error_rate: float = 0.0      # 500/503 응답 비율
+    timeout_rate: float = 0.0    # hang_seconds 동안 응답하지 않는 비율
+    malformed_rate: float = 0.0  # 잘린 본문·점검 페이지 비율
+    hang_seconds: float = 15.0
+
+
+FAULT_FIELDS = tuple(f.name for f in fields(FaultProfile))
+
+
+def parse_fault_profile(item: dict, base: Optional[FaultProfile] = None) -> FaultProfile:
+    unknown = set(item) - set(FAULT_FIELDS)
+    if unknown:
+        raise ValueError(f"알 수 없는 장애 설정: {', '.join(sorted(unknown))}")
+    return replace(base or FaultProfile(), **{key: float(value) for key, value in item.items()})
+
+
+def _decode_request(content_type: str, query: str, body: bytes) -> dict:
+    params = {key: values[0] for key, values in parse_qs(query).items()}
+    if not body:
+        return params
+    text = body.decode('utf-8', errors='replace')
+    if 'json' in content_type:
+        try:
+            params.update(json.loads(text).get('dataBody') or {})
+        except (ValueError, AttributeError):
+            pass
+    else:
+        params.update({key: values[0] for key, values in parse_qs(text).items()})
+    return params
+
+
+class UpstreamSimulator:
+    def __init__(self, default: Optional[FaultProfile] = None, hosts: Optional[Dict[str, FaultProfile]] = None,
+                 round_interval: float = ROUND_INTERVAL, seed: Optional[int] = None):
+        self.default = default or FaultProfile()
+        self.hosts = dict(hosts or {})
+        self.round_interval = round_interval
+        self.started = time.time()
+        self.stats: Dict[str, Counter] = defaultdict(Counter)
+        self.in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # 설정
+
+    def profile(self, host: str) -> FaultProfile:
+        return self.hosts.get(host, self.default)
+
+    def set_faults(self, config: dict):
+        """{"default": {...}, "hosts": {호스트: {...}}} (지정한 값만 바뀜)"""
+        with self._lock:
+            if config.get('default'):
+                self.default = parse_fault_profile(config['default'], self.default)
+            for host, item in (config.get('hosts') or {}).items():
+                self.hosts[host] = parse_fault_profile(item, self.hosts.get(host, self.default))
+
+    def faults(self) -> dict:
+        return {'default': asdict(self.default), 'hosts': {host: asdict(p) for host, p in self.hosts.items()}}
+
+    def wait_idle(self, timeout: float, settle: float = 0.2) -> bool:
+        """처리 중인 요청이 settle초 동안 없을 때까지 대기 (남은 헤지 요청 정리용)"""
+        deadline = time.monotonic() + timeout
+        idle_since = None
+        while time.monotonic() < deadline:
+            if self.in_flight:
+                idle_since = None
+            elif idle_since is None:
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since >= settle:
+                return True
+            time.sleep(0.02)
+        return False
+
+    def stats_payload(self) -> dict:
+        with self._lock:
+            return {host: dict(counter) for host, counter in sorted(self.stats.items())}
+
+    # 시세
+
+    def market(self, now: float) -> Tuple[int, float]:
+        """(고시회차, 회차 시작 시각)"""
+        round_index = int((now - self.started) // self.round_interval)
+        return round_index + 1, self.started + round_index * self.round_interval
+
+    def page(self, host: str, path: str, params: dict) -> Optional[Tuple[str, bytes]]:
+        """원래 호스트·경로에 맞는 응답 (content type, 본문), 없는 경로면 None"""
+        now = time.time()
+        round_num, round_started = self.market(now)
+        announced = datetime.fromtimestamp(round_started)
+        requested = next((params[key] for key in DATE_FIELDS if params.get(key)), None)
+        if requested:
+            try:
+                day = datetime.strptime(str(requested).replace('-', ''), '%Y%m%d')
+                announced = announced.replace(year=day.year, month=day.month, day=day.day)
+            except ValueError:
+                pass
+        rates = fixture_rates(round_num)
+        tick = int(now - self.started)
+
+        if host == 'bank.shinhan.com':
+            return 'application/json', json.dumps(shinhan_payload(round_num, rates, announced), ensure_ascii=False).encode('utf-8')
+        if host in BANK_HOSTS:
+            return 'text/html; charset=utf-8', bank_page(BANK_HOSTS[host], round_num, rates, announced).encode('utf-8')
+        if host == 'kr.investing.com':
+            return 'text/html; charset=utf-8', investing_page(tick).encode('utf-8')
+
+        prices = crypto_prices(tick)
+        if host == 'api.bithumb.com' and path.startswith('/public/ticker/'):
+            symbol = path.rsplit('/', 1)[-1].split('_')[0]
+            if symbol == 'ALL':
+                data = {asset: _bithumb_ticker(price) for asset, price in prices.items()}
+                data['date'] = str(int(now * 1000))
+            elif symbol in prices:
+                data = _bithumb_ticker(prices[symbol])
+            else:
+                return 'application/json', json.dumps({'status': '5500', 'message': 'Invalid Parameter'}).encode()
+            return 'application/json', json.dumps({'status': '0000', 'data': data}).encode()
+        if host == 'api.upbit.com' and path == '/v1/ticker':
+            markets = (params.get('markets') or 'KRW-USDT,KRW-BTC').split(',')
+            items = [
+                {'market': market, 'trade_price': prices[market.split('-')[1]], 'acc_trade_volume_24h': 98765.4321}
+                for market in markets if market.split('-')[-1] in prices
+            ]
+            return 'application/json', json.dumps(items).encode()
+        if host == 'api.binance.com' and path == '/api/v3/ticker/24hr':
+            price = prices['BTC'] / prices['USDT']
+            return 'application/json', json.dumps(
+                {'symbol': params.get('symbol', 'BTCUSDT'), 'lastPrice': f"{price:.2f}", 'volume': "12345.678"}
+            ).encode()
+        return None
+
+    # 요청 처리
+
+    def _draw(self, profile: FaultProfile) -> Tuple[Optional[str], float, float]:
+        """(주입할 장애, 지연 초, 장애 종류 선택용 난수)"""
+        with self._lock:
+            r = self._random.random()
+            coin = self._random.random()
+            delay = 0.0
+            if profile.latency_ms > 0:
+                delay = self._random.lognormvariate(math.log(profile.latency_ms), profile.latency_sigma) / 1000
+        if r < profile.timeout_rate:
+            return 'timeout', profile.hang_seconds, coin
+        r -= profile.timeout_rate
+        if r < profile.error_rate:
+            return 'error', delay, coin
+        r -= profile.error_rate
+        if r < profile.malformed_rate:
+            return 'malformed', delay, coin
+        return None, delay, coin
+
+    def handle(self, method: str, target: str, content_type: str, body: bytes) -> Tuple[int, str, bytes]:
+        """시뮬레이터 경로(/<호스트>/<경로>?<쿼리>) → (상태 코드, content type, 본문)"""
+        parts = urlsplit(target)
+        if parts.path.startswith('/_sim/'):
+            return self._control(method, parts.path, body)
+
+        host, _, path = parts.path.lstrip('/').partition('/')
+        host = host.split(':')[0]
+        path = '/' + path
+        fault, delay, coin = self._draw(self.profile(host))
+        with self._lock:
+            counter = self.stats[host]
+            counter['requests'] += 1
+            if fault:
+                counter[fault] += 1
+            self.in_flight += 1
+        try:
+            return self._reply(host, path, parts.query, content_type, body, fault, delay, coin)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _reply(self, host, path, query, content_type, body, fault, delay, coin) -> Tuple[int, str, bytes]:
+        time.sleep(delay)
+
+        if fault == 'timeout':
+            return 504, 'text/plain', b'gateway timeout'
+        if fault == 'error':
+            return (500 if coin < 0.5 else 503), 'text/html', b'<html><body>Internal Server Error</body></html>'
+
+        page = self.page(host, path, _decode_request(content_type, query, body))
+        if page is None:
+            return 404, 'text/plain', b'not found'
+        page_type, payload = page
+        if fault == 'malformed':
+            # 절반만 온 응답 또는 200으로 오는 점검 페이지
+            payload = payload[:len(payload) // 2] if coin < 0.5 else MAINTENANCE_PAGE
+        return 200, page_type, payload
+
+    def _control(self, method: str, path: str, body: bytes) -> Tuple[int, str, bytes]:
+        if path == '/_sim/stats':
+            return 200, 'application/json', json.dumps(self.stats_payload()).encode()
+        if path == '/_sim/faults':
+            if method == 'POST':
+                try:
+                    self.set_faults(json.loads(body or b'{}'))
+                except (ValueError, TypeError) as e:
+                    return 400, 'application/json', json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+            return 200, 'application/json', json.dumps(self.faults()).encode()
+        return 404, 'text/plain', b'not found'
+
+    # 서버
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """백그라운드 스레드에서 서버 시작 → 기본 주소 (port=0이면 빈 포트)"""
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.simulator = self
+        threading.Thread(target=self._server.serve_forever, name='upstream-simulator', daemon=True).start()
+        return f"http://{host}:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # requests.Session 연결 재사용
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def do_POST(self):
+        self._respond('POST')
+
+    def _respond(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, content_type, payload = self.server.simulator.handle(
+            method, self.path, self.headers.get('Content-Type', ''), body)
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 타임아웃으로 먼저 끊음
+
+    def log_message(self, format, *args):
+        pass
+
+
+# --- 부하 측정 ---
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def latency_summary(values: List[float]) -> Dict[str, Optional[float]]:
+    """초 단위 값 → 밀리초 p50/p90/p99/max"""
+    summary = {f"p{int(q * 100)}": percentile(values, q) for q in (0.5, 0.9, 0.99)}
+    summary['max'] = max(values) if values else None
+    return {key: round(value * 1000, 1) if value is not None else None for key, value in summary.items()}
+
+
+class _LineCounter:
+    """fetcher가 출력하는 오류 로그를 버리고 줄 수만 셈"""
+
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, text):
+        self.lines += text.count('\n')
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+@contextlib.contextmanager
+def pointed_at(simulator: UpstreamSimulator, *, rate_limits: bool = False, drain: float = 0.0):
+    """
+    시뮬레이터를 띄우고 http_client를 그쪽으로 돌림 (속도 제한 버킷은 임시 디렉터리로 분리)
+    끝나면 남은 헤지 요청이 실제 사이트로 가지 않도록 최대 drain초 동안 요청이 없을 때까지 기다린 뒤
+    이전 upstream과 속도 제한 설정을 되돌림
+    """
+    base_url = simulator.start()
+    saved = (rate_limiter.RATE_LIMIT_DIR, rate_limiter.HOST_LIMITS, rate_limiter.DEFAULT_LIMIT)
+    previous_upstream = http_client.UPSTREAM
+    with tempfile.TemporaryDirectory() as tmp:
+        http_client.set_upstream(base_url)
+        rate_limiter.RATE_LIMIT_DIR = tmp
+        if not rate_limits:
+            rate_limiter.HOST_LIMITS, rate_limiter.DEFAULT_LIMIT = {}, UNLIMITED
+        try:
+            yield base_url
+        finally:
+            if drain:
+                simulator.wait_idle(drain)
+            rate_limiter.RATE_LIMIT_DIR, rate_limiter.HOST_LIMITS, rate_limiter.DEFAULT_LIMIT = saved
+            http_client.set_upstream(previous_upstream)
+            simulator.stop()
+
+
+def run_bench(simulator: UpstreamSimulator, loads: int, concurrency: int = 4, *,
+              rate_limits: bool = False, source_timeout: Optional[float] = None) -> dict:
+    """load_exchange_rates()와 같은 조회를 loads번(동시 concurrency개) 실행해 처리량·지연·누락 집계"""
+    sources = get_sources()
+    if source_timeout is not None:
+        sources = [replace(source, timeout=source_timeout) for source in sources]
+    bank_count = sum(1 for source in sources if source.kind == KIND_BANK)
+    hedges_before = {source.key: get_hedge_state(source.key).hedges for source in sources if source.hedge}
+
+    lock = threading.Lock()
+    host_latencies: Dict[str, List[float]] = defaultdict(list)
+    missing = Counter()
+
+    def on_request(host, throttle, network):
+        with lock:
+            host_latencies[host].append(network)
+
+    def one_load(_):
+        started = time.perf_counter()
+        with http_client.observe(on_request):
+            bank_data, investing_data, bithumb_data, btc_data = assemble_rates(sources, fetch_sources(sources))
+        elapsed = time.perf_counter() - started
+        gaps = {'은행': bank_count - len(bank_data), 'Investing.com': investing_data is None,
+                '빗썸 USDT': bithumb_data is None, '빗썸 BTC': btc_data is None}
+        with lock:
+            for name, count in gaps.items():
+                missing[name] += int(count)
+        return elapsed, not any(gaps.values())
+
+    log = _LineCounter()
+    # 결과를 버린 헤지 요청이 끝날 때까지 서버를 유지
+    drain = max(source.timeout for source in sources) + 1
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        with pointed_at(simulator, rate_limits=rate_limits, drain=drain):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(one_load, range(loads)))
+            elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in results]
+    requests = sum(len(values) for values in host_latencies.values())
+    return {
+        'loads': loads,
+        'concurrency': concurrency,
+        'elapsed': round(elapsed, 3),
+        'loads_per_sec': round(loads / elapsed, 2) if elapsed else None,
+        'requests_per_sec': round(requests / elapsed, 1) if elapsed else None,
+        'latency_ms': latency_summary(latencies),
+        'complete_ratio': round(sum(1 for _, complete in results if complete) / loads, 3) if loads else None,
+        'missing': dict(missing),
+        'hosts': {
+            host: dict(requests=len(values), **latency_summary(values))
+            for host, values in sorted(host_latencies.items())
+        },
+        'hedges': {key: get_hedge_state(key).hedges - before for key, before in hedges_before.items()},
+        'injected': simulator.stats_payload(),
+        'error_log_lines': log.lines,
+    }
+
+
+def print_bench(result: dict):
+    latency = result['latency_ms']
+    print(f"조회 {result['loads']}회 (동시 {result['concurrency']}) {result['elapsed']:.1f}초 → "
+          f"{result['loads_per_sec']}회/초, 요청 {result['requests_per_sec']}건/초")
+    print(f"조회 지연(ms): p50 {latency['p50']}  p90 {latency['p90']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"전 소스 완전 조회 비율 {result['complete_ratio']:.1%}, 누락 {result['missing']}")
+    print(f"\n{'호스트':<24}{'요청':>7}{'p50':>9}{'p99':>9}{'주입 장애':>12}")
+    for host, item in result['hosts'].items():
+        injected = result['injected'].get(host, {})
+        faults = sum(count for key, count in injected.items() if key != 'requests')
+        print(f"{host:<24}{item['requests']:>7}{item['p50']:>9}{item['p99']:>9}{faults:>12}")
+    if any(result['hedges'].values()):
+        print(f"헤지 요청: {result['hedges']}")
+
+
+def load_fault_config(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="은행·거래소 응답을 흉내 내는 로컬 시뮬레이터를 띄웁니다.")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="포트")
+    parser.add_argument("--faults", metavar="PATH", help="호스트별 장애 설정 파일 (JSON)")
+    parser.add_argument("--latency-ms", type=float, default=FaultProfile.latency_ms, help="지연 중앙값 (ms)")
+    parser.add_argument("--latency-sigma", type=float, default=FaultProfile.latency_sigma, help="지연 로그정규 sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="5xx 응답 비율")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="응답하지 않는 요청 비율")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="깨진 응답 비율")
+    parser.add_argument("--hang-seconds", type=float, default=FaultProfile.hang_seconds, help="응답하지 않을 때 붙잡는 시간")
+    parser.add_argument("--round-interval", type=float, default=ROUND_INTERVAL, help="고시회차가 바뀌는 간격 (초)")
+    parser.add_argument("--seed", type=int, help="난수 시드 (재현용)")
+    parser.add_argument("--bench", type=int, metavar="LOADS", help="서버를 띄우는 대신 전체 조회를 LOADS번 실행해 측정")
+    parser.add_argument("--concurrency", type=int, default=4, help="--bench 동시 조회 수")
+    parser.add_argument("--source-timeout", type=float, help="--bench 소스별 요청 타임아웃 (초, 기본: 레지스트리 값)")
+    parser.add_argument("--rate-limits", action="store_true", help="--bench에서도 호스트별 속도 제한 적용")
+    parser.add_argument("--json", metavar="PATH", help="--bench 결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    default = FaultProfile(
+        latency_ms=args.latency_ms, latency_sigma=args.latency_sigma, error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate, malformed_rate=args.malformed_rate, hang_seconds=args.hang_seconds,
+    )
+    simulator = UpstreamSimulator(default, round_interval=args.round_interval, seed=args.seed)
+    if args.faults:
+        simulator.set_faults(load_fault_config(args.faults))
+
+    if args.bench:
+        result = run_bench(simulator, args.bench, args.concurrency,
+                           rate_limits=args.rate_limits, source_timeout=args.source_timeout)
+        print_bench(result)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+        return
+
+    base_url = simulator.start(args.host, args.port)
+    print(f"시뮬레이터 시작: {base_url} (fetcher 연결: DONDON_UPSTREAM={base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        simulator.stop()
+        print(json.dumps(simulator.stats_payload(), ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""대시보드용 불변 스냅샷
+
+load_exchange_rates 결과를 한 번만 가공해 숫자 배열과 표시용 DataFrame, 셀 스타일을
+미리 만들어 둔다. 스냅샷은 만든 뒤 수정하지 않으며, SnapshotHolder가 새 스냅샷으로
+참조만 바꿔 끼우므로 여러 세션이 복사 없이 같은 객체를 공유할 수 있다.
+Styler는 렌더링할 때 상태가 바뀌므로 공유하지 않고 styled()로 그릴 때마다 만든다.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DISPLAY_COLUMNS = ['은행', 'USD', 'JPY(100엔)', '조회일시', '고시회차']
+LOWER_STYLE = 'color: #0066cc; font-weight: bold'   # 마이너스 (은행이 낮음, 유리) - 파란색
+HIGHER_STYLE = 'color: #cc0000; font-weight: bold'  # 플러스 (은행이 높음, 불리) - 빨간색
+
+
+def _frozen_array(values) -> np.ndarray:
+    array = np.asarray(values, dtype=float)
+    array.flags.writeable = False
+    return array
+
+
+def _frozen_mapping(value: Optional[dict]) -> Optional[Mapping]:
+    return MappingProxyType(dict(value)) if value else None
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    version: int
+    taken_at: float
+    banks: Tuple[str, ...]
+    usd: np.ndarray            # 은행별 USD 매매기준율 (banks 순서)
+    jpy: np.ndarray            # 은행별 JPY(100엔) 매매기준율
+    usd_diff: np.ndarray       # Investing.com - 은행 (Investing 없으면 0)
+    jpy_diff: np.ndarray
+    investing: Optional[Mapping]
+    bithumb: Optional[Mapping]
+    btc: Optional[Mapping]
+    has_previous: bool
+    bank_rows: Tuple[Mapping, ...]  # 은행별 원본 행 (통화별 'rates' 포함)
+    display_df: pd.DataFrame   # 표시용 (수정 금지)
+    cell_styles: pd.DataFrame  # display_df와 같은 모양의 셀별 CSS (수정 금지)
+
+    @property
+    def kimchi_premium(self) -> Optional[float]:
+        usd_krw = self.investing.get('USD_KRW') if self.investing else None
+        if not usd_krw or not self.bithumb:
+            return None
+        return ((self.bithumb['price'] - usd_krw) / usd_krw) * 100
+
+    def styled(self):
+        """display_df에 색상을 입힌 새 Styler (세션마다 따로 만들어 동시 렌더링 충돌 방지)"""
+        return self.display_df.style.apply(lambda _: self.cell_styles, axis=None)
+
+
+def _format_with_diff(values: np.ndarray, diffs: np.ndarray, with_diff: bool) -> list:
+    if with_diff:
+        return [f"{value:,.2f} ({diff:+.2f})" for value, diff in zip(values, diffs)]
+    return [f"{value:,.2f}" for value in values]
+
+
+def build_snapshot(bank_data: list, investing_data: Optional[dict],
+                   bithumb_data: Optional[dict], btc_data: Optional[dict],
+                   version: int = 0) -> RateSnapshot:
+    """load_exchange_rates 결과로 스냅샷 생성 (표시용 표·스타일까지 미리 계산)"""
+    # 조회일시 순으로 오름차순 정렬
+    rows = sorted(bank_data, key=lambda item: item['조회일시'])
+    usd = np.array([item['USD_raw'] for item in rows], dtype=float)
+    jpy = np.array([item['JPY_raw'] for item in rows], dtype=float)
+
+    # Investing.com 환율과의 차이 (Investing.com - 은행, 기준 환율이 없는 통화는 0)
+    usd_base = investing_data.get('USD_KRW') if investing_data else None
+    jpy_base = investing_data.get('JPY_KRW') if investing_data else None
+    usd_diff = usd_base - usd if usd_base is not None else np.zeros_like(usd)
+    jpy_diff = jpy_base - jpy if jpy_base is not None else np.zeros_like(jpy)
+
+    display_df = pd.DataFrame({
+        '은행': [item['은행'] for item in rows],
+        'USD': _format_with_diff(usd, usd_diff, usd_base is not None),
+        'JPY(100엔)': _format_with_diff(jpy, jpy_diff, jpy_base is not None),
+        '조회일시': [item['조회일시'] for item in rows],
+        '고시회차': [item['고시회차'] for item in rows],
+    }, columns=DISPLAY_COLUMNS)
+
+    cell_styles = pd.DataFrame('', index=display_df.index, columns=DISPLAY_COLUMNS)
+    for column, diffs in (('USD', usd_diff), ('JPY(100엔)', jpy_diff)):
+        cell_styles[column] = np.where(diffs < 0, LOWER_STYLE, np.where(diffs > 0, HIGHER_STYLE, ''))
+
+    return RateSnapshot(
+        version=version,
+        taken_at=time.time(),
+        banks=tuple(item['은행'] for item in rows),
+        usd=_frozen_array(usd),
+        jpy=_frozen_array(jpy),
+        usd_diff=_frozen_array(usd_diff),
+        jpy_diff=_frozen_array(jpy_diff),
+        investing=_frozen_mapping(investing_data),
+        bithumb=_frozen_mapping(bithumb_data),
+        btc=_frozen_mapping(btc_data),
+        has_previous=any(item.get('is_previous') for item in rows),
+        bank_rows=tuple(_frozen_mapping(item) for item in rows),
+        display_df=display_df,
+        cell_styles=cell_styles,
+    )
+
+
+class SnapshotHolder:
+    """
+    최신 스냅샷 보관
+    - ttl이 지나거나 invalidate()되면 한 스레드만 새로 조회하고, 그동안 다른 세션은 기존 스냅샷을 그대로 사용
+    - 새 스냅샷은 참조 교체로 원자적으로 반영
+    """
+
+    def __init__(self, loader: Callable[[], tuple], ttl: float = 60, min_refresh: float = 15):
+        self.loader = loader
+        self.ttl = ttl
+        self.min_refresh = min_refresh  # 초, 수동 새로고침을 받아들이는 최소 스냅샷 나이
+        self.current: Optional[RateSnapshot] = None
+        self.version = 0
+        self.stale = False
+        self._refresh_lock = threading.Lock()
+
+    def get(self) -> RateSnapshot:
+        snapshot = self.current
+        if snapshot is not None and not self.stale and time.time() - snapshot.taken_at < self.ttl:
+            return snapshot
+
+        # 첫 조회면 완료될 때까지 기다리고, 이미 스냅샷이 있으면 갱신 중인 동안 기존 것을 사용
+        if not self._refresh_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            if self.current is not snapshot and self.current is not None:
+                return self.current
+            # 조회 도중 invalidate()되면 다음 get()에서 한 번 더 갱신
+            self.stale = False
+            try:
+                result = self.loader()
+            except Exception:
+                self.stale = True
+                raise
+            self.version += 1
+            self.current = build_snapshot(*result, version=self.version)
+            return self.current
+        finally:
+            self._refresh_lock.release()
+
+    def invalidate(self) -> bool:
+        """
+        다음 get()에서 새로 조회하도록 만료 처리 (갱신이 끝날 때까지 다른 세션은 기존 스냅샷 사용)
+        스냅샷이 min_refresh초보다 새것이면 무시하고 False (여러 사용자가 눌러도 조회는 한 번)
+        """
+        snapshot = self.current
+        if snapshot is not None and time.time() - snapshot.taken_at < self.min_refresh:
+            return False
+        self.stale = True
+        return True
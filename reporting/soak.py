@@ -0,0 +1,137 @@
+"""상주 수집기 soak 점검
+
+네트워크 대신 시뮬레이터의 fixture 페이지를 실제 파서로 읽어 수천 번 폴링하고,
+워밍업 이후 RSS가 평탄한지 확인한다. 수집기 모듈은 시뮬레이터에 의존하지 않도록
+fixture는 이 모듈에서만 (실행할 때) 가져온다.
+
+python -m reporting.soak 3000 --max-growth-mb 5
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import List
+
+from reporting.alerts import AlertRules
+from reporting.collector import Collector, current_rss_mb
+from reporting.sources import KIND_BANK, KIND_CRYPTO, KIND_REFERENCE, Source, get_sources
+
+SOAK_ANNOUNCED = datetime(2026, 10, 19, 9)
+# 알림 엔진 상태(스프레드 윈도·회차 기록)도 함께 점검하도록 규칙을 모두 켬 (전송은 하지 않음)
+SOAK_RULES = AlertRules(premium_above=5.0, spread_zscore_above=3.0, rate_change_above=5.0)
+
+
+def soak_sources(cycle_ref: list) -> List[Source]:
+    """등록된 소스의 fetcher를 fixture 파서로 바꾼 목록 (cycle_ref[0]이 현재 폴링 번호)"""
+    from mybank import (
+        parse_hanabank_exchange_rate,
+        parse_ibk_exchange_rate,
+        parse_investing_rate_table,
+        parse_kbstar_exchange_rate,
+        parse_nonghyup_exchange_rate,
+        parse_woori_exchange_rate,
+    )
+    # fixture 페이지는 시뮬레이터에 있으므로 soak를 돌릴 때만 가져옴
+    from reporting.simulator import bank_page, fixture_rates, investing_page
+
+    parsers = {
+        'kbstar': parse_kbstar_exchange_rate,
+        'hana': parse_hanabank_exchange_rate,
+        'woori': parse_woori_exchange_rate,
+        'nonghyup': parse_nonghyup_exchange_rate,
+        'ibk': parse_ibk_exchange_rate,
+    }
+
+    def bank_fetcher(key):
+        def fetch(target_date=None, timeout=None):
+            cycle = cycle_ref[0]
+            if key in parsers:
+                return parsers[key](bank_page(key, cycle // 10 + 1, fixture_rates(cycle), SOAK_ANNOUNCED))
+            rates = fixture_rates(cycle)
+            return {'bank': key, 'date': '20261019', 'time': '090000', 'round': str(cycle // 10 + 1),
+                    'USD': rates['USD'], 'JPY': rates['JPY'], 'rates': rates}
+        return fetch
+
+    def investing_fetcher(timeout=None):
+        pairs = parse_investing_rate_table(investing_page(cycle_ref[0]))
+        return {'source': 'Investing.com', 'date': '20261019', 'time': '090000',
+                'USD_KRW': pairs.get('USD/KRW'), 'JPY_KRW': pairs.get('JPY/KRW'), 'pairs': pairs}
+
+    def ticker_fetcher(base):
+        def fetch(timeout=None):
+            price = base * (1 + (cycle_ref[0] % 20) * 0.001)
+            return {'price': price, 'change_rate': 0.1, 'change_amount': 1.0, 'prev_price': base,
+                    'high_price': price, 'low_price': base, 'volume': 1000.0}
+        return fetch
+
+    sources = []
+    for source in get_sources():
+        if source.kind == KIND_BANK:
+            fetcher = bank_fetcher(source.key)
+        elif source.kind == KIND_REFERENCE:
+            fetcher = investing_fetcher
+        elif source.kind == KIND_CRYPTO:
+            fetcher = ticker_fetcher(1450.0 if source.key == 'bithumb_usdt' else 1.4e8)
+        else:
+            continue
+        sources.append(replace(source, fetcher=fetcher, poll_interval=0))
+    return sources
+
+
+def run_soak(cycles: int, max_growth_mb: float = 5.0, trace: bool = False) -> bool:
+    """fixture로 cycles번 폴링하며 RSS 추이를 확인 (워밍업 이후 증가량이 max_growth_mb 이하면 통과)"""
+    cycle_ref = [0]
+    with tempfile.TemporaryDirectory() as tmp:
+        collector = Collector(
+            soak_sources(cycle_ref), os.path.join(tmp, 'soak.db'),
+            rules=SOAK_RULES, alert_state_path=os.path.join(tmp, 'alert_state.json'),
+        )
+        if trace:
+            collector.start_tracing()
+        warmup = max(1, cycles // 5)
+        step = max(1, cycles // 20)
+        baseline = None
+        peak = 0.0
+        started = time.perf_counter()
+        try:
+            for cycle in range(cycles):
+                cycle_ref[0] = cycle
+                # 영업일 오전으로 고정한 가상 시각 (1분 간격)
+                collector.poll_once(SOAK_ANNOUNCED.timestamp() + cycle * 60)
+                if (cycle + 1) % step == 0:
+                    gc.collect()
+                    rss = current_rss_mb() or 0.0
+                    if cycle + 1 >= warmup:
+                        baseline = rss if baseline is None else baseline
+                        peak = max(peak, rss)
+                    print(f"폴링 {cycle + 1:>6}회  RSS {rss:7.1f}MB")
+            if trace:
+                print(collector.memory_report())
+        finally:
+            collector.close()
+
+    growth = peak - (baseline or peak)
+    elapsed = time.perf_counter() - started
+    passed = growth <= max_growth_mb
+    print(f"\n{cycles}회 폴링 {elapsed:.1f}초, 워밍업 이후 RSS 증가 {growth:+.1f}MB "
+          f"(허용 {max_growth_mb:.1f}MB) → {'통과' if passed else '실패'}")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fixture로 수집기를 반복 폴링해 RSS가 평탄한지 확인합니다.")
+    parser.add_argument("cycles", type=int, nargs="?", default=3000, help="폴링 횟수")
+    parser.add_argument("--max-growth-mb", type=float, default=5.0, help="워밍업 이후 허용 RSS 증가량")
+    parser.add_argument("--tracemalloc", action="store_true", help="끝난 뒤 할당 증가 상위 항목 출력")
+    args = parser.parse_args()
+    sys.exit(0 if run_soak(args.cycles, args.max_growth_mb, args.tracemalloc) else 1)
+
+
+if __name__ == "__main__":
+    main()
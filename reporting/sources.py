@@ -0,0 +1,79 @@
+"""시세 소스 레지스트리
+
+각 소스는 fetcher와 함께 지원 인자·타임아웃·폴링 주기·우선순위를 선언한다.
+새 은행을 추가할 때는 fetcher를 만들고 register_source만 호출하면 되며,
+load_exchange_rates와 리포트는 레지스트리를 그대로 순회한다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bithumb_usdt import get_bithumb_btc, get_bithumb_usdt
+from mybank import (
+    get_hanabank_exchange_rate,
+    get_ibk_exchange_rate,
+    get_investing_exchange_rate,
+    get_kbstar_exchange_rate,
+    get_nonghyup_exchange_rate,
+    get_shinhan_exchange_rate,
+    get_woori_exchange_rate,
+)
+
+KIND_BANK = 'bank'            # 은행 고시 환율 (USD/JPY, 고시회차)
+KIND_REFERENCE = 'reference'  # 기준 시세 (Investing.com)
+KIND_CRYPTO = 'crypto'        # 가상자산 시세 (빗썸)
+KIND_VENUE = 'venue'          # 거래소별 시세 목록 (김프 집계용, 레지스트리에 등록하지 않음)
+
+
+@dataclass(frozen=True)
+class Source:
+    key: str
+    label: str
+    fetcher: Callable[..., Optional[dict]]
+    kind: str
+    params: Tuple[str, ...] = ('timeout',)  # fetcher가 받는 인자 ('target_date', 'timeout')
+    timeout: float = 10
+    poll_interval: int = 60                  # 초
+    priority: int = 100                      # 작을수록 먼저 조회·표시
+    hedge: bool = False                      # p95 초과 시 중복 요청 (reporting.hedging)
+
+    @property
+    def supports_target_date(self) -> bool:
+        return 'target_date' in self.params
+
+
+_REGISTRY: Dict[str, Source] = {}
+
+
+def register_source(source: Source) -> Source:
+    """소스 등록 (같은 key면 교체)"""
+    _REGISTRY[source.key] = source
+    return source
+
+
+def unregister_source(key: str):
+    _REGISTRY.pop(key, None)
+
+
+def get_source(key: str) -> Optional[Source]:
+    return _REGISTRY.get(key)
+
+
+def get_sources(kind: Optional[str] = None) -> List[Source]:
+    """우선순위 순으로 정렬된 소스 목록"""
+    sources = [s for s in _REGISTRY.values() if kind is None or s.kind == kind]
+    return sorted(sources, key=lambda s: (s.priority, s.key))
+
+
+BANK_PARAMS = ('target_date', 'timeout')
+
+register_source(Source('shinhan', '신한은행', get_shinhan_exchange_rate, KIND_BANK, BANK_PARAMS, priority=10, hedge=True))
+register_source(Source('kbstar', '국민은행', get_kbstar_exchange_rate, KIND_BANK, BANK_PARAMS, priority=20, hedge=True))
+register_source(Source('hana', '하나은행', get_hanabank_exchange_rate, KIND_BANK, BANK_PARAMS, priority=30, hedge=True))
+register_source(Source('woori', '우리은행', get_woori_exchange_rate, KIND_BANK, BANK_PARAMS, priority=40))
+register_source(Source('nonghyup', 'NH농협은행', get_nonghyup_exchange_rate, KIND_BANK, BANK_PARAMS, priority=50))
+register_source(Source('ibk', 'IBK기업은행', get_ibk_exchange_rate, KIND_BANK, BANK_PARAMS, priority=60))
+register_source(Source('investing', 'Investing.com', get_investing_exchange_rate, KIND_REFERENCE, priority=0))
+register_source(Source('bithumb_usdt', '빗썸 USDT', get_bithumb_usdt, KIND_CRYPTO, timeout=10, poll_interval=10, priority=0))
+register_source(Source('bithumb_btc', '빗썸 BTC', get_bithumb_btc, KIND_CRYPTO, timeout=10, poll_interval=10, priority=1))
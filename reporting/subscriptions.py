@@ -0,0 +1,144 @@
+"""구독자별 리포트
+
+구독자마다 은행·통화·김프 조건을 고르고, 주기마다 시세는 한 번만 조회해
+모든 구독자의 메시지를 한꺼번에 만든다.
+- 보기 설정이 같은 구독자는 같은 메시지를 공유 (렌더링 한 번)
+- 섹션 렌더러는 보기 설정별로 캐시 (send_report.compile_report)
+- 전송은 outbox에 한 번에 넣고 정해진 동시성으로 보냄
+
+구독 파일 (JSON 목록, 토큰은 파일에 넣지 않고 환경 변수 이름만 적음):
+[
+  {"id": "alice", "channel": "telegram", "chat_id": "123456789",
+   "banks": ["신한은행", "하나은행"], "currencies": ["USD"], "crypto": true, "premium_above": 2.0},
+  {"id": "bob", "channel": "kakao", "access_token_env": "KAKAO_ACCESS_TOKEN_BOB"}
+]
+premium_above를 지정하면 김치프리미엄이 그 값(%)을 넘을 때만 보냄
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from reporting.outbox import DEFAULT_CONCURRENCY, OUTBOX_DB_PATH, enqueue_batch_and_deliver, idempotency_key
+from reporting.send_report import (
+    DEFAULT_VIEW,
+    ReportContext,
+    ReportView,
+    load_report_context,
+    render_report_lines,
+)
+
+SUBSCRIPTIONS_PATH = os.getenv("DONDON_SUBSCRIPTIONS", "subscriptions.json")
+CHANNELS = ('kakao', 'telegram')
+
+
+@dataclass(frozen=True)
+class Subscription:
+    id: str
+    channel: str
+    view: ReportView = DEFAULT_VIEW
+    chat_id: Optional[str] = None            # 텔레그램
+    access_token_env: Optional[str] = None   # 카카오톡 (환경 변수 이름)
+    refresh_token_env: Optional[str] = None
+    premium_above: Optional[float] = None
+
+    def payload(self, message: str) -> dict:
+        """outbox에 저장할 전송 인자"""
+        payload = {'message': message}
+        if self.channel == 'telegram' and self.chat_id:
+            payload['chat_id'] = self.chat_id
+        if self.channel == 'kakao':
+            if self.access_token_env:
+                payload['access_token_env'] = self.access_token_env
+            if self.refresh_token_env:
+                payload['refresh_token_env'] = self.refresh_token_env
+        return payload
+
+    def wants(self, ctx: ReportContext) -> bool:
+        if self.premium_above is None:
+            return True
+        premium = ctx.kimchi_premium
+        return premium is not None and premium > self.premium_above
+
+
+def parse_subscription(item: dict) -> Subscription:
+    channel = item.get('channel')
+    if channel not in CHANNELS:
+        raise ValueError(f"구독 {item.get('id')}: 알 수 없는 채널 {channel}")
+    view = ReportView(
+        banks=tuple(item.get('banks') or ()),
+        currencies=tuple(item.get('currencies') or DEFAULT_VIEW.currencies),
+        crypto=bool(item.get('crypto', True)),
+    )
+    premium_above = item.get('premium_above')
+    return Subscription(
+        id=str(item['id']),
+        channel=channel,
+        view=view,
+        chat_id=str(item['chat_id']) if item.get('chat_id') is not None else None,
+        access_token_env=item.get('access_token_env'),
+        refresh_token_env=item.get('refresh_token_env'),
+        premium_above=float(premium_above) if premium_above is not None else None,
+    )
+
+
+def load_subscriptions(path: str = SUBSCRIPTIONS_PATH) -> List[Subscription]:
+    with open(path, encoding="utf-8") as f:
+        return [parse_subscription(item) for item in json.load(f)]
+
+
+def render_for_subscribers(subscriptions: List[Subscription], ctx: ReportContext
+                           ) -> Tuple[List[Tuple[Subscription, str]], int]:
+    """
+    구독자별 메시지 → ([(구독, 메시지)], 실제 렌더링 횟수)
+    보기 설정이 같으면 한 번만 렌더링하고 같은 문자열을 공유
+    """
+    rendered: Dict[ReportView, str] = {}
+    messages = []
+    for subscription in subscriptions:
+        if not subscription.wants(ctx):
+            continue
+        message = rendered.get(subscription.view)
+        if message is None:
+            message = rendered[subscription.view] = "\n".join(render_report_lines(subscription.view, ctx))
+        messages.append((subscription, message))
+    return messages, len(rendered)
+
+
+def send_to_subscribers(subscriptions: List[Subscription], *, dry_run: bool = False,
+                        concurrency: int = DEFAULT_CONCURRENCY, outbox_path: str = OUTBOX_DB_PATH,
+                        ctx: Optional[ReportContext] = None):
+    """시세를 한 번 조회해 모든 구독자에게 전송"""
+    ctx = ctx or load_report_context()
+    messages, renders = render_for_subscribers(subscriptions, ctx)
+    print(f"구독자 {len(subscriptions)}명 중 {len(messages)}명 대상, 렌더링 {renders}회")
+
+    if dry_run:
+        for subscription, message in messages:
+            print(f"\n--- {subscription.id} ({subscription.channel}) ---\n{message}")
+        return
+
+    items = [
+        (subscription.channel, subscription.payload(message),
+         idempotency_key(f"sub:{subscription.id}", subscription.channel, message))
+        for subscription, message in messages
+    ]
+    queued, sent, failed = enqueue_batch_and_deliver(items, concurrency, outbox_path)
+    print(f"대기열 추가 {queued}건, 전송 {sent}건, 실패 {failed}건 (실패분은 outbox 워커가 재시도)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구독자별 환율 리포트를 전송합니다.")
+    parser.add_argument("--subscriptions", default=SUBSCRIPTIONS_PATH, help="구독 파일 경로 (JSON)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 보낼 메시지 수")
+    parser.add_argument("--dry-run", action="store_true", help="메시지를 전송하지 않고 출력만 합니다.")
+    args = parser.parse_args()
+
+    send_to_subscribers(load_subscriptions(args.subscriptions), dry_run=args.dry_run, concurrency=args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from reporting.alerts import MIN_ZSCORE_SAMPLES, AlertEngine, AlertRules
+
+INVESTING = {'USD_KRW': 1400.0, 'JPY_KRW': 910.0}
+
+
+def _usdt(premium):
+    return {'price': 1400.0 * (1 + premium / 100)}
+
+
+def _keys(alerts):
+    return [alert.key for alert in alerts]
+
+
+def test_premium_crossing_fires_once_while_condition_holds():
+    engine = AlertEngine(AlertRules(premium_above=3.0, cooldown_seconds=0))
+    assert _keys(engine.evaluate([], INVESTING, _usdt(1.0), now=0)) == []
+    assert _keys(engine.evaluate([], INVESTING, _usdt(4.0), now=10)) == ['premium_above']
+    # 조건이 유지되는 동안은 중복 알림 없음
+    assert engine.evaluate([], INVESTING, _usdt(5.0), now=20) == []
+    assert engine.evaluate([], INVESTING, _usdt(4.5), now=30) == []
+
+
+def test_cooldown_suppresses_rearm_until_it_expires():
+    engine = AlertEngine(AlertRules(premium_above=3.0, cooldown_seconds=100))
+    assert _keys(engine.evaluate([], INVESTING, _usdt(4.0), now=0)) == ['premium_above']
+    assert engine.evaluate([], INVESTING, _usdt(1.0), now=10) == []   # 해제
+    assert engine.evaluate([], INVESTING, _usdt(4.0), now=20) == []   # 쿨다운 중 재발생
+    # 쿨다운으로 막힌 알림은 활성으로 치지 않으므로, 쿨다운이 끝난 뒤 조건이 유지되면 전송
+    assert 'premium_above' not in engine.active
+    assert _keys(engine.evaluate([], INVESTING, _usdt(4.0), now=120)) == ['premium_above']
+
+
+def test_spread_zscore_fires_only_after_warmup():
+    engine = AlertEngine(AlertRules(spread_zscore_above=3.0, cooldown_seconds=0))
+
+    def bank(usd):
+        return [{'은행': '신한은행', 'USD_raw': usd, 'JPY_raw': 900.0, '고시회차': '1'}]
+
+    # 표본이 MIN_ZSCORE_SAMPLES개 모이기 전에는 큰 이탈도 무시
+    for i in range(MIN_ZSCORE_SAMPLES - 1):
+        assert engine.evaluate(bank(1390.0 + (i % 2)), INVESTING, None, now=i) == []
+    assert engine.evaluate(bank(1300.0), INVESTING, None, now=100) == []
+    for i in range(MIN_ZSCORE_SAMPLES):
+        engine.evaluate(bank(1390.0 + (i % 2)), INVESTING, None, now=200 + i)
+    assert _keys(engine.evaluate(bank(1300.0), INVESTING, None, now=300)) == ['spread:신한은행']
+
+
+def test_round_change_alerts_per_round():
+    engine = AlertEngine(AlertRules(rate_change_above=5.0, cooldown_seconds=0))
+    first = [{'은행': '하나은행', 'USD_raw': 1390.0, 'JPY_raw': 900.0, '고시회차': '10'}]
+    same_round = [{'은행': '하나은행', 'USD_raw': 1390.0, 'JPY_raw': 900.0, '고시회차': '10'}]
+    next_round = [{'은행': '하나은행', 'USD_raw': 1400.0, 'JPY_raw': 901.0, '고시회차': '11'}]
+    assert engine.evaluate(first, INVESTING, None, now=0) == []
+    assert engine.evaluate(same_round, INVESTING, None, now=1) == []
+    assert _keys(engine.evaluate(next_round, INVESTING, None, now=2)) == ['round:하나은행:USD:11']
+
+
+def test_state_round_trip_keeps_dedup():
+    engine = AlertEngine(AlertRules(premium_above=3.0))
+    engine.evaluate([], INVESTING, _usdt(4.0), now=0)
+    restored = AlertEngine(AlertRules(premium_above=3.0))
+    restored.load_state(engine.to_state())
+    assert restored.evaluate([], INVESTING, _usdt(4.0), now=10) == []
@@ -0,0 +1,74 @@
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import pytest
+
+from reporting.api_server import POOL_SIZE, serve
+from reporting.history import HistoryStore, snapshot_payload
+
+
+@pytest.fixture
+def server(tmp_path):
+    db_path = str(tmp_path / 'history.db')
+    now = int(time.time())
+    store = HistoryStore(db_path)
+    store.record([('Investing.com', 'USD', 1380.0), ('빗썸', 'USDT', 1400.0)], ts=now - 120)
+    store.record([('Investing.com', 'USD', 1381.0), ('빗썸', 'USDT', 1402.0)], ts=now - 60)
+    store.save_snapshot(snapshot_payload([], {'USD_KRW': 1381.0}, None, None, ts=now - 60))
+    store.close()
+
+    server = serve('127.0.0.1', 0, db_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.RequestHandlerClass.cache.close()
+
+
+def _get(server, path):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize('query', [
+    'format=xml', 'start=abc', 'start=200&end=100', 'derived=yes',
+])
+def test_export_rejects_bad_params_before_streaming(server, query):
+    status, body = _get(server, f'/api/export?{query}')
+    assert status == 400
+    assert 'error' in json.loads(body)
+
+
+def test_export_streams_rows(server):
+    status, body = _get(server, f"/api/export?format=jsonl&source={quote('빗썸')}")
+    assert status == 200
+    rows = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+    assert [row['value'] for row in rows] == [1400.0, 1402.0]
+
+
+def test_export_empty_range_sends_header_only(server):
+    status, body = _get(server, '/api/export?format=csv&start=0&end=1')
+    assert status == 200
+    assert body.decode('utf-8') == 'ts,source,metric,value\n'
+
+
+def test_concurrent_requests_reuse_pooled_connections(server):
+    cache = server.RequestHandlerClass.cache
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        statuses = list(executor.map(
+            lambda i: _get(server, f'/api/history?source=Investing.com&metric=USD&max_points={10 + i}')[0],
+            range(64),
+        ))
+    assert statuses == [200] * 64
+    assert 0 < len(cache.pool._idle) <= POOL_SIZE
+    assert _get(server, '/api/snapshot')[0] == 200
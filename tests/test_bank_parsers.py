@@ -0,0 +1,50 @@
+"""은행 응답 파서 (저장해 둔 HTML fixture)"""
+import pytest
+
+from conftest import read_fixture
+from mybank import (
+    parse_hanabank_exchange_rate,
+    parse_ibk_exchange_rate,
+    parse_kbstar_exchange_rate,
+    parse_nonghyup_exchange_rate,
+    parse_woori_exchange_rate,
+)
+
+CASES = [
+    # (fixture, 파서, 은행, 고시일자, 고시시간, 회차, USD, JPY, 통화 목록)
+    ('kbstar.html', parse_kbstar_exchange_rate, '국민은행', '20261019', '090512', '123',
+     1401.50, 931.27, {'USD', 'JPY', 'EUR', 'CNY'}),
+    ('hana.html', parse_hanabank_exchange_rate, '하나은행', '20261019', '090512', '731',
+     1401.50, 931.27, {'USD', 'JPY', 'EUR'}),
+    ('woori.html', parse_woori_exchange_rate, '우리은행', '20261019', '090512', '45',
+     1401.60, 931.30, {'USD', 'JPY', 'EUR'}),
+    ('nonghyup.html', parse_nonghyup_exchange_rate, 'NH농협은행', '20261019', '090500', '27',
+     1401.40, 931.10, {'USD', 'JPY', 'EUR'}),
+    ('ibk.html', parse_ibk_exchange_rate, 'IBK기업은행', '20261019', '090512', '12',
+     1401.70, 931.40, {'USD', 'JPY', 'GBP'}),
+]
+
+
+@pytest.mark.parametrize(
+    'fixture, parser, bank, date, time, round_num, usd, jpy, currencies', CASES,
+    ids=[case[0] for case in CASES],
+)
+def test_parse_fixture(fixture, parser, bank, date, time, round_num, usd, jpy, currencies):
+    result = parser(read_fixture(fixture))
+
+    assert result['bank'] == bank
+    assert (result['date'], result['time'], result['round']) == (date, time, round_num)
+    assert result['USD'] == pytest.approx(usd)
+    assert result['JPY'] == pytest.approx(jpy)
+    # 합계·안내 문구 같은 통화가 아닌 행은 rates에 들어가지 않음
+    assert set(result['rates']) == currencies
+    assert result['rates']['USD'] == pytest.approx(usd)
+
+
+@pytest.mark.parametrize('parser', [case[1] for case in CASES], ids=[case[0] for case in CASES])
+def test_parse_empty_page(parser):
+    result = parser("<html><body><p>서비스 점검 중입니다</p></body></html>")
+
+    assert result['USD'] is None
+    assert result['JPY'] is None
+    assert result['rates'] == {}
@@ -0,0 +1,20 @@
+"""영업일 달력"""
+from datetime import date
+
+from reporting import business_calendar
+from reporting.business_calendar import is_business_day, previous_business_day
+
+
+def test_seollal_2027():
+    # 2027 설날은 한국 시간 기준 2/7(일): 2/6~8 연휴, 2/9(화) 대체공휴일
+    assert is_business_day(date(2027, 2, 5))
+    assert not any(is_business_day(date(2027, 2, day)) for day in (6, 7, 8, 9))
+    assert previous_business_day(date(2027, 2, 9)) == date(2027, 2, 5)
+
+
+def test_missing_year_warns_once(capsys):
+    business_calendar.reload_holiday_table()
+    assert is_business_day(date(2099, 1, 2))
+    assert is_business_day(date(2099, 1, 5))
+    out = capsys.readouterr().out
+    assert out.count('2099년') == 1
@@ -0,0 +1,94 @@
+from dataclasses import replace
+from datetime import datetime
+
+from reporting import collector as collector_module
+from reporting.alerts import AlertRules
+from reporting.collector import Collector
+from reporting.sources import get_sources
+
+MONDAY = datetime(2026, 10, 19, 9).timestamp()
+
+PAIRS = {'USD/KRW': 1400.0, 'JPY/KRW': 9.1}
+
+
+def _sources(prices, rounds=None):
+    """Investing.com·빗썸 USDT(·신한), 네트워크 대신 고정 값/목록을 돌려주는 fetcher로 교체"""
+    def investing(timeout=None):
+        return {'source': 'Investing.com', 'date': '20261019', 'time': '090000',
+                'USD_KRW': PAIRS['USD/KRW'], 'JPY_KRW': PAIRS['JPY/KRW'], 'pairs': PAIRS}
+
+    def usdt(timeout=None):
+        price = prices.pop(0)
+        return {'price': price, 'change_rate': 0.0, 'change_amount': 0.0, 'volume': 1000.0}
+
+    def shinhan(target_date=None, timeout=None):
+        return {'bank': '신한은행', 'date': '20261019', 'time': '090000', 'round': rounds.pop(0),
+                'USD': 1395.0, 'JPY': 905.0, 'rates': {'USD': 1395.0, 'JPY': 905.0}}
+
+    fetchers = {'investing': investing, 'bithumb_usdt': usdt}
+    if rounds is not None:
+        fetchers['shinhan'] = shinhan
+    return [replace(source, fetcher=fetchers[source.key], poll_interval=0)
+            for source in get_sources() if source.key in fetchers]
+
+
+def test_premium_crossing_during_poll_sends_alert(tmp_path, capsys):
+    collector = Collector(
+        _sources([1410.0, 1470.0, 1480.0]), str(tmp_path / 'history.db'),
+        rules=AlertRules(premium_above=3.0), kakao=True, dry_run=True,
+        alert_state_path=str(tmp_path / 'alert_state.json'),
+    )
+    try:
+        collector.poll_once(1_000)              # 김프 +0.7%
+        assert "[환율 알림]" not in capsys.readouterr().out
+        collector.poll_once(1_010)              # +5.0% → 알림
+        out = capsys.readouterr().out
+        assert "[환율 알림]" in out and "김치프리미엄 +5.00%" in out
+        collector.poll_once(1_020)              # 조건 유지 → 중복 없음
+        assert "[환율 알림]" not in capsys.readouterr().out
+    finally:
+        collector.close()
+
+
+def test_collector_without_rules_does_not_evaluate(tmp_path):
+    collector = Collector(_sources([1470.0]), str(tmp_path / 'history.db'))
+    try:
+        assert collector.engine is None
+        assert collector.poll_once(1_000) == 2
+    finally:
+        collector.close()
+
+
+def test_unchanged_bank_round_is_not_recorded_again(tmp_path):
+    collector = Collector(_sources([1410.0, 1411.0, 1412.0], rounds=['1', '1', '2']), str(tmp_path / 'history.db'))
+    try:
+        for i in range(3):
+            collector.poll_once(MONDAY + i * 10)
+        count = dict(collector.store.conn.execute(
+            "SELECT source, COUNT(*) FROM samples WHERE metric = 'USD' GROUP BY source"
+        ).fetchall())
+        # 빗썸은 폴링마다 기록하지만, 신한은 회차 1·2만 기록 (같은 회차를 다시 쓰지 않음)
+        assert count['신한은행'] == 2
+        assert count['Investing.com'] == 3
+        # 스냅샷은 전체 최신 값
+        payload = collector.store.latest_snapshot()[1]
+        assert [item['은행'] for item in payload['banks']] == ['신한은행']
+    finally:
+        collector.close()
+
+
+def test_alerts_go_through_the_outbox(tmp_path, monkeypatch):
+    sent = []
+    monkeypatch.setattr(collector_module, 'enqueue_and_deliver',
+                        lambda channels, payload, scope: sent.append((channels, scope, payload['message'])))
+    collector = Collector(
+        _sources([1470.0]), str(tmp_path / 'history.db'),
+        rules=AlertRules(premium_above=3.0), telegram=True,
+        alert_state_path=str(tmp_path / 'alert_state.json'),
+    )
+    try:
+        collector.poll_once(MONDAY)
+    finally:
+        collector.close()
+    (channels, scope, message), = sent
+    assert channels == ['telegram'] and scope == 'alert' and "김치프리미엄" in message
@@ -0,0 +1,20 @@
+import pytest
+
+from reporting.dashboard_load import compare_lines, level_line, run_levels
+from reporting.simulator import FaultProfile
+
+pytest.importorskip('streamlit')
+
+
+def test_small_session_smoke_run_against_simulator(capsys):
+    # 세션 2개 × 3회 (두 번째 rerun에서 새로고침) — 워커 프로세스에서 measure_sessions 실행
+    result = run_levels([2], reruns=3, refresh_every=2, fault=FaultProfile(latency_ms=5), timeout=60)
+
+    (level,) = result['levels']
+    assert level['sessions'] == 2 and level['runs'] == 6
+    assert level['errors'] == 0
+    assert level['upstream_requests'] > 0
+    assert level['first_run_ms']['p50'] is not None and level['rerun_ms']['p50'] is not None
+    assert result['config']['latency_ms'] == 5
+    assert level_line(level) in capsys.readouterr().out
+    assert len(compare_lines(result, result)) == 2
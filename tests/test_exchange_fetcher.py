@@ -0,0 +1,24 @@
+from reporting.exchange_fetcher import assemble_rates
+
+
+def _investing(pairs, jpy_krw):
+    return {'date': '20261019', 'time': '090000', 'USD_KRW': pairs.get('USD/KRW'), 'JPY_KRW': jpy_krw, 'pairs': pairs}
+
+
+def test_jpy_falls_back_to_parsed_rate_when_matrix_lacks_yen():
+    _, investing_data, _, _ = assemble_rates([], {'investing': _investing({'USD/KRW': 1380.0}, 9.1)})
+    assert investing_data['USD_KRW'] == 1380.0
+    assert round(investing_data['JPY_KRW'], 2) == 910.0
+
+
+def test_jpy_is_none_when_no_yen_rate_at_all():
+    _, investing_data, _, _ = assemble_rates([], {'investing': _investing({'USD/KRW': 1380.0}, None)})
+    assert investing_data['JPY_KRW'] is None
+
+
+def test_table_without_usd_pivot_uses_direct_krw_quotes():
+    # 환율표에 USD 행이 없으면 삼각 환율 없이 직접 호가된 X/KRW만 사용
+    _, investing_data, _, _ = assemble_rates([], {'investing': _investing({'JPY/KRW': 9.1}, 9.1)})
+    assert round(investing_data['JPY_KRW'], 2) == 910.0
+    assert investing_data['USD_KRW'] is None
+    assert set(investing_data['rates']) == {'JPY'}
@@ -0,0 +1,115 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+import http_client
+import rate_limiter
+from reporting.hedging import BUCKET_BOUNDS, HedgePolicy, get_hedge_state, hedged_call
+
+FAST = HedgePolicy(min_samples=5, budget_ratio=1.0, max_budget=5.0, min_delay=0.01)
+
+
+def _primed(key, policy=FAST, samples=100):
+    # 빠른 표본을 충분히 쌓아, 이후 느린 요청 몇 건이 기록돼도 p95가 바뀌지 않게 함
+    state = get_hedge_state(key, policy)
+    for _ in range(samples):
+        state.histogram.record(0.01)
+    return state
+
+
+def _slow_then_fast(slow=1.0):
+    calls = []
+    lock = threading.Lock()
+
+    def fn():
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        if first:
+            time.sleep(slow)
+            return 'slow'
+        return 'fast'
+    return fn, calls
+
+
+def test_no_hedge_before_min_samples():
+    fn, calls = _slow_then_fast(0.2)
+    state = get_hedge_state('test-cold', FAST)
+    assert hedged_call('test-cold', fn) == 'slow'
+    assert len(calls) == 1 and state.hedges == 0
+
+
+def test_slow_primary_is_hedged_and_first_result_wins():
+    state = _primed('test-hedge')
+    fn, calls = _slow_then_fast()
+    started = time.perf_counter()
+    assert hedged_call('test-hedge', fn) == 'fast'
+    assert time.perf_counter() - started < 0.5
+    assert len(calls) == 2 and state.hedges == 1
+
+
+def test_none_result_waits_for_the_other_request():
+    _primed('test-none')
+    results = iter([None, 'late'])
+    lock = threading.Lock()
+
+    def fn():
+        with lock:
+            value = next(results)
+        if value is None:
+            time.sleep(0.1)  # 헤지가 나간 뒤 실패
+        else:
+            time.sleep(0.2)
+        return value
+
+    assert hedged_call('test-none', fn) == 'late'
+
+
+def test_hedge_budget_is_capped():
+    policy = HedgePolicy(min_samples=5, budget_ratio=0.5, max_budget=1.0, min_delay=0.01)
+    state = _primed('test-budget', policy)
+    for _ in range(10):
+        state.on_request()
+    assert state.budget == policy.max_budget
+
+    # 쌓인 예산(1건)으로 첫 호출을 헤지한 뒤에는 일반 요청 2건당 1건 (budget_ratio 0.5)
+    for _ in range(4):
+        fn, _ = _slow_then_fast(0.2)
+        hedged_call('test-budget', fn)
+    assert state.hedges == 2
+
+
+@pytest.fixture
+def local_server():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_histogram_excludes_rate_limit_wait(local_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(rate_limiter, 'RATE_LIMIT_DIR', str(tmp_path))
+    monkeypatch.setitem(rate_limiter.HOST_LIMITS, '127.0.0.1', (2.0, 1))  # 두 번째 요청은 0.5초 대기
+    monkeypatch.setattr(http_client, 'UPSTREAM', None)
+    state = get_hedge_state('test-network', FAST)
+
+    started = time.perf_counter()
+    for _ in range(2):
+        assert hedged_call('test-network', lambda: http_client.get(local_server, timeout=5).text) == 'ok'
+    assert time.perf_counter() - started >= 0.4
+    # 기록된 두 표본 모두 대기 시간(0.5초)이 아니라 로컬 요청 시간
+    assert state.histogram.total == 2
+    assert state.histogram.quantile(1.0) < 0.2 < BUCKET_BOUNDS[-1]
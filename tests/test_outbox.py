@@ -0,0 +1,47 @@
+import types
+
+import pytest
+
+from reporting import outbox as outbox_module
+from reporting.outbox import CLAIM_BATCH, LEASE_SECONDS, SENT, Outbox, deliver_due
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(1_000_000.0)
+    monkeypatch.setattr(outbox_module, 'time', types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+def test_deliver_due_reads_the_clock_for_each_claim_and_mark(tmp_path, clock):
+    box = Outbox(str(tmp_path / 'outbox.db'))
+    box.enqueue_many([('test', {'message': f'm{i}'}, f'k{i}') for i in range(CLAIM_BATCH + 1)])
+
+    calls = []
+    finished = {}
+
+    def slow_send(message):
+        calls.append(message)
+        clock.now += LEASE_SECONDS + 1  # 전송 한 건이 임대 시간보다 오래 걸림
+        finished[f'k{message[1:]}'] = clock.now
+        if calls == ['m0']:
+            raise RuntimeError('boom')
+
+    sent, failed = deliver_due(box, {'test': slow_send})
+    # 실패한 m0는 실패 시각 기준 백오프가 지난 뒤 두 번째 묶음에서 다시 가져감
+    assert (sent, failed) == (CLAIM_BATCH + 1, 1)
+    assert sorted(calls) == sorted(['m0'] + [f'm{i}' for i in range(CLAIM_BATCH + 1)])
+
+    rows = dict(box.conn.execute("SELECT idempotency_key, sent_at FROM outbox WHERE status = ?", (SENT,)).fetchall())
+    assert len(rows) == CLAIM_BATCH + 1
+    # 전송 시각은 묶음을 가져간 시각이 아니라 전송이 끝난 뒤의 시각
+    assert all(rows[key] >= finished[key] for key in rows)
+    box.close()
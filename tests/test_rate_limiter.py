@@ -0,0 +1,27 @@
+import rate_limiter
+from rate_limiter import BACKFILL, INTERACTIVE
+
+
+def _limit(monkeypatch, tmp_path, rate, burst):
+    monkeypatch.setattr(rate_limiter, 'RATE_LIMIT_DIR', str(tmp_path))
+    monkeypatch.setitem(rate_limiter.HOST_LIMITS, 'example.test', (rate, burst))
+
+
+def test_backfill_with_burst_one_gets_full_bucket(monkeypatch, tmp_path):
+    _limit(monkeypatch, tmp_path, 1.0, 1)
+    assert rate_limiter._try_acquire('example.test', BACKFILL) == 0.0
+    # 버킷이 비었으므로 다시 찰 때까지 기다릴 시간(유한)을 돌려줌
+    assert 0.0 < rate_limiter._try_acquire('example.test', BACKFILL) <= 1.0
+
+
+def test_backfill_keeps_reserve_for_interactive(monkeypatch, tmp_path):
+    _limit(monkeypatch, tmp_path, 0.001, 4)
+    assert rate_limiter._try_acquire('example.test', BACKFILL) == 0.0  # 4 → 3
+    assert rate_limiter._try_acquire('example.test', BACKFILL) == 0.0  # 3 → 2
+    assert rate_limiter._try_acquire('example.test', BACKFILL) > 0.0   # 1 + burst/2 미만이면 양보
+    assert rate_limiter._try_acquire('example.test', INTERACTIVE) == 0.0
+
+
+def test_parse_limits_skips_invalid_specs():
+    limits = rate_limiter._parse_limits("a.test=2/5,b.test=1,c.test=0/3,d.test=x/1,e.test=1/0")
+    assert limits == {'a.test': (2.0, 5), 'b.test': (1.0, 1)}
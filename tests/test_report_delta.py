@@ -0,0 +1,107 @@
+import argparse
+import json
+from dataclasses import replace
+
+import pytest
+
+from reporting import send_report
+from reporting.report_delta import ChangeThresholds, apply_changes, detect_changes, report_state
+from reporting.send_report import ReportContext
+
+CTX = ReportContext(
+    now_str="2026-10-19 09:00",
+    bank_data=({'은행': '신한은행', 'USD_raw': 1385.0, 'JPY_raw': 925.0,
+                '조회일시': '2026-10-19', '고시회차': '1회'},),
+    investing_data={'USD_KRW': 1390.0, 'JPY_KRW': 930.0},
+    bithumb_data={'price': 1418.0},
+    btc_data={'price': 150_000_000},
+    weighted_premium=None,
+)
+
+
+def _bank(ctx, round_label, usd):
+    item = {**ctx.bank_data[0], '고시회차': round_label, 'USD_raw': usd}
+    return replace(ctx, bank_data=(item,))
+
+
+def _reference(ctx, usd):
+    return replace(ctx, investing_data={**ctx.investing_data, 'USD_KRW': usd})
+
+
+def test_unchanged_round_is_skipped_even_if_the_value_moved():
+    previous = report_state(CTX)
+    # 회차가 같으면 값 비교 없이 건너뜀 (같은 회차를 다시 긁었을 때의 반올림 차이 등)
+    assert detect_changes(previous, report_state(_bank(CTX, '1회', 1390.0)), ChangeThresholds()) == []
+
+    changes = detect_changes(previous, report_state(_bank(CTX, '2회', 1390.0)), ChangeThresholds())
+    assert [change.key for change in changes] == ['bank:신한은행:USD']
+    assert changes[0].line == "신한 USD 1,385.00 → 1,390.00 (+5.00) 1회→2회"
+
+
+def test_sub_threshold_drift_accumulates_until_reported():
+    thresholds = ChangeThresholds(reference=1.0)
+    state = report_state(CTX)
+    for usd in (1390.4, 1390.8):
+        current = report_state(_reference(CTX, usd))
+        changes = detect_changes(state, current, thresholds)
+        assert changes == []
+        state = apply_changes(state, current, changes)
+    assert state['reference:USD'] == 1390.0
+
+    current = report_state(_reference(CTX, 1391.2))
+    changes = detect_changes(state, current, thresholds)
+    assert [change.line for change in changes] == ["기준 USD 1,390.00 → 1,391.20 (+1.20)"]
+    assert apply_changes(state, current, changes)['reference:USD'] == 1391.2
+
+
+def test_new_keys_are_reported_without_a_previous_value():
+    changes = detect_changes({}, report_state(CTX), ChangeThresholds())
+    assert {change.key for change in changes} == {
+        'bank:신한은행:USD', 'bank:신한은행:JPY', 'reference:USD', 'reference:JPY',
+        'premium:USDT', 'crypto:USDT', 'crypto:BTC'}
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    sent = []
+    monkeypatch.setattr(send_report, 'enqueue_and_deliver',
+                        lambda channels, payload, scope: sent.append(payload['message']))
+    state_path = tmp_path / 'report_state.json'
+
+    def run(mode, ctx):
+        monkeypatch.setattr(send_report, 'load_report_context', lambda: ctx)
+        args = argparse.Namespace(
+            mode=mode, state=str(state_path), dry_run=False, kakao=True, telegram=False, all=False,
+            rate_threshold=1.0, reference_threshold=1.0,
+            premium_threshold=0.3, crypto_threshold=1.0,
+        )
+        send_report.run_report(args)
+        return json.loads(state_path.read_text(encoding='utf-8')) if state_path.exists() else None
+
+    run.sent = sent
+    return run
+
+
+def test_first_delta_run_sends_the_full_report(run):
+    state = run('delta', CTX)
+    assert run.sent[0].startswith("[실시간 환율]")
+    assert state == report_state(CTX)
+
+    run('delta', CTX)
+    assert len(run.sent) == 1   # 변동이 없으면 보내지 않음
+
+
+def test_changed_mode_resets_the_baseline(run):
+    run('changed', CTX)
+    drifted = _reference(_bank(CTX, '2회', 1387.0), 1390.5)
+
+    # delta는 보고한 항목만 갱신하므로 기준 환율의 작은 변동은 계속 쌓임
+    state = run('delta', drifted)
+    assert run.sent[-1].startswith("[환율 변동]")
+    assert state['reference:USD'] == 1390.0
+
+    # changed는 전체를 보냈으므로 이번 값 전체가 새 기준이 됨
+    state = run('changed', _bank(drifted, '3회', 1389.0))
+    assert run.sent[-1].startswith("[실시간 환율]")
+    assert state['reference:USD'] == 1390.5
+    assert state == report_state(_bank(drifted, '3회', 1389.0))
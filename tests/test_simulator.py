@@ -0,0 +1,78 @@
+import json
+from dataclasses import replace
+
+import pytest
+
+import http_client
+import rate_limiter
+from reporting.simulator import MAINTENANCE_PAGE, FaultProfile, UpstreamSimulator, pointed_at
+
+QUICK = FaultProfile(latency_ms=0, hang_seconds=0)
+SHINHAN = '/bank.shinhan.com/serviceEndpoint/httpDigital'
+BITHUMB = '/api.bithumb.com/public/ticker/USDT_KRW'
+
+
+def _simulator(**faults):
+    return UpstreamSimulator(replace(QUICK, **faults), seed=1)
+
+
+def test_healthy_replies_match_the_upstream_shape():
+    simulator = _simulator()
+    status, content_type, body = simulator.handle('POST', SHINHAN, 'application/json', b'{}')
+    assert (status, content_type) == (200, 'application/json')
+    assert json.loads(body)['dataBody']['고시회차'] == 1
+
+    status, _, body = simulator.handle('GET', BITHUMB, '', b'')
+    assert status == 200 and json.loads(body)['status'] == '0000'
+    assert simulator.handle('GET', '/api.bithumb.com/unknown', '', b'')[0] == 404
+
+
+@pytest.mark.parametrize('fault, statuses', [
+    ('timeout_rate', {504}),
+    ('error_rate', {500, 503}),
+])
+def test_failures_are_injected_and_counted(fault, statuses):
+    simulator = _simulator(**{fault: 1.0})
+    seen = {simulator.handle('GET', BITHUMB, '', b'')[0] for _ in range(20)}
+    assert seen <= statuses
+
+    kind = fault.split('_')[0]
+    assert simulator.stats_payload() == {'api.bithumb.com': {'requests': 20, kind: 20}}
+
+
+def test_malformed_replies_are_truncated_or_maintenance_pages():
+    simulator = _simulator(malformed_rate=1.0)
+    healthy = _simulator().handle('GET', BITHUMB, '', b'')[2]
+    bodies = [simulator.handle('GET', BITHUMB, '', b'') for _ in range(20)]
+
+    assert {status for status, _, _ in bodies} == {200}
+    assert {body for _, _, body in bodies} <= {healthy[:len(healthy) // 2], MAINTENANCE_PAGE}
+    assert simulator.stats_payload()['api.bithumb.com']['malformed'] == 20
+
+
+def test_faults_endpoint_updates_one_host():
+    simulator = _simulator()
+    status, _, body = simulator.handle(
+        'POST', '/_sim/faults', 'application/json', json.dumps({'hosts': {'api.bithumb.com': {'error_rate': 1}}}).encode())
+    assert status == 200
+    assert json.loads(body)['hosts']['api.bithumb.com']['error_rate'] == 1.0
+
+    assert simulator.handle('GET', BITHUMB, '', b'')[0] in (500, 503)
+    assert simulator.handle('POST', SHINHAN, 'application/json', b'{}')[0] == 200
+
+    status, _, body = simulator.handle('POST', '/_sim/faults', 'application/json', b'{"default": {"jitter": 1}}')
+    assert status == 400 and 'jitter' in json.loads(body)['error']
+    assert json.loads(simulator.handle('GET', '/_sim/faults', '', b'')[2]) == simulator.faults()
+
+
+def test_pointed_at_restores_the_previous_upstream(monkeypatch):
+    monkeypatch.setattr(http_client, 'UPSTREAM', 'http://127.0.0.1:1')
+    limits = rate_limiter.HOST_LIMITS
+    simulator = _simulator()
+
+    with pointed_at(simulator, drain=1.0) as base_url:
+        assert http_client.UPSTREAM == base_url
+        assert http_client.request('GET', 'https://api.bithumb.com/public/ticker/USDT_KRW').status_code == 200
+
+    assert http_client.UPSTREAM == 'http://127.0.0.1:1'
+    assert rate_limiter.HOST_LIMITS is limits
@@ -0,0 +1,77 @@
+import threading
+
+from reporting.snapshot import HIGHER_STYLE, LOWER_STYLE, SnapshotHolder, build_snapshot
+
+BANKS = [
+    {'은행': '신한은행', 'USD_raw': 1385.0, 'JPY_raw': 905.0, '조회일시': '2026-10-19 09:00:00', '고시회차': '1'},
+    {'은행': '하나은행', 'USD_raw': 1375.0, 'JPY_raw': 915.0, '조회일시': '2026-10-19 09:01:00', '고시회차': '1'},
+]
+INVESTING = {'datetime': '2026-10-19 09:00:00', 'USD_KRW': 1380.0, 'JPY_KRW': 910.0}
+
+
+def test_styled_builds_a_new_styler_per_render():
+    snapshot = build_snapshot(BANKS, INVESTING, None, None)
+    first, second = snapshot.styled(), snapshot.styled()
+    assert first is not second
+    html = first.to_html()
+    assert LOWER_STYLE.split(';')[0] in html and HIGHER_STYLE.split(';')[0] in html
+    assert list(snapshot.cell_styles['USD']) == [LOWER_STYLE, HIGHER_STYLE]
+
+
+def test_invalidate_keeps_serving_old_snapshot_while_refreshing():
+    release = threading.Event()
+    loading = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            loading.set()
+            release.wait(5)
+        return BANKS, INVESTING, None, None
+
+    holder = SnapshotHolder(loader, ttl=60, min_refresh=0)
+    old = holder.get()
+    holder.invalidate()
+
+    refresher = threading.Thread(target=holder.get)
+    refresher.start()
+    assert loading.wait(5)
+    # 갱신 중에도 다른 세션은 막히지 않고 기존 스냅샷을 받음
+    assert holder.get() is old
+    release.set()
+    refresher.join(5)
+
+    new = holder.get()
+    assert new is not old and new.version == old.version + 1
+    assert len(calls) == 2
+
+
+def test_missing_jpy_reference_shows_bank_rates_without_diff():
+    snapshot = build_snapshot(BANKS, dict(INVESTING, JPY_KRW=None), None, None)
+    assert list(snapshot.display_df['JPY(100엔)']) == ['905.00', '915.00']
+    assert list(snapshot.display_df['USD']) == ['1,385.00 (-5.00)', '1,375.00 (+5.00)']
+    assert not snapshot.jpy_diff.any()
+
+
+def test_invalidate_ignores_clicks_on_a_fresh_snapshot():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return BANKS, INVESTING, None, None
+
+    holder = SnapshotHolder(loader, ttl=60, min_refresh=15)
+    first = holder.get()
+    assert holder.invalidate() is False
+    assert holder.get() is first and len(calls) == 1
+
+    object.__setattr__(first, 'taken_at', first.taken_at - 20)
+    assert holder.invalidate() is True
+    assert holder.get() is not first and len(calls) == 2
+
+
+def test_missing_usd_reference_has_no_premium():
+    snapshot = build_snapshot(BANKS, dict(INVESTING, USD_KRW=None), {'price': 1400.0}, None)
+    assert snapshot.kimchi_premium is None
+    assert list(snapshot.display_df['USD']) == ['1,385.00', '1,375.00']
@@ -0,0 +1,86 @@
+from dataclasses import replace
+
+import pytest
+
+from reporting import outbox as outbox_module
+from reporting.send_report import STREAMLIT_APP_URL, ReportContext
+from reporting.subscriptions import parse_subscription, render_for_subscribers, send_to_subscribers
+
+CTX = ReportContext(
+    now_str="2026-10-19 09:00",
+    bank_data=(
+        {'은행': '신한은행', 'USD_raw': 1385.0, 'JPY_raw': 925.0, '고시회차': '1회'},
+        {'은행': '하나은행', 'USD_raw': 1386.0, 'JPY_raw': 926.0, '고시회차': '3회'},
+    ),
+    investing_data={'USD_KRW': 1390.0, 'JPY_KRW': 930.0},
+    bithumb_data={'price': 1418.0},   # 김프 +2.01%
+    btc_data={'price': 150_000_000},
+    weighted_premium=None,
+)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    sent = []
+    monkeypatch.setattr(outbox_module, 'acquire', lambda host: None)
+    monkeypatch.setattr(outbox_module, 'default_senders', lambda: {
+        'telegram': lambda message, chat_id=None: sent.append(('telegram', chat_id, message)),
+        'kakao': lambda message, **tokens: sent.append(('kakao', tokens, message)),
+    })
+    return sent
+
+
+def test_same_view_is_rendered_once():
+    subscriptions = [
+        parse_subscription({'id': 'a', 'channel': 'telegram', 'chat_id': 1, 'banks': ['신한은행']}),
+        parse_subscription({'id': 'b', 'channel': 'kakao', 'banks': ['신한은행']}),
+        parse_subscription({'id': 'c', 'channel': 'kakao'}),
+    ]
+    messages, renders = render_for_subscribers(subscriptions, CTX)
+
+    assert renders == 2
+    assert messages[0][1] is messages[1][1]
+    assert "하나" not in messages[0][1] and "하나" in messages[2][1]
+    assert messages[0][1].count(STREAMLIT_APP_URL) == 1
+
+
+def test_premium_above_filters_subscribers():
+    subscriptions = [
+        parse_subscription({'id': 'low', 'channel': 'kakao', 'premium_above': 1.5}),
+        parse_subscription({'id': 'high', 'channel': 'kakao', 'premium_above': 3}),
+    ]
+    messages, _ = render_for_subscribers(subscriptions, CTX)
+    assert [subscription.id for subscription, _ in messages] == ['low']
+
+    no_quote = replace(CTX, bithumb_data=None)
+    assert render_for_subscribers(subscriptions, no_quote) == ([], 0)
+
+
+def test_payload_carries_only_channel_fields():
+    telegram = parse_subscription({'id': 'a', 'channel': 'telegram', 'chat_id': 123,
+                                   'access_token_env': 'IGNORED'})
+    kakao = parse_subscription({'id': 'b', 'channel': 'kakao', 'chat_id': 123,
+                                'access_token_env': 'KAKAO_A', 'refresh_token_env': 'KAKAO_R'})
+
+    assert telegram.payload("hi") == {'message': "hi", 'chat_id': '123'}
+    assert kakao.payload("hi") == {'message': "hi", 'access_token_env': 'KAKAO_A', 'refresh_token_env': 'KAKAO_R'}
+    with pytest.raises(ValueError):
+        parse_subscription({'id': 'c', 'channel': 'sms'})
+
+
+def test_resending_the_same_round_is_not_queued_twice(tmp_path, sent):
+    subscriptions = [
+        parse_subscription({'id': 'a', 'channel': 'telegram', 'chat_id': 1}),
+        parse_subscription({'id': 'b', 'channel': 'kakao', 'access_token_env': 'KAKAO_B'}),
+    ]
+    outbox_path = str(tmp_path / 'outbox.db')
+
+    send_to_subscribers(subscriptions, outbox_path=outbox_path, ctx=CTX)
+    send_to_subscribers(subscriptions, outbox_path=outbox_path, ctx=CTX)
+
+    assert sorted((channel, target) for channel, target, _ in sent) == [
+        ('kakao', {'access_token_env': 'KAKAO_B'}), ('telegram', '1')]
+
+    moved = replace(CTX, bithumb_data={'price': 1420.0})
+    send_to_subscribers(subscriptions, outbox_path=outbox_path, ctx=moved)
+    assert len(sent) == 4